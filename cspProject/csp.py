@@ -5,12 +5,11 @@
 #
 
 
-import pandas as pd
+# pandas and tkinter are imported inside the functions that use them so the
+# solver functions can be imported on headless machines.
 from itertools import product
 import os
 from collections import deque
-import tkinter as tk
-from tkinter import ttk
 
 # --- 1. DATA LOADING ---
 
@@ -18,6 +17,7 @@ def load_data_from_csv(folder_path):
     """
     Reads all required CSV files from a specified folder into a dictionary of DataFrames.
     """
+    import pandas as pd
     try:
         file_names = {
             'courses': 'Courses.csv',
@@ -59,6 +59,10 @@ def display_timetable_grid_gui(schedule_df):
     Creates a GUI window with the timetable in a grid format (Timeslot vs Section),
     with sections arranged by level (L1, L2, etc.).
     """
+    import pandas as pd
+    import tkinter as tk
+    from tkinter import ttk
+
     if schedule_df is None or schedule_df.empty:
         print(" -> No schedule to display in GUI.")
         return
@@ -264,12 +268,15 @@ def display_and_save_timetable(schedule, data, output_filename="timetable_output
         
         timetable_data.append({'Day': time_details['Day'], 'Time': time_str, 'Section': section_id_parts, 'Course': display_course, 'Instructor': instructor_name})
     
+    import pandas as pd
     final_df = pd.DataFrame(timetable_data)
     
     print("\n✅ Feasible Timetable Generated Successfully!\n")
     print(final_df.sort_values(by=['Day', 'Time', 'Section']).to_string(index=False))
-    final_df.to_csv(output_filename, index=False)
-    print(f"\n✅ Timetable has been saved to '{output_filename}'")
+    # Same columns as cspGrouping writes to this file (see cspExport.ROW_FIELDS)
+    from cspExport import export_schedule
+    export_schedule(schedule, data, output_dir=os.path.dirname(os.path.abspath(output_filename)),
+                    basename=os.path.splitext(os.path.basename(output_filename))[0])
         
     print("\n -> Launching GUI window...")
     display_timetable_grid_gui(final_df)
@@ -0,0 +1,204 @@
+#
+# Intelligent Systems Project 1:
+# Anytime solving: a wall-clock deadline and the best partial timetable.
+#
+# solve_backtracking either finishes or, on a hard term, runs for as long as
+# it takes. Here it runs under a deadline while recording the largest
+# consistent partial assignment it reaches. If the deadline passes, that
+# partial assignment is extended greedily with whatever still fits, and every
+# session left unplaced is reported with the resources blocking its values:
+#
+#   room          the (timeslot, room) is taken by another session
+#   instructor    the instructor teaches another session at that timeslot
+#   section       one of its sections attends another session at that timeslot
+#   ordering      a symmetry-breaking order with an interchangeable section
+#
+# A saved partial timetable (save_warm_start) can seed the next run: its
+# values are tried first, so search starts next to the previous best.
+#
+
+import json
+import time
+
+import cspGrouping
+from cspGrouping import (solve_backtracking, SearchLimitReached, build_ordering_index, _ordering_culprit,
+                         get_sections_from_var)
+
+# --- 1. WARM START ---
+
+def warm_start_domains(domains, warm_start):
+    """
+    Copy of `domains` with each warm-start value moved to the front of its
+    domain. Values no longer in the domain (the data changed) are ignored.
+    Returns (domains, number of values used).
+    """
+    ordered, used = dict(domains), 0
+    for var, value in (warm_start or {}).items():
+        value = tuple(value)
+        if var in ordered and value in ordered[var]:
+            ordered[var] = [value] + [other for other in ordered[var] if other != value]
+            used += 1
+    return ordered, used
+
+def save_warm_start(result, path):
+    """Writes a solve_anytime result as JSON (schedule and unplaced sessions)."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'complete': result['complete'],
+                   'schedule': {var: list(value) for var, value in result['schedule'].items()},
+                   'unplaced': result['unplaced']}, f, indent=1)
+
+def load_warm_start(path):
+    """{variable: (TimeSlotID, RoomID, InstructorID)} from save_warm_start."""
+    with open(path, encoding='utf-8') as f:
+        return {var: tuple(value) for var, value in json.load(f)['schedule'].items()}
+
+# --- 2. OCCUPANCY OF A PARTIAL SCHEDULE ---
+
+def _sections(var):
+    return cspGrouping.VAR_METADATA.get(var, {}).get('sections') or get_sections_from_var(var)
+
+class _Occupancy:
+    """Who holds each (timeslot, room), (timeslot, instructor) and (timeslot, section)."""
+
+    def __init__(self, schedule, ordering_index):
+        self.schedule = schedule
+        self.ordering_index = ordering_index
+        self.rooms, self.instructors, self.sections = {}, {}, {}
+        for var, value in schedule.items():
+            self.add(var, value)
+
+    def add(self, var, value):
+        self.schedule[var] = value
+        time_id, room_id, instructor_id = value
+        self.rooms[(time_id, room_id)] = var
+        self.instructors[(time_id, instructor_id)] = var
+        for section in _sections(var):
+            self.sections[(time_id, section)] = var
+
+    def blockers(self, var, value):
+        """(kind, resource) pairs that stop var=value; empty if it fits."""
+        time_id, room_id, instructor_id = value
+        found = []
+        if (time_id, room_id) in self.rooms:
+            found.append(('room', room_id))
+        if (time_id, instructor_id) in self.instructors:
+            found.append(('instructor', instructor_id))
+        for section in _sections(var):
+            if (time_id, section) in self.sections:
+                found.append(('section', section))
+        if not found and self.ordering_index:
+            culprit = _ordering_culprit(var, value, self.schedule, self.ordering_index)
+            if culprit is not None:
+                found.append(('ordering', culprit))
+        return found
+
+def complete_greedily(variables, domains, schedule, ordering=None):
+    """
+    Places unassigned variables one at a time, fewest fitting values first,
+    on their first fitting value. Returns the number of sessions added.
+    """
+    ordering_index = build_ordering_index(ordering)
+    occupancy = _Occupancy(schedule, ordering_index)
+    # Fitting values per variable, bucketed by timeslot as (domain position, value)
+    fitting, counts = {}, {}
+    for var in variables:
+        if var in schedule:
+            continue
+        buckets = fitting[var] = {}
+        for position, value in enumerate(domains[var]):
+            if not occupancy.blockers(var, value):
+                buckets.setdefault(value[0], []).append((position, value))
+        counts[var] = sum(len(bucket) for bucket in buckets.values())
+    def refilter(other, time_id, fits):
+        bucket = fitting[other].get(time_id)
+        if bucket:
+            kept = [item for item in bucket if fits(item[1])]
+            counts[other] -= len(bucket) - len(kept)
+            if kept:
+                fitting[other][time_id] = kept
+            else:
+                del fitting[other][time_id]
+
+    added = 0
+    while fitting:
+        var = min(fitting, key=lambda v: counts[v] or float('inf'))
+        if not counts[var]:
+            break
+        _, value = min(bucket[0] for bucket in fitting.pop(var).values())
+        del counts[var]
+        occupancy.add(var, value)
+        added += 1
+        # Only values in the same timeslot (or ordered against var) can have lost their fit:
+        # those sharing its room or instructor, or all of them when a section is shared
+        time_id, room_id, instructor_id = value
+        sections = _sections(var)
+        linked = {other for other, _ in ordering_index.get(var, ())}
+        for other in fitting:
+            if other in linked:
+                for other_time in list(fitting[other]):
+                    refilter(other, other_time, lambda v: not occupancy.blockers(other, v))
+            elif sections.isdisjoint(_sections(other)):
+                refilter(other, time_id, lambda v: v[1] != room_id and v[2] != instructor_id)
+            else:
+                refilter(other, time_id, lambda v: False)
+    return added
+
+def explain_unplaced(variables, domains, schedule, ordering=None, top=5):
+    """
+    For each unassigned variable: how many values it had and the `top`
+    resources blocking most of them, as
+    [{'variable', 'values', 'blocking': [{'kind', 'resource', 'values'}]}].
+    """
+    occupancy = _Occupancy(dict(schedule), build_ordering_index(ordering))
+    unplaced = []
+    for var in variables:
+        if var in schedule:
+            continue
+        counts = {}
+        for value in domains[var]:
+            for blocker in set(occupancy.blockers(var, value)):
+                counts[blocker] = counts.get(blocker, 0) + 1
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:top]
+        unplaced.append({'variable': var, 'values': len(domains[var]),
+                         'blocking': [{'kind': kind, 'resource': resource, 'values': n}
+                                      for (kind, resource), n in ranked]})
+    return unplaced
+
+# --- 3. ANYTIME SOLVE ---
+
+def solve_anytime(variables, domains, time_limit, warm_start=None, propagators=None, ordering=None,
+                  verbose=False):
+    """
+    Backtracking with a wall-clock deadline. Always returns
+    {'complete', 'schedule', 'unplaced', 'placed', 'total', 'warm_start_used',
+    'timed_out', 'seconds'}: the full timetable if one was found in time,
+    else the largest consistent partial one plus the unplaced sessions.
+    """
+    start = time.perf_counter()
+    search_domains, used = warm_start_domains(domains, warm_start)
+    best, timed_out = {}, False
+    try:
+        schedule = solve_backtracking(variables, search_domains, {}, verbose=verbose, propagators=propagators,
+                                      ordering=ordering, time_limit=time_limit, best=best)
+    except SearchLimitReached:
+        schedule, timed_out = None, True
+
+    if schedule is None:
+        # Out of time or proven infeasible: keep the deepest consistent assignment
+        schedule = dict(best)
+        complete_greedily(variables, search_domains, schedule, ordering)
+    complete = len(schedule) == len(variables)
+    unplaced = [] if complete else explain_unplaced(variables, domains, schedule, ordering)
+    return {'complete': complete, 'schedule': schedule, 'unplaced': unplaced,
+            'placed': len(schedule), 'total': len(variables), 'warm_start_used': used,
+            'timed_out': timed_out, 'seconds': round(time.perf_counter() - start, 6)}
+
+def format_unplaced(unplaced, limit=10):
+    """Human-readable lines for the CLI and server logs."""
+    lines = []
+    for entry in unplaced[:limit]:
+        blocking = ', '.join(f"{b['kind']} {b['resource']} ({b['values']})" for b in entry['blocking'])
+        lines.append(f"  -> {entry['variable']}: {entry['values']} value(s), blocked by {blocking or 'nothing'}")
+    if len(unplaced) > limit:
+        lines.append(f"  -> ... and {len(unplaced) - limit} more.")
+    return '\n'.join(lines)
@@ -0,0 +1,372 @@
+#
+# Intelligent Systems Project 1:
+# Benchmark suite with a seeded synthetic instance generator.
+#
+# Generates CSV datasets in the same schema as CSP_data, runs every engine in
+# ENGINES on them side by side (each run in its own process, with a timeout)
+# and saves setup / AC-3 / solve times, search counters and peak memory as
+# JSON so results can be compared between versions.
+#
+# Usage:
+#   python cspBenchmark.py --sizes 8,16,32 --output bench_results.json
+#   python cspBenchmark.py --sizes 8,16 --compare bench_results.json
+#
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import contextlib
+import multiprocessing as mp
+from datetime import datetime
+
+DAYS = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday"]
+SLOT_TIMES = [("9:00 AM", "10:30 AM"), ("10:45 AM", "12:15 PM"), ("12:30 PM", "2:00 PM"),
+              ("2:15 PM", "3:45 PM"), ("4:00 PM", "5:30 PM"), ("5:45 PM", "7:15 PM")]
+
+# --- 1. SYNTHETIC INSTANCE GENERATOR ---
+
+def _write_csv(path, header, rows):
+    import csv
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+def generate_instance(folder, seed=0, sections=12, courses=None, rooms=None, instructors=None,
+                      tightness=0.5, levels=4, days=5, slots_per_day=4):
+    """
+    Writes Courses/Instructor/Rooms/TimeSlots/Sections CSVs for a random instance.
+    Unset sizes scale with `sections`. `tightness` (0-1] controls how much of the
+    week each section's course load fills and how scarce rooms/instructors are.
+    Returns the generation parameters (saved alongside the benchmark results).
+    """
+    rng = random.Random(seed)
+    courses = courses or max(levels * 3, sections * 2)
+    rooms = rooms or max(4, int(sections / (0.5 + tightness)))
+    instructors = max(2, instructors or int(courses * (1.2 - tightness)))
+    days = min(days, len(DAYS))
+    slots_per_day = min(slots_per_day, len(SLOT_TIMES))
+    os.makedirs(folder, exist_ok=True)
+
+    # TimeSlots
+    timeslot_rows = []
+    for d in range(days):
+        for s in range(slots_per_day):
+            timeslot_rows.append([DAYS[d], SLOT_TIMES[s][0], SLOT_TIMES[s][1], f"TS{len(timeslot_rows)}"])
+    _write_csv(os.path.join(folder, 'TimeSlots.csv'), ['Day', 'StartTime', 'EndTime', 'TimeSlotID'], timeslot_rows)
+
+    # Courses (fixed-width IDs so substring matching in setup_csp stays exact)
+    course_types = ["Lecture", "Lab", "Lecture and Lab"]
+    course_rows, course_levels = [], {}
+    for c in range(courses):
+        course_id = f"CRS{c:04d}"
+        course_rows.append([course_id, f"Course {c}", rng.choice([2, 3]), rng.choice(course_types)])
+        course_levels[course_id] = c % levels + 1
+    _write_csv(os.path.join(folder, 'Courses.csv'), ['CourseID', 'CourseName', 'Credits', 'Type'], course_rows)
+
+    # Sections: each takes a share of its level's courses
+    sessions_per_section = max(1, int(round(tightness * len(timeslot_rows) / 2)))
+    section_rows = []
+    level_courses = {lvl: [cid for cid, l in course_levels.items() if l == lvl] for lvl in range(1, levels + 1)}
+    per_level = {lvl: 0 for lvl in level_courses}
+    for k in range(sections):
+        level = k % levels + 1
+        per_level[level] += 1
+        pool = level_courses[level]
+        chosen = sorted(rng.sample(pool, min(len(pool), sessions_per_section)))
+        section_rows.append([f"S{per_level[level]}_L{level}", rng.randint(20, 40), ','.join(chosen)])
+    _write_csv(os.path.join(folder, 'Sections.csv'), ['SectionID', 'StudentCount', 'Courses'], section_rows)
+
+    # Rooms: lecture halls sized for two grouped sections, labs for one
+    room_rows = []
+    for r in range(rooms):
+        if r % 2 == 0:
+            room_rows.append([f"R{r:03d}", 'Lecture', rng.choice([80, 100, 120])])
+        else:
+            room_rows.append([f"L{r:03d}", 'Lab', rng.choice([30, 40, 50])])
+    _write_csv(os.path.join(folder, 'Rooms.csv'), ['RoomID', 'Type', 'Capacity'], room_rows)
+
+    # Instructors: every course gets at least one professor and one assistant
+    all_courses = [row[0] for row in course_rows]
+    qualified = {i: set() for i in range(instructors)}
+    professors, assistants = (instructors + 1) // 2, instructors // 2
+    for c, course_id in enumerate(all_courses):
+        qualified[2 * (c % professors)].add(course_id)
+        qualified[2 * (c % assistants) + 1].add(course_id)
+    extra = max(0, int((1 - tightness) * 3))
+    for i in qualified:
+        qualified[i].update(rng.sample(all_courses, min(extra, len(all_courses))))
+    instructor_rows = []
+    for i in range(instructors):
+        role_prefix, role = ("PROF", "Professor") if i % 2 == 0 else ("AP", "Assistant Professor")
+        preference = f"Not on {rng.choice(DAYS[:days])}" if rng.random() < tightness else "Any time"
+        instructor_rows.append([f"{role_prefix}{i:03d}", f"Instructor {i}", role, preference,
+                                ','.join(sorted(qualified[i]))])
+    _write_csv(os.path.join(folder, 'Instructor.csv'),
+               ['InstructorID', 'Name', 'Role', 'PreferredSlots', 'QualifiedCourses'], instructor_rows)
+
+    return {'seed': seed, 'sections': sections, 'courses': courses, 'rooms': rooms,
+            'instructors': instructors, 'tightness': tightness, 'levels': levels,
+            'days': days, 'slots_per_day': slots_per_day}
+
+# --- 2. ENGINE RUNNERS ---
+
+def _peak_memory_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def _validate_into(stats, schedule, data, var_metadata, variables):
+    """Checks an engine's schedule with cspValidate; a bad one turns the status into 'invalid'."""
+    from cspValidate import validate_schedule, summarize
+    report = validate_schedule(schedule, data, var_metadata, variables)
+    stats['validate_time'] = report['seconds']
+    stats['violations'] = summarize(report)
+    if not report['valid']:
+        stats['status'] = 'invalid'
+
+def _run_standard_engine(engine_name, folder):
+    """
+    Runs an engine module exposing load_data_from_csv / setup_csp / ac3 /
+    solve_backtracking. Engines with a METRICS object (cspMetrics) report
+    their own counters; for the others nodes and backtracks are counted by
+    wrapping the module's recursive solve_backtracking.
+    """
+    import importlib
+    module = importlib.import_module(engine_name)
+    stats = {'nodes': 0, 'backtracks': 0}
+    metrics = getattr(module, 'METRICS', None)
+
+    if metrics is not None:
+        metrics.reset()
+    else:
+        original_solve = module.solve_backtracking
+
+        def counting_solve(*args, **kwargs):
+            stats['nodes'] += 1
+            result = original_solve(*args, **kwargs)
+            if result is None:
+                stats['backtracks'] += 1
+            return result
+
+        module.solve_backtracking = counting_solve
+
+    t0 = time.perf_counter()
+    data = module.load_data_from_csv(folder)
+    stats['load_time'] = time.perf_counter() - t0
+    if not data:
+        return dict(stats, status='error', message='data loading failed')
+
+    t0 = time.perf_counter()
+    variables, domains, constraints, _ = module.setup_csp(data)
+    stats['setup_time'] = time.perf_counter() - t0
+    stats['variables'] = len(variables)
+    stats['domain_values'] = sum(len(d) for d in domains.values())
+    if any(not d for d in domains.values()):
+        return dict(stats, status='empty_domain')
+
+    t0 = time.perf_counter()
+    consistent = module.ac3(variables, domains, constraints)
+    stats['ac3_time'] = time.perf_counter() - t0
+    if not consistent:
+        return dict(stats, status='ac3_failed')
+
+    t0 = time.perf_counter()
+    schedule = module.solve_backtracking(variables, domains, {})
+    stats['solve_time'] = time.perf_counter() - t0
+    stats['status'] = 'solved' if schedule else 'no_solution'
+    if schedule:
+        _validate_into(stats, schedule, data, getattr(module, 'VAR_METADATA', None), variables)
+    if metrics is not None:
+        stats.update(metrics.counters())
+    return stats
+
+def _run_sat_engine(engine_name, folder):
+    """
+    cspGrouping's setup followed by the cspSat backend. Global all-different
+    propagation prunes the domains first (in place of binary AC-3) so the
+    CNF only holds values that can still be part of a solution.
+    """
+    import cspGrouping
+    import cspSat
+    from cspGlobal import build_alldiff_propagators, propagate_global
+
+    solver = cspSat.available_solver()
+    if solver is None:
+        return {'status': 'error', 'message': 'no SAT solver installed'}
+    stats = {'solver': solver}
+
+    t0 = time.perf_counter()
+    data = cspGrouping.load_data_from_csv(folder)
+    stats['load_time'] = time.perf_counter() - t0
+    if not data:
+        return dict(stats, status='error', message='data loading failed')
+
+    t0 = time.perf_counter()
+    variables, domains, _, _ = cspGrouping.setup_csp(data)
+    stats['setup_time'] = time.perf_counter() - t0
+    stats['variables'] = len(variables)
+    stats['domain_values'] = sum(len(d) for d in domains.values())
+    if any(not d for d in domains.values()):
+        return dict(stats, status='empty_domain')
+
+    t0 = time.perf_counter()
+    propagators = build_alldiff_propagators(variables, cspGrouping.VAR_METADATA)
+    consistent, _, _ = propagate_global(propagators, domains)
+    stats['ac3_time'] = time.perf_counter() - t0
+    if not consistent:
+        return dict(stats, status='ac3_failed')
+
+    t0 = time.perf_counter()
+    schedule = cspSat.solve_with_sat(variables, domains, cspGrouping.VAR_METADATA, solver=solver, stats=stats)
+    stats['solve_time'] = time.perf_counter() - t0
+    if schedule:
+        stats['status'] = 'solved'
+        _validate_into(stats, schedule, data, cspGrouping.VAR_METADATA, variables)
+    else:
+        stats['status'] = 'no_solution' if stats.get('sat_status') == 'UNSATISFIABLE' else 'unknown'
+    return stats
+
+# Engine name -> runner(engine_name, folder) returning a stats dict.
+ENGINES = {
+    'csp': _run_standard_engine,
+    'cspGrouping': _run_standard_engine,
+    'sat': _run_sat_engine,
+}
+
+def _engine_worker(engine_name, folder, queue):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            stats = ENGINES[engine_name](engine_name, folder)
+    except Exception as e:
+        stats = {'status': 'error', 'message': repr(e)}
+    stats['peak_memory_kb'] = _peak_memory_kb()
+    queue.put(stats)
+
+def run_engine(engine_name, folder, timeout=300):
+    """Runs one engine on one dataset in a fresh process and returns its stats."""
+    ctx = mp.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=_engine_worker, args=(engine_name, folder, queue))
+    started = time.perf_counter()
+    process.start()
+    try:
+        stats = queue.get(timeout=timeout)
+    except Exception:
+        stats = {'status': 'timeout'}
+    process.join(5)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+    stats['wall_time'] = time.perf_counter() - started
+    return stats
+
+# --- 3. SUITE & REGRESSION CHECK ---
+
+def run_suite(sizes, engines, seed=0, tightness=0.5, timeout=300, instances_dir=None):
+    """Generates one instance per size and runs every engine on it."""
+    instances_dir = instances_dir or tempfile.mkdtemp(prefix='csp_bench_')
+    results = []
+    for size in sizes:
+        folder = os.path.join(instances_dir, f"s{size}_seed{seed}_t{tightness}")
+        params = generate_instance(folder, seed=seed, sections=size, tightness=tightness)
+        for engine_name in engines:
+            print(f" -> {engine_name} on {os.path.basename(folder)} ...", end=' ', flush=True)
+            stats = run_engine(engine_name, folder, timeout=timeout)
+            print(f"{stats.get('status')} in {stats['wall_time']:.2f}s")
+            results.append({'instance': os.path.basename(folder), 'params': params,
+                            'engine': engine_name, 'stats': stats})
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+def compare_results(baseline, current, threshold=0.2, min_seconds=0.05):
+    """
+    Lists (instance, engine, metric) entries that got slower than the baseline
+    by more than `threshold` (relative), or changed solve status.
+    """
+    base = {(r['instance'], r['engine']): r['stats'] for r in baseline['results']}
+    regressions = []
+    for r in current['results']:
+        old = base.get((r['instance'], r['engine']))
+        if old is None:
+            continue
+        new = r['stats']
+        if old.get('status') != new.get('status'):
+            regressions.append((r['instance'], r['engine'], 'status', old.get('status'), new.get('status')))
+        for metric in ('setup_time', 'ac3_time', 'solve_time', 'nodes', 'peak_memory_kb'):
+            a, b = old.get(metric), new.get(metric)
+            if a is None or b is None:
+                continue
+            if metric.endswith('_time') and max(a, b) < min_seconds:
+                continue
+            if b > a * (1 + threshold):
+                regressions.append((r['instance'], r['engine'], metric, a, b))
+    return regressions
+
+def print_results(report):
+    header = f"{'instance':<22}{'engine':<14}{'status':<13}{'setup':>8}{'ac3':>9}{'solve':>9}{'nodes':>8}{'bt':>7}{'mem MB':>8}"
+    print("\n" + header)
+    print('-' * len(header))
+    for r in report['results']:
+        s = r['stats']
+
+        def fmt(key, spec):
+            return format(s[key], spec) if s.get(key) is not None else '-'
+
+        mem = f"{s['peak_memory_kb'] / 1024:.0f}" if s.get('peak_memory_kb') else '-'
+        print(f"{r['instance']:<22}{r['engine']:<14}{s.get('status', '?'):<13}{fmt('setup_time', '8.3f'):>8}"
+              f"{fmt('ac3_time', '9.3f'):>9}{fmt('solve_time', '9.3f'):>9}{fmt('nodes', 'd'):>8}"
+              f"{fmt('backtracks', 'd'):>7}{mem:>8}")
+
+
+# --- MAIN EXECUTION ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the CSP engines on synthetic instances.")
+    parser.add_argument('--sizes', default='8,16', help="Comma-separated section counts")
+    parser.add_argument('--engines', default=','.join(ENGINES), help="Comma-separated engine names")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tightness', type=float, default=0.5)
+    parser.add_argument('--timeout', type=float, default=300, help="Seconds per engine run")
+    parser.add_argument('--instances-dir', default=None, help="Keep generated datasets here")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', default=None, help="Baseline JSON to check for regressions")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    engines = [e.strip() for e in args.engines.split(',') if e.strip()]
+    unknown = [e for e in engines if e not in ENGINES]
+    if unknown:
+        sys.exit(f"❌ Unknown engine(s): {', '.join(unknown)}. Available: {', '.join(ENGINES)}")
+
+    print("--- Running Benchmarks ---")
+    report = run_suite(sizes, engines, seed=args.seed, tightness=args.tightness,
+                       timeout=args.timeout, instances_dir=args.instances_dir)
+    print_results(report)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Benchmark results saved to '{args.output}'")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, report)
+        if regressions:
+            print("\n❌ Regressions against baseline:")
+            for instance, engine, metric, old, new in regressions:
+                print(f"  -> {instance} / {engine}: {metric} {old} -> {new}")
+            sys.exit(1)
+        print("\n✅ No regressions against baseline.")
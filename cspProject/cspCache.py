@@ -0,0 +1,371 @@
+#
+# Intelligent Systems Project 1:
+# Compiled (binary) problem cache for fast solver startup.
+#
+# A compiled problem file holds everything `setup_csp` produces - interned IDs,
+# compact integer domains, the constraint graph and variable metadata - so that
+# repeated solves and worker processes can skip pandas, CSV parsing and domain
+# construction entirely. Files are keyed on the SHA-256 of the source CSVs
+# and of the code that builds the problem (SETUP_MODULES), so a change to
+# setup or ingestion invalidates every compiled file.
+#
+# File layout (all integers are unsigned 32-bit, native byte order):
+#   MAGIC (8 bytes) | header length (4 bytes) | JSON header (padded to 8 bytes)
+#   | array blocks referenced by the header as [byte offset, item count]
+#
+
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+from array import array
+
+MAGIC = b'CSPBIN01'
+FORMAT_VERSION = 2
+
+# Modules whose code decides what setup_csp produces
+SETUP_MODULES = ('cspGrouping.py', 'cspIngest.py')
+
+# Compiled files kept per cache folder (older ones are removed)
+MAX_CACHE_FILES = 8
+
+# Same file set that load_data_from_csv reads.
+SOURCE_FILES = ('Courses.csv', 'Instructor.csv', 'Rooms.csv', 'TimeSlots.csv', 'Sections.csv')
+
+# --- 1. SOURCE HASHING ---
+
+def hash_source_files(folder_path):
+    """
+    Hashes every source CSV in the data folder.
+    Returns (combined_hash, {file_name: sha256}).
+    """
+    file_hashes = {}
+    combined = hashlib.sha256()
+    for name in SOURCE_FILES:
+        digest = hashlib.sha256()
+        with open(os.path.join(folder_path, name), 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        file_hashes[name] = digest.hexdigest()
+        combined.update(name.encode('utf-8'))
+        combined.update(file_hashes[name].encode('ascii'))
+    return combined.hexdigest(), file_hashes
+
+_CODE_HASH = None
+
+def setup_code_hash():
+    """SHA-256 of the SETUP_MODULES sources and FORMAT_VERSION, computed once per process."""
+    global _CODE_HASH
+    if _CODE_HASH is None:
+        digest = hashlib.sha256(str(FORMAT_VERSION).encode('ascii'))
+        here = os.path.dirname(os.path.abspath(__file__))
+        for name in SETUP_MODULES:
+            with open(os.path.join(here, name), 'rb') as f:
+                digest.update(f.read())
+        _CODE_HASH = digest.hexdigest()
+    return _CODE_HASH
+
+def cache_key(source_hash):
+    """Key of a compiled problem: the dataset hash combined with the setup code hash."""
+    return hashlib.sha256(f"{source_hash}:{setup_code_hash()}".encode('ascii')).hexdigest()
+
+def cache_file_path(cache_dir, key, engine_name="cspGrouping"):
+    """Builds the cache file name for a cache key and a setup engine."""
+    return os.path.join(cache_dir, f"{engine_name}_{key[:16]}.cspbin")
+
+def _prune_cache(cache_dir, keep):
+    """Removes all but the `keep` most recently used compiled files."""
+    files = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.endswith('.cspbin')]
+    files.sort(key=os.path.getmtime, reverse=True)
+    for path in files[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+# --- 2. COMPILING ---
+
+def compile_problem(variables, domains, constraints, empty_reasons, var_metadata, filename,
+                    source_hash=None, source_files=None, engine_name="cspGrouping", code_hash=None):
+    """
+    Writes the CSP produced by setup_csp to a compiled binary problem file.
+    Every ID string is interned once; domains become (t, r, i) index triples.
+    """
+    timeslot_index, room_index, instructor_index, section_index = {}, {}, {}, {}
+
+    def intern(table, key):
+        idx = table.get(key)
+        if idx is None:
+            idx = table[key] = len(table)
+        return idx
+
+    var_index = {var: i for i, var in enumerate(variables)}
+
+    domain_offsets = array('I', [0])
+    domain_values = array('I')
+    for var in variables:
+        for t, r, i in domains.get(var, []):
+            domain_values.append(intern(timeslot_index, t))
+            domain_values.append(intern(room_index, r))
+            domain_values.append(intern(instructor_index, i))
+        domain_offsets.append(len(domain_values) // 3)
+
+    var_sections = []
+    for var in variables:
+        sections = var_metadata.get(var, {}).get('sections', set())
+        var_sections.append(sorted(intern(section_index, s) for s in sections))
+
+    # Constraint graph: setup_csp links every pair, so store that as a flag
+    # instead of n^2/2 edges. Anything else is written out explicitly.
+    n = len(variables)
+    arrays = {'domain_offsets': domain_offsets, 'domain_values': domain_values}
+    if len(constraints) == n * (n - 1) // 2:
+        graph = 'complete'
+    else:
+        graph = 'explicit'
+        edges = array('I')
+        for v1, v2 in constraints:
+            edges.append(var_index[v1])
+            edges.append(var_index[v2])
+        arrays['edges'] = edges
+
+    def ordered(table):
+        return sorted(table, key=table.get)
+
+    header = {
+        'version': FORMAT_VERSION,
+        'engine': engine_name,
+        'byteorder': sys.byteorder,
+        'source_hash': source_hash,
+        'source_files': source_files or {},
+        'code_hash': code_hash,
+        'variables': list(variables),
+        'timeslots': ordered(timeslot_index),
+        'rooms': ordered(room_index),
+        'instructors': ordered(instructor_index),
+        'sections': ordered(section_index),
+        'var_sections': var_sections,
+        'empty_domain_reasons': empty_reasons,
+        'graph': graph,
+        'arrays': {},
+    }
+
+    # The header size depends on the array offsets it records, so repeat
+    # until the offsets stop moving (normally two or three passes).
+    offsets = None
+    while header['arrays'] != offsets:
+        if offsets is not None:
+            header['arrays'] = offsets
+        header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+        header_bytes += b' ' * (-(len(MAGIC) + 4 + len(header_bytes)) % 8)
+        position = len(MAGIC) + 4 + len(header_bytes)
+        offsets = {}
+        for name, values in arrays.items():
+            offsets[name] = [position, len(values)]
+            position += len(values) * values.itemsize
+
+    tmp_name = filename + '.tmp'
+    with open(tmp_name, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header_bytes)))
+        f.write(header_bytes)
+        for values in arrays.values():
+            values.tofile(f)
+    os.replace(tmp_name, filename)
+    return filename
+
+# --- 3. LOADING ---
+
+class CompiledProblem:
+    """
+    Read-only view over a compiled problem file.
+    Integer arrays are served straight from the memory map; ID strings are
+    only materialized when a caller asks for string-keyed domains.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"'{filename}' is not a compiled CSP problem file.")
+        (header_len,) = struct.unpack_from('<I', self._mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(self._mm[start:start + header_len]))
+        if header.get('version') != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported compiled problem version: {header.get('version')}")
+
+        self.header = header
+        self.engine = header['engine']
+        self.source_hash = header['source_hash']
+        self.code_hash = header.get('code_hash')
+        self.variables = header['variables']
+        self.timeslots = header['timeslots']
+        self.rooms = header['rooms']
+        self.instructors = header['instructors']
+        self.sections = header['sections']
+        self.var_sections = header['var_sections']
+        self.empty_domain_reasons = header['empty_domain_reasons']
+        self.graph = header['graph']
+        self._swap = header['byteorder'] != sys.byteorder
+        self._arrays = {name: self._map_array(offset, count)
+                        for name, (offset, count) in header['arrays'].items()}
+
+    def _map_array(self, offset, count):
+        view = memoryview(self._mm)[offset:offset + 4 * count]
+        if not self._swap:
+            return view.cast('I')
+        values = array('I', view.tobytes())
+        values.byteswap()
+        return values
+
+    def domain_indices(self, var_idx):
+        """Returns the flat (t, r, i, t, r, i, ...) index slice for one variable."""
+        offsets = self._arrays['domain_offsets']
+        return self._arrays['domain_values'][3 * offsets[var_idx]:3 * offsets[var_idx + 1]]
+
+    def domain_size(self, var_idx):
+        offsets = self._arrays['domain_offsets']
+        return offsets[var_idx + 1] - offsets[var_idx]
+
+    def domain(self, var_idx):
+        """Decodes one variable's domain into (TimeSlotID, RoomID, InstructorID) tuples."""
+        flat = self.domain_indices(var_idx)
+        ts, rooms, insts = self.timeslots, self.rooms, self.instructors
+        return [(ts[flat[k]], rooms[flat[k + 1]], insts[flat[k + 2]]) for k in range(0, len(flat), 3)]
+
+    def constraints(self):
+        variables = self.variables
+        if self.graph == 'complete':
+            return [(v1, v2) for i, v1 in enumerate(variables) for v2 in variables[i + 1:]]
+        edges = self._arrays['edges']
+        return [(variables[edges[k]], variables[edges[k + 1]]) for k in range(0, len(edges), 2)]
+
+    def var_metadata(self):
+        """Rebuilds the VAR_METADATA structure used by is_consistent."""
+        return {var: {'sections': {self.sections[s] for s in self.var_sections[i]}}
+                for i, var in enumerate(self.variables)}
+
+    def to_csp(self):
+        """Returns (variables, domains, constraints, empty_domain_reasons) like setup_csp."""
+        domains = {var: self.domain(i) for i, var in enumerate(self.variables)}
+        return list(self.variables), domains, self.constraints(), dict(self.empty_domain_reasons)
+
+    def close(self):
+        for values in getattr(self, '_arrays', {}).values():
+            if isinstance(values, memoryview):
+                values.release()
+        self._arrays = {}
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # A caller still holds a slice; the map is released with it.
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def load_compiled_problem(filename):
+    """Opens a compiled problem file. Does not need pandas."""
+    return CompiledProblem(filename)
+
+# --- 4. CACHED SETUP ---
+
+def _cached(folder_path, cache_dir, source_hash):
+    """(csp or None, filename, source_hash, source_files) for the cache lookup."""
+    import cspGrouping
+
+    source_files = None
+    if source_hash is None:
+        source_hash, source_files = hash_source_files(folder_path)
+    filename = cache_file_path(cache_dir, cache_key(source_hash))
+    if not os.path.exists(filename):
+        return None, filename, source_hash, source_files
+
+    csp = None
+    try:
+        with load_compiled_problem(filename) as problem:
+            if problem.source_hash == source_hash and problem.code_hash == setup_code_hash():
+                var_metadata, csp = problem.var_metadata(), problem.to_csp()
+    except (ValueError, OSError) as e:
+        print(f"  -> 🔴 WARNING: Ignoring unreadable cache '{filename}': {e}")
+    if csp is not None:
+        print(f"✅ Loaded compiled problem from '{filename}'")
+        cspGrouping.VAR_METADATA.clear()
+        cspGrouping.VAR_METADATA.update(var_metadata)
+        os.utime(filename)  # Most recently used survives pruning
+    return csp, filename, source_hash, source_files
+
+def load_cached_problem(folder_path, cache_dir=None, source_hash=None):
+    """
+    (variables, domains, constraints, empty_domain_reasons) from the compiled
+    cache, or None when it has no current entry. Never imports pandas or
+    parses a CSV. Populates cspGrouping.VAR_METADATA on a hit.
+    """
+    cache_dir = cache_dir or os.path.join(folder_path, '.csp_cache')
+    return _cached(folder_path, cache_dir, source_hash)[0]
+
+def load_or_compile_problem(folder_path, cache_dir=None, dataset=None, source_hash=None):
+    """
+    Returns (variables, domains, constraints, empty_domain_reasons) for the dataset,
+    reading the compiled cache when the dataset and setup code hashes match and
+    compiling it (via setup_csp) otherwise. cspGrouping.VAR_METADATA is
+    populated either way so is_consistent keeps its fast path.
+    `dataset` skips reloading the CSVs on a miss. When it did not come from
+    the CSVs (e.g. an edited store), pass its own `source_hash`.
+    """
+    import cspGrouping
+
+    cache_dir = cache_dir or os.path.join(folder_path, '.csp_cache')
+    csp, filename, source_hash, source_files = _cached(folder_path, cache_dir, source_hash)
+    if csp is not None:
+        return csp
+
+    dataset = dataset if dataset is not None else cspGrouping.load_data_from_csv(folder_path)
+    if not dataset:
+        return None
+    variables, domains, constraints, empty_reasons = cspGrouping.setup_csp(dataset)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        compile_problem(variables, domains, constraints, empty_reasons, cspGrouping.VAR_METADATA,
+                        filename, source_hash=source_hash, source_files=source_files,
+                        code_hash=setup_code_hash())
+        print(f"✅ Compiled problem saved to '{filename}'")
+        _prune_cache(cache_dir, MAX_CACHE_FILES)
+    except OSError as e:
+        print(f"\n❌ Could not save the compiled problem. Error: {e}")
+    return variables, domains, constraints, empty_reasons
+
+def load_problem(folder_path, cache_dir=None):
+    """
+    (csp, dataset) for a data folder, cache first: on a hit the CSVs are not
+    parsed and dataset is None (load it with load_data_from_csv only if
+    validation or export needs it); on a miss the loaded DataFrames are
+    returned with the freshly compiled problem. csp is None when the CSVs
+    cannot be loaded.
+    """
+    import cspGrouping
+
+    csp = load_cached_problem(folder_path, cache_dir)
+    if csp is not None:
+        return csp, None
+    dataset = cspGrouping.load_data_from_csv(folder_path)
+    if not dataset:
+        return None, None
+    return load_or_compile_problem(folder_path, cache_dir, dataset=dataset), dataset
+
+# --- MAIN EXECUTION ---
+if __name__ == "__main__":
+    csv_folder_path = sys.argv[1] if len(sys.argv) > 1 else r"E:\CSP_data"
+    cache_folder = sys.argv[2] if len(sys.argv) > 2 else None
+    result = load_or_compile_problem(csv_folder_path, cache_folder)
+    if result:
+        csp_vars, csp_domains, _, _ = result
+        print(f" -> {len(csp_vars)} variables, {sum(len(d) for d in csp_domains.values())} domain values.")
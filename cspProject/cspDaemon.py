@@ -0,0 +1,452 @@
+#
+# Intelligent Systems Project 1:
+# Warm solver daemon with a thin local RPC client.
+#
+# The daemon loads the dataset once, runs setup_csp and AC-3 (with the
+# global all-different propagators) and keeps the result in memory:
+# dataset, variables, constraint graph, variable metadata and the pruned
+# domains. Requests then skip Python startup, pandas, CSV parsing, setup
+# and AC-3:
+#
+#   solve     search on the warm pruned domains
+#   whatif    apply restrictions to a copy and solve; the warm state is untouched
+#   resolve   apply restrictions and repair the last timetable, moving as
+#             few sessions as possible (cspLns.repair); the restrictions and
+#             the repaired timetable become the new warm state
+#   status / reload / stop
+#
+# What-if changes only remove values (close a room, block a timeslot, keep an
+# instructor off a day, pin a session), so the warm AC-3 pruning stays valid
+# and no re-propagation is needed. The data folder is polled for changes and
+# reloaded automatically: the new problem is built next to the old one, which
+# keeps answering requests, and is swapped in once it is ready.
+#
+# Messages are pickled dicts over multiprocessing.connection: a Unix socket
+# by default, or localhost TCP (--port, and always on Windows), protected by
+# an authkey that the daemon writes to a 0600 key file next to the socket.
+#
+#   python cspDaemon.py serve E:\CSP_data
+#   python cspDaemon.py solve
+#   python cspDaemon.py whatif --close-room R101 --forbid-day PROF01:Sunday
+#   python cspDaemon.py resolve --forbid-slot TS3 --output timetable.csv
+#
+
+import os
+import sys
+import time
+import secrets
+import tempfile
+import threading
+from multiprocessing.connection import Listener, Client
+
+DEFAULT_PORT = 50100
+POLL_SECONDS = 2.0
+
+SOLVE_LOCK = threading.RLock()  # One solve at a time: VAR_METADATA and METRICS are global
+
+def default_address(port=None):
+    """Unix socket in the temp dir, or localhost TCP when a port is given or AF_UNIX is unavailable."""
+    if port is None and sys.platform != 'win32':
+        return os.path.join(tempfile.gettempdir(), f"csp-daemon-{os.getuid()}.sock")
+    return ('127.0.0.1', port or DEFAULT_PORT)
+
+def key_file_for(address):
+    if isinstance(address, str):
+        return address + '.key'
+    return os.path.join(tempfile.gettempdir(), f"csp-daemon-{address[1]}.key")
+
+def _read_authkey(address):
+    key = os.environ.get('CSP_DAEMON_KEY')
+    if key:
+        return key.encode()
+    try:
+        with open(key_file_for(address), 'rb') as f:
+            return f.read().strip()
+    except OSError:
+        raise ConnectionError(f"No daemon key file for {address}. Is the daemon running?")
+
+# --- 1. WARM STATE ---
+
+def _source_signature(folder_path):
+    """(name, size, mtime) of every source CSV; cheap enough to poll."""
+    from cspCache import SOURCE_FILES
+    signature = []
+    for name in SOURCE_FILES:
+        try:
+            stat = os.stat(os.path.join(folder_path, name))
+            signature.append((name, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            signature.append((name, None, None))
+    return tuple(signature)
+
+class WarmProblem:
+    """Dataset, CSP and AC-3 pruned domains for one data folder, kept in memory."""
+
+    def __init__(self, folder_path):
+        self.folder_path = folder_path
+        self.last_schedule = None
+        self.changes = []
+        self.loads = 0
+
+    def load(self):
+        import cspGrouping
+        from cspLns import build_context
+        from cspValidate import build_rules
+
+        start = time.perf_counter()
+        signature = _source_signature(self.folder_path)
+        from cspCache import load_problem
+        with SOLVE_LOCK:  # setup_csp refills the global VAR_METADATA; the slow AC-3 below runs unlocked
+            problem, data = load_problem(self.folder_path)
+            self.var_metadata = dict(cspGrouping.VAR_METADATA)
+        # Every reply is validated against the dataset, so a cache hit still parses the CSVs once here
+        data = data or (problem and cspGrouping.load_data_from_csv(self.folder_path))
+        if not data:
+            raise RuntimeError(f"Could not load the CSV files from '{self.folder_path}'.")
+        variables, domains, constraints, empty_reasons = problem
+        self.data, self.variables, self.constraints = data, variables, constraints
+        self.empty_reasons = empty_reasons
+        self.context = build_context(data)
+        self.rules = build_rules(data)
+        self.day_to_slots = cspGrouping.create_day_to_slots_map(data['timeslots'])
+        self.consistent = not any(not d for d in domains.values())
+        if self.consistent:
+            propagators = cspGrouping.build_alldiff_propagators(variables, self.var_metadata)
+            self.consistent = cspGrouping.ac3(variables, domains, constraints, propagators)
+        self.domains = domains
+        self.signature = signature
+        self.last_schedule = None
+        self.changes = []
+        self.loads += 1
+        self.load_seconds = time.perf_counter() - start
+        print(f"✅ Warm problem ready: {len(variables)} variables in {self.load_seconds:.2f}s")
+
+    def activate(self):
+        """Points the solver's global metadata at this problem."""
+        import cspGrouping
+        if cspGrouping.VAR_METADATA is not self.var_metadata:
+            cspGrouping.VAR_METADATA.clear()
+            cspGrouping.VAR_METADATA.update(self.var_metadata)
+
+class WarmState:
+    """
+    The daemon's current WarmProblem. A reload loads a new WarmProblem without
+    taking SOLVE_LOCK and then replaces the reference, so requests keep being
+    answered from the old problem for the whole load.
+    """
+
+    def __init__(self, folder_path):
+        self.folder_path = folder_path
+        self.problem = None
+        self.reload_lock = threading.Lock()  # One load at a time
+
+    def reload(self, force=False):
+        """Loads the data folder again if it changed (always with `force`). True when a new problem was swapped in."""
+        with self.reload_lock:
+            current = self.problem
+            if not force and current is not None and _source_signature(self.folder_path) == current.signature:
+                return False
+            if current is not None and not force:
+                print(f" -> Data in '{self.folder_path}' changed, reloading.")
+            # AC-3 on the new problem reads the global VAR_METADATA while solves
+            # on the old one activate theirs. Both agree: a variable's sections
+            # are spelled out in its name, which is also the fallback.
+            fresh = WarmProblem(self.folder_path)
+            fresh.loads = current.loads if current is not None else 0
+            fresh.load()
+            self.problem = fresh  # A request reads the reference once and uses the old or the new problem whole
+            return True
+
+# --- 2. CHANGES ---
+
+CHANGE_KINDS = ('close_room', 'forbid_slot', 'forbid_day', 'pin')
+
+def apply_changes(problem, changes):
+    """
+    Domains of `problem` with the changes applied (copies only). A change is
+    a dict: {'close_room': R}, {'forbid_slot': T}, {'forbid_day': [I, DAY]}
+    or {'pin': [VAR, [T, R, I]]}.
+    """
+    domains = problem.domains
+    restricted = dict(domains)
+    for change in changes:
+        (kind, arg), = change.items()
+        if kind == 'close_room':
+            keep = lambda var, value: value[1] != arg
+        elif kind == 'forbid_slot':
+            keep = lambda var, value: value[0] != arg
+        elif kind == 'forbid_day':
+            instructor, day = arg
+            slots = set(problem.day_to_slots.get(day, ()))
+            if not slots:
+                raise ValueError(f"Unknown day '{day}'.")
+            keep = lambda var, value: not (value[2] == instructor and value[0] in slots)
+        elif kind == 'pin':
+            pinned_var, pinned_value = arg[0], tuple(arg[1])
+            if pinned_var not in domains:
+                raise ValueError(f"Unknown variable '{pinned_var}'.")
+            keep = lambda var, value: var != pinned_var or value == pinned_value
+        else:
+            raise ValueError(f"Unknown change '{kind}'. Use one of {', '.join(CHANGE_KINDS)}.")
+        restricted = {var: [value for value in values if keep(var, value)] for var, values in restricted.items()}
+    return restricted
+
+def _neighbors(problem, free, schedule):
+    """Variables sharing a section, instructor or room with the freed ones."""
+    sections, instructors, rooms = set(), set(), set()
+    for var in free:
+        sections |= problem.var_metadata.get(var, {}).get('sections', set())
+        if var in schedule:
+            instructors.add(schedule[var][2])
+            rooms.add(schedule[var][1])
+    return {var for var, value in schedule.items()
+            if value[2] in instructors or value[1] in rooms
+            or not problem.var_metadata.get(var, {}).get('sections', set()).isdisjoint(sections)}
+
+def repair_schedule(problem, domains, schedule, node_limit=5000):
+    """
+    Keeps every session of `schedule` that is still allowed and re-solves
+    the others, widening the freed set to their neighbors when the repair
+    fails. Returns (new schedule or None, freed variables).
+    """
+    from cspLns import repair
+    from cspGrouping import solve_backtracking
+
+    allowed = {var: set(values) for var, values in domains.items()}
+    free = {var for var, value in schedule.items() if value not in allowed[var]}
+    if not free:
+        return dict(schedule), set()
+    for _ in range(3):
+        repaired = repair(problem.variables, domains, schedule, free, problem.context, node_limit)
+        if repaired is not None:
+            return repaired, free
+        free |= _neighbors(problem, free, schedule)
+    return solve_backtracking(problem.variables, domains, {}, verbose=False), set(problem.variables)
+
+# --- 3. SERVER ---
+
+def _solve(problem, domains):
+    from cspGrouping import solve_backtracking, METRICS
+    if any(not values for values in domains.values()):
+        return None
+    METRICS.reset()
+    return solve_backtracking(problem.variables, domains, {}, verbose=False)
+
+def handle_request(state, request):
+    """Runs one command against the current warm problem and returns the reply dict."""
+    command = request.get('command')
+    problem = state.problem
+    if command == 'status':
+        return {'ok': True, 'folder': problem.folder_path, 'variables': len(problem.variables),
+                'consistent': problem.consistent, 'loads': problem.loads,
+                'load_seconds': round(problem.load_seconds, 3), 'has_schedule': problem.last_schedule is not None,
+                'changes': problem.changes}
+    if command == 'reload':  # Also drops the changes kept by resolve
+        state.reload(force=True)
+        return {'ok': True, 'load_seconds': round(state.problem.load_seconds, 3)}
+    if command not in ('solve', 'whatif', 'resolve'):
+        return {'ok': False, 'error': f"Unknown command '{command}'."}
+    with SOLVE_LOCK:
+        return _solve_request(problem, command, request)
+
+def _solve_request(problem, command, request):
+    from cspGrouping import METRICS
+
+    start = time.perf_counter()
+    problem.activate()
+    if not problem.consistent:
+        return {'ok': False, 'error': "The dataset has no solution (empty domain or AC-3 wipe-out)."}
+    changes = request.get('changes') or []
+    domains = apply_changes(problem, changes) if changes else problem.domains
+
+    moved = None
+    if command == 'resolve' and problem.last_schedule is not None:
+        METRICS.reset()
+        schedule, freed = repair_schedule(problem, domains, problem.last_schedule)
+        if schedule is not None:
+            moved = sum(1 for var, value in schedule.items() if problem.last_schedule.get(var) != value)
+    else:
+        schedule = _solve(problem, domains)
+
+    reply = {'ok': schedule is not None, 'command': command, 'changes': changes,
+             'seconds': round(time.perf_counter() - start, 4), 'nodes': METRICS.nodes}
+    if schedule is None:
+        reply['error'] = "No timetable satisfies these changes."
+        return reply
+    from cspValidate import validate_schedule
+    validation = validate_schedule(schedule, var_metadata=problem.var_metadata, variables=problem.variables,
+                                   rules=problem.rules)
+    if not validation['valid']:
+        return dict(reply, ok=False, violations=validation['violations'],
+                    error=f"The solver returned an invalid timetable ({len(validation['violations'])} violation(s)).")
+    if command == 'whatif' and problem.last_schedule is not None:
+        moved = sum(1 for var, value in schedule.items() if problem.last_schedule.get(var) != value)
+    if command == 'resolve':
+        problem.domains = domains
+        problem.changes = problem.changes + changes
+    if command in ('solve', 'resolve'):
+        problem.last_schedule = schedule
+    reply['moved'] = moved
+    reply['schedule'] = schedule
+    if request.get('output'):
+        from cspGrouping import display_and_save_timetable
+        display_and_save_timetable(schedule, problem.data, output_filename=request['output'], show_gui=False)
+        reply['output'] = request['output']
+    return reply
+
+def _serve_connection(conn, state, stop):
+    with conn:
+        while True:
+            try:
+                request = conn.recv()
+            except (EOFError, OSError):
+                return
+            try:
+                if not isinstance(request, dict):
+                    raise TypeError(f"a request must be a dict, got {type(request).__name__}")
+                if request.get('command') == 'stop':
+                    conn.send({'ok': True})
+                    stop.set()
+                    return
+                reply = handle_request(state, request)
+            except Exception as e:
+                reply = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            conn.send(reply)
+
+def _watch(state, stop, interval):
+    while not stop.wait(interval):
+        try:
+            state.reload()
+        except Exception as e:
+            print(f"  -> 🔴 WARNING: Reload failed: {e}")
+
+def serve(folder_path, address=None, authkey=None, poll_seconds=POLL_SECONDS):
+    """Loads the problem and answers requests until a 'stop' command arrives."""
+    address = address or default_address()
+    authkey = authkey or (os.environ.get('CSP_DAEMON_KEY') or secrets.token_hex(16)).encode()
+    state = WarmState(folder_path)
+    state.reload()
+
+    if isinstance(address, str) and os.path.exists(address):
+        os.unlink(address)  # Stale socket from a previous run
+    listener = Listener(address, authkey=authkey)
+    key_path = key_file_for(address)
+    with open(os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb') as f:
+        f.write(authkey)
+
+    stop = threading.Event()
+    threading.Thread(target=_watch, args=(state, stop, poll_seconds), daemon=True).start()
+    print(f"✅ Solver daemon listening on {address}")
+
+    def accept_loop():
+        while not stop.is_set():
+            try:
+                conn = listener.accept()
+            except Exception:
+                if stop.is_set():
+                    return
+                continue  # Failed handshake (wrong key) or dropped client
+            threading.Thread(target=_serve_connection, args=(conn, state, stop), daemon=True).start()
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+    try:
+        stop.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        for path in (key_path, address if isinstance(address, str) else None):
+            if path and os.path.exists(path):
+                os.unlink(path)
+    print(" -> Solver daemon stopped.")
+
+# --- 4. CLIENT ---
+
+class DaemonClient:
+    """Thin client; does not import pandas or the solver."""
+
+    def __init__(self, address=None, authkey=None):
+        self.address = address or default_address()
+        self.conn = Client(self.address, authkey=authkey or _read_authkey(self.address))
+
+    def call(self, command, **options):
+        self.conn.send(dict(options, command=command))
+        return self.conn.recv()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _parse_changes(args):
+    changes = [{'close_room': room} for room in args.close_room]
+    changes += [{'forbid_slot': slot} for slot in args.forbid_slot]
+    for item in args.forbid_day:
+        instructor, _, day = item.partition(':')
+        if not day:
+            raise SystemExit(f"❌ --forbid-day expects INSTRUCTOR:DAY, got '{item}'")
+        changes.append({'forbid_day': [instructor, day]})
+    for item in args.pin:
+        var, _, value = item.partition('=')
+        parts = value.split(',')
+        if len(parts) != 3:
+            raise SystemExit(f"❌ --pin expects VARIABLE=TIMESLOT,ROOM,INSTRUCTOR, got '{item}'")
+        changes.append({'pin': [var, parts]})
+    return changes
+
+# --- MAIN EXECUTION ---
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Warm timetable solver daemon and client.")
+    parser.add_argument('--socket', default=None, help="Unix socket path (default: in the temp dir)")
+    parser.add_argument('--port', type=int, default=None, help="Use localhost TCP on this port instead")
+    sub = parser.add_subparsers(dest='command', required=True)
+    serve_cmd = sub.add_parser('serve', help="Start the daemon")
+    serve_cmd.add_argument('data_folder', nargs='?', default=os.environ.get('CSP_DATA_DIR', r"E:\CSP_data"))
+    serve_cmd.add_argument('--poll', type=float, default=POLL_SECONDS, help="Seconds between data folder checks")
+    for name, text in (('solve', "Solve on the warm problem"),
+                       ('whatif', "Solve with temporary changes (the daemon state is not changed)"),
+                       ('resolve', "Apply changes and repair the last timetable with minimal moves")):
+        cmd = sub.add_parser(name, help=text)
+        cmd.add_argument('--close-room', action='append', default=[], metavar='ROOM')
+        cmd.add_argument('--forbid-slot', action='append', default=[], metavar='TIMESLOT')
+        cmd.add_argument('--forbid-day', action='append', default=[], metavar='INSTRUCTOR:DAY')
+        cmd.add_argument('--pin', action='append', default=[], metavar='VARIABLE=TIMESLOT,ROOM,INSTRUCTOR')
+        cmd.add_argument('--output', default=None, help="Have the daemon write the timetable CSV here")
+    for name, text in (('status', "Show the daemon state"), ('reload', "Reload the data folder now"),
+                       ('stop', "Stop the daemon")):
+        sub.add_parser(name, help=text)
+    args = parser.parse_args()
+
+    address = args.socket or default_address(args.port)
+    if args.command == 'serve':
+        serve(args.data_folder, address, poll_seconds=args.poll)
+        sys.exit(0)
+
+    options = {}
+    if args.command in ('solve', 'whatif', 'resolve'):
+        options['changes'] = _parse_changes(args)
+        if args.output:
+            options['output'] = os.path.abspath(args.output)
+    try:
+        with DaemonClient(address) as client:
+            reply = client.call(args.command, **options)
+    except (ConnectionError, OSError) as e:
+        sys.exit(f"❌ Could not reach the solver daemon at {address}: {e}")
+
+    if not reply.get('ok'):
+        sys.exit(f"❌ {reply.get('error', 'Request failed.')}")
+    if 'schedule' in reply:
+        moved = '' if reply.get('moved') is None else f", {reply['moved']} session(s) moved"
+        print(f"✅ {args.command}: {len(reply['schedule'])} sessions in {reply['seconds']:.3f}s "
+              f"({reply['nodes']} nodes{moved})")
+        if reply.get('output'):
+            print(f" -> Saved to '{reply['output']}'")
+    else:
+        details = ', '.join(f"{key}={value}" for key, value in reply.items() if key != 'ok')
+        print(f"✅ {args.command}" + (f": {details}" if details else ''))
@@ -0,0 +1,211 @@
+#
+# Intelligent Systems Project 1:
+# Streaming, compressed setup dumps and diffs between runs.
+#
+# A dump is gzip-compressed NDJSON (one JSON record per line), written
+# variable by variable so the whole text never sits in memory:
+#
+#   {"kind":"header", "format":"csp-setup-dump", "version":1, "variables":N, "values":M}
+#   {"kind":"variable", "variable":V, "size":n, "digest":..., "sections":[...], "empty_reason":...}
+#   {"kind":"values", "variable":V, "chunk":0, "values":[[TimeSlotID, RoomID, InstructorID], ...]}
+#   ... more "values" chunks of at most `chunk_size` values
+#
+# Variables are written in sorted order and each domain sorted, so the
+# digest only depends on the set of values and two dumps can be compared by
+# walking them side by side, holding one variable's domain at a time. A
+# diff that only needs sizes and digests skips the "values" lines without
+# parsing them.
+#
+
+import gzip
+import json
+import time
+import hashlib
+
+FORMAT = 'csp-setup-dump'
+VERSION = 1
+VALUES_PREFIX = '{"kind":"values"'
+
+# --- 1. WRITER ---
+
+def write_setup_dump(path, variables, domains, empty_reasons=None, var_metadata=None, chunk_size=1000,
+                     compresslevel=1):
+    """
+    Streams variables and domains to `path` (gzip NDJSON). Returns
+    {'path', 'variables', 'values', 'bytes', 'seconds'}. Level 1 compression
+    favours speed; raise it for archiving.
+    """
+    start = time.perf_counter()
+    empty_reasons = empty_reasons or {}
+    var_metadata = var_metadata or {}
+    ordered = sorted(variables)
+    total = sum(len(domains.get(var, ())) for var in ordered)
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    with gzip.open(path, 'wt', encoding='utf-8', compresslevel=compresslevel) as f:
+        f.write(dumps({'kind': 'header', 'format': FORMAT, 'version': VERSION,
+                       'variables': len(ordered), 'values': total}) + '\n')
+        for var in ordered:
+            values = sorted(domains.get(var, ()))
+            # One variable's chunks are encoded first: the digest covers their (sorted) values
+            chunks = [dumps(values[offset:offset + chunk_size]) for offset in range(0, len(values), chunk_size)]
+            digest = hashlib.sha1()
+            for chunk in chunks:
+                digest.update(chunk.encode('utf-8'))
+            record = {'kind': 'variable', 'variable': var, 'size': len(values), 'digest': digest.hexdigest(),
+                      'sections': sorted(var_metadata.get(var, {}).get('sections', ()))}
+            if not values:
+                record['empty_reason'] = empty_reasons.get(var, "No specific reason captured.")
+            f.write(dumps(record) + '\n')
+            prefix = VALUES_PREFIX + ',"variable":' + dumps(var) + ',"chunk":'
+            for index, chunk in enumerate(chunks):
+                f.write(f'{prefix}{index},"values":{chunk}}}\n')
+    with open(path, 'rb') as f:
+        size = f.seek(0, 2)
+    return {'path': path, 'variables': len(ordered), 'values': total, 'bytes': size,
+            'seconds': round(time.perf_counter() - start, 6)}
+
+# --- 2. READER ---
+
+def iter_dump(path, values=True):
+    """
+    Lazily yields the records of a dump. With values=False the "values"
+    lines are skipped before JSON parsing.
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        header = json.loads(f.readline() or 'null')
+        if not header or header.get('format') != FORMAT:
+            raise ValueError(f"'{path}' is not a {FORMAT} file.")
+        if header['version'] > VERSION:
+            raise ValueError(f"'{path}' has dump version {header['version']}; this reader supports {VERSION}.")
+        yield header
+        for line in f:
+            if not values and line.startswith(VALUES_PREFIX):
+                continue
+            yield json.loads(line)
+
+def iter_domains(path, values=True):
+    """
+    Yields (variable record, domain) one variable at a time, in sorted
+    variable order. The domain is a list of value tuples, or None when
+    values=False.
+    """
+    current, domain = None, None
+    for record in iter_dump(path, values):
+        kind = record['kind']
+        if kind == 'variable':
+            if current is not None:
+                yield current, domain
+            current, domain = record, ([] if values else None)
+        elif kind == 'values' and values:
+            domain.extend(tuple(value) for value in record['values'])
+    if current is not None:
+        yield current, domain
+
+# --- 3. DIFF ---
+
+def diff_dumps(path_a, path_b, values=False):
+    """
+    Compares two dumps variable by variable without loading either whole.
+    Returns {'added', 'removed', 'grew', 'shrank', 'changed', 'unchanged', ...}:
+    grew/shrank/changed (same size, other values) hold
+    {'variable', 'before', 'after'}, plus 'gained' and 'lost' value counts
+    when values=True.
+    """
+    start = time.perf_counter()
+    report = {'added': [], 'removed': [], 'grew': [], 'shrank': [], 'changed': [], 'unchanged': 0,
+              'values_before': 0, 'values_after': 0}
+    stream_a, stream_b = iter_domains(path_a, values), iter_domains(path_b, values)
+    a, b = next(stream_a, None), next(stream_b, None)
+    while a is not None or b is not None:
+        name_a = a[0]['variable'] if a is not None else None
+        name_b = b[0]['variable'] if b is not None else None
+        if b is None or (a is not None and name_a < name_b):
+            report['removed'].append({'variable': name_a, 'before': a[0]['size']})
+            report['values_before'] += a[0]['size']
+            a = next(stream_a, None)
+            continue
+        if a is None or name_b < name_a:
+            report['added'].append({'variable': name_b, 'after': b[0]['size']})
+            report['values_after'] += b[0]['size']
+            b = next(stream_b, None)
+            continue
+
+        (record_a, domain_a), (record_b, domain_b) = a, b
+        report['values_before'] += record_a['size']
+        report['values_after'] += record_b['size']
+        if record_a['digest'] == record_b['digest']:
+            report['unchanged'] += 1
+        else:
+            entry = {'variable': name_a, 'before': record_a['size'], 'after': record_b['size']}
+            if values:
+                set_a, set_b = set(domain_a), set(domain_b)
+                entry['gained'], entry['lost'] = len(set_b - set_a), len(set_a - set_b)
+            kind = ('grew' if record_b['size'] > record_a['size'] else
+                    'shrank' if record_b['size'] < record_a['size'] else 'changed')
+            report[kind].append(entry)
+        a, b = next(stream_a, None), next(stream_b, None)
+
+    for kind in ('grew', 'shrank'):
+        report[kind].sort(key=lambda entry: -abs(entry['after'] - entry['before']))
+    report['seconds'] = round(time.perf_counter() - start, 6)
+    return report
+
+def format_diff(report, limit=10):
+    """Human-readable lines for the CLI."""
+    lines = [f"✅ Domains: {report['values_before']} -> {report['values_after']} values; "
+             f"{len(report['grew'])} grew, {len(report['shrank'])} shrank, {len(report['changed'])} changed, "
+             f"{report['unchanged']} unchanged, {len(report['added'])} added, {len(report['removed'])} removed "
+             f"({report['seconds']:.2f}s)."]
+    for kind in ('grew', 'shrank', 'changed'):
+        for entry in report[kind][:limit]:
+            detail = f" (+{entry['gained']}/-{entry['lost']})" if 'gained' in entry else ''
+            lines.append(f"  -> [{kind}] {entry['variable']}: {entry['before']} -> {entry['after']}{detail}")
+        if len(report[kind]) > limit:
+            lines.append(f"  -> ... and {len(report[kind]) - limit} more {kind}.")
+    for kind, size_key in (('added', 'after'), ('removed', 'before')):
+        for entry in report[kind][:limit]:
+            lines.append(f"  -> [{kind}] {entry['variable']} ({entry[size_key]} values)")
+        if len(report[kind]) > limit:
+            lines.append(f"  -> ... and {len(report[kind]) - limit} more {kind}.")
+    return '\n'.join(lines)
+
+# --- MAIN EXECUTION ---
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write, inspect and diff compressed CSP setup dumps.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    write = commands.add_parser('write', help="Load a dataset, run setup and dump every domain")
+    write.add_argument('data_folder')
+    write.add_argument('output', help="Dump file, e.g. setup.ndjson.gz")
+    write.add_argument('--chunk-size', type=int, default=1000)
+    show = commands.add_parser('show', help="Print the variables of a dump (and one domain)")
+    show.add_argument('dump')
+    show.add_argument('--variable', default=None, help="Also print this variable's values")
+    diff = commands.add_parser('diff', help="Which domains grew or shrank between two dumps")
+    diff.add_argument('before')
+    diff.add_argument('after')
+    diff.add_argument('--values', action='store_true', help="Also count gained and lost values")
+    diff.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == 'write':
+        import cspGrouping
+        from cspCache import load_problem
+        problem, _ = load_problem(args.data_folder)
+        if problem is None:
+            raise SystemExit("❌ Failed to load CSV data.")
+        variables, domains, _, empty_reasons = problem
+        info = write_setup_dump(args.output, variables, domains, empty_reasons, cspGrouping.VAR_METADATA,
+                                chunk_size=args.chunk_size)
+        print(f"✅ Dumped {info['variables']} variables ({info['values']} values) to '{info['path']}' "
+              f"-> {info['bytes'] / 1e6:.1f} MB in {info['seconds']:.2f}s")
+    elif args.command == 'show':
+        for record, domain in iter_domains(args.dump, values=bool(args.variable)):
+            reason = f"  EMPTY: {record['empty_reason']}" if 'empty_reason' in record else ''
+            print(f"{record['variable']}  ({record['size']} values){reason}")
+            if record['variable'] == args.variable:
+                for value in domain:
+                    print(f"  -> {value}")
+    else:
+        print(format_diff(diff_dumps(args.before, args.after, values=args.values), limit=args.limit))
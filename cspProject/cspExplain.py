@@ -0,0 +1,229 @@
+#
+# Intelligent Systems Project 1:
+# Minimal conflict explanations for infeasible timetables (QuickXplain).
+#
+# The problem is rebuilt with instructor preferences switched off, then cut
+# into "items" that can each be switched on or off:
+#
+#   section S              all sessions that cover section S
+#   course C               all sessions of course C (granularity='course')
+#   preference I on D      instructor I may not teach on day D
+#   room R                 room R holds one session per timeslot; switched
+#                          off, every session gets a private copy of R (its
+#                          type and capacity still apply), so a conflict that
+#                          names rooms is a shortage of exactly those rooms
+#
+# Adding items only ever makes the problem harder, so QuickXplain (Junker,
+# 2004) can divide and conquer its way to a small infeasible subset in
+# O(k log n) checks instead of one check per deleted row. Every check uses
+# the fast path: resource-count screening, then global all-different
+# propagation, then a node-limited search. A check that runs out of nodes is
+# treated as "feasible", so whatever is returned has been proven infeasible.
+# An optional wall-clock budget bounds the whole extraction; when it runs out
+# no conflict is reported rather than an unproven one.
+#
+
+import time
+
+from cspGrouping import (setup_csp, create_day_to_slots_map, solve_backtracking,
+                         SearchLimitReached, VAR_METADATA, METRICS)
+from cspGlobal import build_alldiff_propagators, propagate_global
+from cspScreening import screen_feasibility
+
+# --- 1. RELAXED PROBLEM AND ITEMS ---
+
+def _preference_items(data, day_to_slots):
+    """{('preference', instructor, day): set of forbidden (timeslot, instructor) pairs}."""
+    items = {}
+    for _, row in data['instructors'].iterrows():
+        pref = str(row.get('PreferredSlots', 'Anytime'))
+        if "Not on" in pref:
+            day = pref.split("Not on ")[-1].strip()
+            inst_id = row['InstructorID']
+            items[('preference', inst_id, day)] = {(t, inst_id) for t in day_to_slots.get(day, [])}
+    return items
+
+def _relaxed_problem(data):
+    """setup_csp on a copy of the dataset with every instructor available any day."""
+    relaxed = dict(data)
+    relaxed['instructors'] = data['instructors'].copy()
+    if 'PreferredSlots' in relaxed['instructors'].columns:
+        relaxed['instructors']['PreferredSlots'] = 'Anytime'
+    variables, domains, _, _ = setup_csp(relaxed)
+    return variables, domains
+
+def _room_items(domains):
+    """{('room', R)} for every room some session can use."""
+    return {('room', value[1]) for values in domains.values() for value in values}
+
+class ConflictOracle:
+    """Answers "is this set of items infeasible?" and counts how often it was asked."""
+
+    def __init__(self, variables, domains, var_items, preferences, node_limit=500, deadline=None):
+        self.variables = variables
+        self.domains = domains
+        self.var_items = var_items
+        self.preferences = preferences
+        self.node_limit = node_limit
+        self.deadline = deadline
+        self.checks = 0
+        self.last_reason = None
+
+    def subproblem(self, items):
+        items = set(items)
+        forbidden = set()
+        for item in items:
+            forbidden |= self.preferences.get(item, set())
+        variables = [v for v in self.variables if not self.var_items[v].isdisjoint(items)]
+        shared = {item[1] for item in items if item[0] == 'room'}
+        domains = {v: [value if value[1] in shared else (value[0], f"{value[1]}@{v}", value[2])
+                       for value in self.domains[v] if (value[0], value[2]) not in forbidden]
+                   for v in variables}
+        return variables, domains
+
+    def infeasible(self, items):
+        """Raises SearchLimitReached once the deadline has passed."""
+        remaining = self.deadline - time.perf_counter() if self.deadline is not None else None
+        if remaining is not None and remaining <= 0:
+            raise SearchLimitReached(self.checks)
+        self.checks += 1
+        variables, domains = self.subproblem(items)
+        if not variables:
+            return False
+
+        screening = screen_feasibility(variables, domains, VAR_METADATA)
+        if not screening['feasible']:
+            self.last_reason = screening['violations'][0]['resource']
+            return True
+
+        propagators = build_alldiff_propagators(variables, VAR_METADATA)
+        consistent, _, failed = propagate_global(propagators, domains)
+        if not consistent:
+            self.last_reason = failed
+            return True
+
+        try:
+            found = solve_backtracking(variables, domains, {}, verbose=False,
+                                       node_limit=self.node_limit, time_limit=remaining)
+        except SearchLimitReached:
+            if self.deadline is not None and time.perf_counter() >= self.deadline:
+                raise
+            return False
+        if found is None:
+            self.last_reason = "exhaustive search"
+            return True
+        return False
+
+# --- 2. QUICKXPLAIN ---
+
+def quickxplain(oracle, items, background=()):
+    """
+    Returns a minimal subset of `items` that is infeasible together with
+    `background`, or None if background + items is not (provably) infeasible.
+    """
+    background = list(background)
+    if not oracle.infeasible(background + list(items)):
+        return None
+    if not items:
+        return []
+    return _qx(oracle, background, False, list(items))
+
+def _qx(oracle, background, background_changed, items):
+    if background_changed and oracle.infeasible(background):
+        return []
+    if len(items) == 1:
+        return list(items)
+    middle = len(items) // 2
+    first, second = items[:middle], items[middle:]
+    conflict_second = _qx(oracle, background + first, bool(first), second)
+    conflict_first = _qx(oracle, background + conflict_second, bool(conflict_second), first)
+    return conflict_first + conflict_second
+
+# --- 3. ENTRY POINT ---
+
+def _item_dict(item):
+    if item[0] == 'preference':
+        return {'kind': 'preference', 'instructor': item[1], 'day': item[2],
+                'label': f"{item[1]} not on {item[2]}"}
+    return {'kind': item[0], 'id': item[1], 'label': f"{item[0]} {item[1]}"}
+
+def explain_infeasibility(data, granularity='section', node_limit=500, time_limit=None):
+    """
+    Extracts a small jointly infeasible set of sections (or courses),
+    instructor preferences and rooms. Returns a dict with 'conflict' (item dicts),
+    'variables', 'resources', 'checks', 'seconds', 'timed_out' and 'message'.
+    With `time_limit` (seconds) the extraction gives up once it is spent.
+    """
+    if granularity not in ('section', 'course'):
+        raise ValueError("granularity must be 'section' or 'course'")
+    start = time.perf_counter()
+    deadline = start + time_limit if time_limit is not None else None
+    result = {'conflict': [], 'variables': [], 'resources': [], 'checks': 0, 'seconds': 0.0,
+              'timed_out': False, 'message': ''}
+
+    with METRICS.phase('explain'):
+        variables, domains = _relaxed_problem(data)
+        day_to_slots = create_day_to_slots_map(data['timeslots'])
+        preferences = _preference_items(data, day_to_slots)
+
+        var_items = {}
+        for var in variables:
+            if granularity == 'course':
+                var_items[var] = {('course', var.split('_')[0])}
+            else:
+                var_items[var] = {('section', s) for s in VAR_METADATA.get(var, {}).get('sections', ())}
+        structural = sorted({item for items in var_items.values() for item in items})
+        rooms = sorted(_room_items(domains))
+        items = structural + sorted(preferences) + rooms
+
+        oracle = ConflictOracle(variables, domains, var_items, preferences, node_limit, deadline)
+
+        # Start from the sessions the screening already blames, when it blames any.
+        _, all_domains = oracle.subproblem(items)
+        screening = screen_feasibility(variables, all_domains, VAR_METADATA)
+        try:
+            if not screening['feasible']:
+                blamed = set()
+                for var in screening['violations'][0]['variables']:
+                    blamed |= var_items[var]
+                focused = sorted(blamed) + sorted(preferences) + rooms
+                if oracle.infeasible(focused):
+                    items = focused
+
+            conflict = quickxplain(oracle, items)
+        except SearchLimitReached:
+            conflict, result['timed_out'] = None, True
+
+    result['checks'] = oracle.checks
+    result['seconds'] = round(time.perf_counter() - start, 6)
+    if result['timed_out']:
+        result['message'] = (f"Ran out of the {time_limit}s explanation budget after {oracle.checks} checks "
+                             "before isolating a conflict.")
+        return result
+    if conflict is None:
+        result['message'] = (f"Could not isolate a conflict within {node_limit} search nodes per check; "
+                             "the dataset may need a full search to prove infeasible.")
+        return result
+
+    # Re-run the final check so the reported reason belongs to the conflict itself.
+    oracle.deadline = None
+    oracle.infeasible(conflict)
+    conflict_vars, _ = oracle.subproblem(conflict)
+    result['conflict'] = [_item_dict(item) for item in conflict]
+    result['variables'] = conflict_vars
+    result['resources'] = [oracle.last_reason] if oracle.last_reason else []
+    result['message'] = (f"{len(conflict)} item(s) are jointly infeasible: "
+                         + '; '.join(item['label'] for item in result['conflict']))
+    return result
+
+def format_explanation(explanation):
+    """Human-readable lines for the CLI."""
+    if not explanation['conflict']:
+        return f"🔴 {explanation['message']}"
+    lines = [f"🔴 Minimal conflict ({explanation['checks']} checks, {explanation['seconds']:.2f}s):"]
+    for item in explanation['conflict']:
+        lines.append(f"  -> {item['label']}")
+    if explanation['resources']:
+        lines.append(f"  -> Overloaded: {', '.join(explanation['resources'])}")
+    lines.append(f"  -> Sessions involved: {len(explanation['variables'])}")
+    return '\n'.join(lines)
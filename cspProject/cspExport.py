@@ -0,0 +1,260 @@
+#
+# Intelligent Systems Project 1:
+# Headless export pipeline for solved timetables.
+#
+# Rows are streamed straight from the schedule dict using lookup dicts built
+# once from the dataset, so no intermediate DataFrame is created. Exporters
+# are looked up by name in EXPORTERS; new formats can be added with
+# register_exporter().
+#
+
+import os
+import re
+import csv
+import json
+from datetime import date, datetime, timedelta, timezone
+
+from cspGrouping import get_sections_from_var
+
+# Column order used by the CSV/Parquet writers.
+ROW_FIELDS = ['Day', 'Time', 'Section', 'Course', 'Instructor', 'Room',
+              'CourseID', 'CourseName', 'Type', 'InstructorID', 'TimeSlotID',
+              'StartTime', 'EndTime', 'Variable']
+
+DAY_NUMBERS = {'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
+               'Friday': 4, 'Saturday': 5, 'Sunday': 6}
+
+# --- 1. ROW STREAMING ---
+
+def build_lookups(data):
+    """
+    Converts the dataset DataFrames to plain dicts once, keyed by ID.
+    The result is all the exporters need, so it can be cached and reused.
+    """
+    return {
+        'timeslots': data['timeslots'].set_index('TimeSlotID').to_dict('index'),
+        'instructors': data['instructors'].set_index('InstructorID').to_dict('index'),
+        'rooms': data['rooms'].set_index('RoomID').to_dict('index'),
+        'courses': data['courses'].set_index('CourseID').to_dict('index'),
+    }
+
+def iter_schedule_rows(schedule, lookups):
+    """
+    Yields one row dict per (variable, section) in the schedule.
+    Grouped lectures produce one row for each of their sections.
+    """
+    timeslots, instructors, courses = lookups['timeslots'], lookups['instructors'], lookups['courses']
+    for variable, (time_id, room_id, instructor_id) in schedule.items():
+        parts = variable.split('_')
+        course_id, var_type = parts[0], parts[1]
+
+        sections = get_sections_from_var(variable)
+        time_details = timeslots.get(time_id)
+        instructor_info = instructors.get(instructor_id)
+        if not sections or time_details is None or instructor_info is None:
+            print(f"Warning: Skipping variable '{variable}' in export due to missing data.")
+            continue
+
+        start, end = time_details.get('StartTime', 'N/A'), time_details.get('EndTime', 'N/A')
+        row = {
+            'Day': time_details.get('Day', 'N/A'),
+            'Time': f"{start} - {end}",
+            'Course': f"{course_id} ({var_type})",
+            'Instructor': instructor_info.get('Name', 'N/A'),
+            'Room': room_id,
+            'CourseID': course_id,
+            'CourseName': courses.get(course_id, {}).get('CourseName', ''),
+            'Type': var_type,
+            'InstructorID': instructor_id,
+            'TimeSlotID': time_id,
+            'StartTime': start,
+            'EndTime': end,
+            'Variable': variable,
+        }
+        for section_id in sorted(sections):
+            yield dict(row, Section=section_id)
+
+# --- 2. EXPORTERS ---
+
+def write_csv(rows, output_dir, basename):
+    path = os.path.join(output_dir, f"{basename}.csv")
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=ROW_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return [path]
+
+def write_json(rows, output_dir, basename):
+    """Writes a JSON array one row at a time instead of building it in memory."""
+    path = os.path.join(output_dir, f"{basename}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for n, row in enumerate(rows):
+            f.write(',\n' if n else '\n')
+            f.write(json.dumps(row, ensure_ascii=False))
+        f.write('\n]\n')
+    return [path]
+
+def write_parquet(rows, output_dir, basename, batch_size=10000):
+    """Writes Parquet in record batches. Requires pyarrow."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("❌ Parquet export needs pyarrow (pip install pyarrow). Skipping.")
+        return []
+
+    path = os.path.join(output_dir, f"{basename}.parquet")
+    schema = pa.schema([(field, pa.string()) for field in ROW_FIELDS])
+    with pq.ParquetWriter(path, schema) as writer:
+        batch = []
+        for row in rows:
+            batch.append({field: str(row[field]) for field in ROW_FIELDS})
+            if len(batch) >= batch_size:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    return [path]
+
+def _ical_escape(text):
+    return str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+def _ical_fold(line):
+    """Folds a content line to 75 octets as required by RFC 5545."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    chunks, start = [], 0
+    while start < len(encoded):
+        end = min(start + (75 if not chunks else 74), len(encoded))
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1  # Never split inside a UTF-8 sequence
+        chunks.append(encoded[start:end].decode('utf-8'))
+        start = end
+    return '\r\n '.join(chunks) + '\r\n'
+
+def _safe_name(key):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', str(key)).strip('_') or 'unnamed'
+
+def write_ical(rows, output_dir, basename, term_start=None, weeks=14):
+    """
+    Writes one .ics calendar per section, per instructor and per room under
+    <output_dir>/<basename>_ical/. Each session is a weekly recurring event
+    starting in the first week on or after term_start.
+    """
+    term_start = term_start or date.today()
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    calendars = {'section': {}, 'instructor': {}, 'room': {}}
+    seen = set()
+
+    for row in rows:
+        day = DAY_NUMBERS.get(row['Day'])
+        try:
+            start = datetime.strptime(str(row['StartTime']).strip(), '%I:%M %p').time()
+            end = datetime.strptime(str(row['EndTime']).strip(), '%I:%M %p').time()
+        except ValueError:
+            continue
+        if day is None:
+            continue
+        first_day = term_start + timedelta(days=(day - term_start.weekday()) % 7)
+
+        def event(uid):
+            return ''.join(_ical_fold(line) for line in [
+                'BEGIN:VEVENT',
+                f"UID:{uid}@csp-timetable",
+                f"DTSTAMP:{stamp}",
+                f"DTSTART:{datetime.combine(first_day, start).strftime('%Y%m%dT%H%M%S')}",
+                f"DTEND:{datetime.combine(first_day, end).strftime('%Y%m%dT%H%M%S')}",
+                f"RRULE:FREQ=WEEKLY;COUNT={weeks}",
+                f"SUMMARY:{_ical_escape(row['Course'] + ' ' + row['CourseName']).strip()}",
+                f"LOCATION:{_ical_escape(row['Room'])}",
+                f"DESCRIPTION:{_ical_escape('Instructor: ' + row['Instructor'] + ', Section: ' + row['Section'])}",
+                'END:VEVENT',
+            ])
+
+        calendars['section'].setdefault(row['Section'], []).append(event(f"{row['Variable']}-{row['Section']}"))
+        # Grouped lectures appear once per section in the row stream but are
+        # a single event for the instructor and the room.
+        if row['Variable'] not in seen:
+            seen.add(row['Variable'])
+            calendars['instructor'].setdefault(row['InstructorID'], []).append(event(row['Variable']))
+            calendars['room'].setdefault(row['Room'], []).append(event(row['Variable']))
+
+    ical_dir = os.path.join(output_dir, f"{basename}_ical")
+    paths = []
+    for kind, by_key in calendars.items():
+        os.makedirs(os.path.join(ical_dir, kind), exist_ok=True)
+        for key, events in by_key.items():
+            path = os.path.join(ical_dir, kind, f"{_safe_name(key)}.ics")
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                f.write('BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//CSP Timetable//EN\r\n')
+                f.write(_ical_fold(f"X-WR-CALNAME:{_ical_escape(kind.title() + ' ' + str(key))}"))
+                f.writelines(events)
+                f.write('END:VCALENDAR\r\n')
+            paths.append(path)
+    return paths
+
+EXPORTERS = {
+    'csv': write_csv,
+    'json': write_json,
+    'parquet': write_parquet,
+    'ical': write_ical,
+}
+
+def register_exporter(name, writer):
+    """Adds an exporter: writer(rows, output_dir, basename) -> list of written paths."""
+    EXPORTERS[name] = writer
+
+# --- 3. PIPELINE ---
+
+def export_schedule(schedule, data=None, output_dir='.', formats=('csv',), basename='timetable', lookups=None):
+    """
+    Runs every requested exporter over the schedule and returns {format: [paths]}.
+    Pass `lookups` (from build_lookups) to skip the DataFrame conversion on repeated exports.
+    """
+    if lookups is None:
+        lookups = build_lookups(data)
+    os.makedirs(output_dir, exist_ok=True)
+
+    written = {}
+    for fmt in formats:
+        writer = EXPORTERS.get(fmt)
+        if writer is None:
+            print(f"❌ Unknown export format '{fmt}'. Available: {', '.join(EXPORTERS)}")
+            continue
+        try:
+            written[fmt] = writer(iter_schedule_rows(schedule, lookups), output_dir, basename)
+        except OSError as e:
+            print(f"❌ Could not export {fmt}. Error: {e}")
+            continue
+        if written[fmt]:
+            print(f"✅ Exported {fmt}: {written[fmt][0]}" + (f" (+{len(written[fmt]) - 1} more)" if len(written[fmt]) > 1 else ""))
+    return written
+
+# --- 4. READING A CSV EXPORT BACK ---
+
+# Columns read_schedule_csv needs; write_csv always writes them (ROW_FIELDS)
+SCHEDULE_FIELDS = ('Variable', 'TimeSlotID', 'Room', 'InstructorID')
+assert set(SCHEDULE_FIELDS) <= set(ROW_FIELDS), "write_csv must keep every column read_schedule_csv needs"
+
+def read_schedule_csv(path):
+    """
+    Rebuilds {variable: (TimeSlotID, RoomID, InstructorID)} from a CSV
+    written by write_csv. Grouped lectures have one row per section; those
+    rows must agree. Raises ValueError for files without the ID columns
+    (e.g. the old five-column timetable_output.csv) or conflicting rows.
+    """
+    schedule = {}
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        missing = [field for field in SCHEDULE_FIELDS if field not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(f"'{path}' has no {', '.join(missing)} column(s); re-export it with this "
+                             f"version (columns: {', '.join(ROW_FIELDS)}).")
+        for line, row in enumerate(reader, start=2):
+            value = (row['TimeSlotID'], row['Room'], row['InstructorID'])
+            if schedule.setdefault(row['Variable'], value) != value:
+                raise ValueError(f"'{path}' line {line}: {row['Variable']} is also scheduled at "
+                                 f"{schedule[row['Variable']]}.")
+    return schedule
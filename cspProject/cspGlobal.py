@@ -0,0 +1,267 @@
+#
+# Intelligent Systems Project 1:
+# Global all-different propagators (matching-based filtering, Regin 1994).
+#
+# The binary is_consistent check forbids two sessions from sharing a
+# (timeslot, room), a (timeslot, instructor), or a timeslot for the same
+# section. Each of those rules is an all-different constraint over a
+# projection of the (TimeSlotID, RoomID, InstructorID) values:
+#
+#   rooms        all variables          value -> (timeslot, room)
+#   instructors  all variables          value -> (timeslot, instructor)
+#   section S    variables covering S   value -> timeslot
+#
+# Filtering on the whole group at once catches Hall-set infeasibilities that
+# pairwise AC-3 cannot see (e.g. six lectures for five rooms in the same
+# remaining slots) and prunes every value that no maximum matching can use.
+#
+
+from operator import itemgetter
+
+# Picklable projections (propagators are shipped to worker processes).
+project_room_slot = itemgetter(0, 1)
+project_instructor_slot = itemgetter(0, 2)
+project_slot = itemgetter(0)
+
+class AllDifferentPropagator:
+    """
+    All-different over project(value) for a group of variables.
+    propagate() prunes domains in place (by assigning new lists) and returns
+    (consistent, changed_variables).
+    """
+
+    def __init__(self, name, variables, project):
+        self.name = name
+        self.variables = list(variables)
+        self.variable_set = frozenset(self.variables)
+        self.project = project
+        self._matching = {}  # variable -> projected value, reused as a warm start
+
+    def __repr__(self):
+        return f"AllDifferentPropagator({self.name!r}, {len(self.variables)} variables)"
+
+    def propagate(self, domains):
+        project = self.project
+        variables = self.variables
+        n = len(variables)
+
+        # Projected bipartite graph: variable index -> list of value ids
+        value_ids, values = {}, []
+        adjacency = []
+        for var in variables:
+            seen = set()
+            for value in domains[var]:
+                key = project(value)
+                if key not in seen:
+                    seen.add(key)
+            ids = []
+            for key in seen:
+                vid = value_ids.get(key)
+                if vid is None:
+                    vid = value_ids[key] = len(values)
+                    values.append(key)
+                ids.append(vid)
+            if not ids:
+                return False, set()
+            adjacency.append(ids)
+
+        if n > len(values):
+            return False, set()  # Pigeonhole: more sessions than distinct values
+
+        match_var, match_val = self._maximum_matching(adjacency, value_ids, len(values))
+        if match_var is None:
+            return False, set()
+        self._matching = {variables[x]: values[match_var[x]] for x in range(n)}
+
+        allowed = self._consistent_edges(adjacency, match_var, match_val, len(values))
+
+        changed = set()
+        for x, var in enumerate(variables):
+            if len(allowed[x]) == len(adjacency[x]):
+                continue
+            keep = {values[vid] for vid in allowed[x]}
+            domains[var] = [value for value in domains[var] if project(value) in keep]
+            changed.add(var)
+        return True, changed
+
+    def _maximum_matching(self, adjacency, value_ids, n_values):
+        """Augmenting-path matching warm-started from the previous call."""
+        n = len(adjacency)
+        match_var = [-1] * n
+        match_val = [-1] * n_values
+
+        for x, var in enumerate(self.variables):
+            previous = self._matching.get(var)
+            vid = value_ids.get(previous) if previous is not None else None
+            if vid is not None and match_val[vid] == -1 and vid in adjacency[x]:
+                match_var[x], match_val[vid] = vid, x
+        for x in range(n):
+            if match_var[x] == -1:
+                for vid in adjacency[x]:
+                    if match_val[vid] == -1:
+                        match_var[x], match_val[vid] = vid, x
+                        break
+
+        for root in range(n):
+            if match_var[root] != -1:
+                continue
+            # Iterative DFS for an augmenting path from `root`
+            visited = set()
+            parent = {}  # value id -> variable that reached it
+            stack = [root]
+            found = -1
+            while stack and found == -1:
+                x = stack.pop()
+                for vid in adjacency[x]:
+                    if vid in visited:
+                        continue
+                    visited.add(vid)
+                    parent[vid] = x
+                    if match_val[vid] == -1:
+                        found = vid
+                        break
+                    stack.append(match_val[vid])
+            if found == -1:
+                return None, None
+            vid = found
+            while vid != -1:
+                x = parent[vid]
+                previous = match_var[x]
+                match_var[x], match_val[vid] = vid, x
+                vid = previous if x != root else -1
+        return match_var, match_val
+
+    def _consistent_edges(self, adjacency, match_var, match_val, n_values):
+        """
+        Keeps edge (x, v) iff it is in the matching, lies on an alternating
+        cycle (x and v in the same SCC) or on an even alternating path that
+        starts at a free value (v reachable from a free value).
+        Graph orientation: value -> variable for non-matching edges,
+        variable -> its matched value.
+        """
+        n = len(adjacency)
+        # Nodes 0..n-1 are variables, n..n+n_values-1 are values.
+        value_to_vars = [[] for _ in range(n_values)]
+        for x, ids in enumerate(adjacency):
+            for vid in ids:
+                if match_var[x] != vid:
+                    value_to_vars[vid].append(x)
+
+        def successors(node):
+            if node < n:
+                return (n + match_var[node],)
+            return value_to_vars[node - n]
+
+        # Reachability from free values
+        reachable = [False] * (n + n_values)
+        stack = [n + vid for vid in range(n_values) if match_val[vid] == -1]
+        for node in stack:
+            reachable[node] = True
+        while stack:
+            node = stack.pop()
+            for succ in successors(node):
+                if not reachable[succ]:
+                    reachable[succ] = True
+                    stack.append(succ)
+
+        component = _strongly_connected_components(n + n_values, successors)
+
+        allowed = []
+        for x, ids in enumerate(adjacency):
+            allowed.append([vid for vid in ids
+                            if vid == match_var[x] or reachable[n + vid] or component[x] == component[n + vid]])
+        return allowed
+
+def _strongly_connected_components(node_count, successors):
+    """Iterative Tarjan. Returns a component id per node."""
+    index_of = [-1] * node_count
+    lowlink = [0] * node_count
+    on_stack = [False] * node_count
+    component = [-1] * node_count
+    stack, counter, n_components = [], 0, 0
+
+    for start in range(node_count):
+        if index_of[start] != -1:
+            continue
+        work = [(start, iter(successors(start)))]
+        index_of[start] = lowlink[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack[start] = True
+        while work:
+            node, children = work[-1]
+            advanced = False
+            for child in children:
+                if index_of[child] == -1:
+                    index_of[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack[child] = True
+                    work.append((child, iter(successors(child))))
+                    advanced = True
+                    break
+                if on_stack[child] and index_of[child] < lowlink[node]:
+                    lowlink[node] = index_of[child]
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if lowlink[node] < lowlink[parent]:
+                    lowlink[parent] = lowlink[node]
+            if lowlink[node] == index_of[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component[member] = n_components
+                    if member == node:
+                        break
+                n_components += 1
+    return component
+
+# --- BUILDING AND RUNNING ---
+
+def build_alldiff_propagators(variables, var_metadata=None):
+    """
+    Creates the room, instructor and per-section all-different propagators
+    for the variables produced by setup_csp.
+    """
+    from cspGrouping import get_sections_from_var
+
+    var_metadata = var_metadata or {}
+    propagators = [
+        AllDifferentPropagator('rooms', variables, project_room_slot),
+        AllDifferentPropagator('instructors', variables, project_instructor_slot),
+    ]
+    section_vars = {}
+    for var in variables:
+        sections = var_metadata.get(var, {}).get('sections') or get_sections_from_var(var)
+        for section in sections:
+            section_vars.setdefault(section, []).append(var)
+    for section in sorted(section_vars):
+        if len(section_vars[section]) > 1:
+            propagators.append(AllDifferentPropagator(f"section {section}", section_vars[section], project_slot))
+    return propagators
+
+def propagate_global(propagators, domains, changed=None):
+    """
+    Runs the propagators to a fixpoint. If `changed` (a set of variables) is
+    given, only propagators touching those variables are woken at first.
+    Returns (consistent, all_changed_variables, failed_propagator_name).
+    """
+    pending = [p for p in propagators if changed is None or not p.variable_set.isdisjoint(changed)]
+    queued = set(id(p) for p in pending)
+    all_changed = set()
+    while pending:
+        propagator = pending.pop()
+        queued.discard(id(propagator))
+        consistent, pruned = propagator.propagate(domains)
+        if not consistent:
+            return False, all_changed, propagator.name
+        if pruned:
+            all_changed |= pruned
+            for other in propagators:
+                if id(other) not in queued and other is not propagator and not other.variable_set.isdisjoint(pruned):
+                    pending.append(other)
+                    queued.add(id(other))
+    return True, all_changed, None
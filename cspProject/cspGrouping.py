@@ -3,45 +3,36 @@
 # Final version with lecture grouping and a filterable GUI.
 #
 
-import pandas as pd
-from itertools import product
+# Only the standard library is imported at module level so that the solver
+# core (setup output -> ac3 -> solve_backtracking) loads without pandas or
+# tkinter. pandas is imported inside the data/export functions that need it
+# and the GUI lives in cspGui.py.
 import os
-from collections import deque
-import tkinter as tk
-from tkinter import ttk
-import re
+import time
+from collections import deque, OrderedDict
+
+from cspMetrics import METRICS
+from cspGlobal import build_alldiff_propagators, propagate_global
+from cspScreening import screen_feasibility, format_report
+from cspValidate import validate_schedule, format_report as format_validation
 
 # --- 1. DATA LOADING ---
 
 def load_data_from_csv(folder_path):
     """
-    Reads all required CSV files from a specified folder into a dictionary of DataFrames.
+    Reads and validates all required CSV files (see cspIngest) into a dictionary
+    of DataFrames. Returns None, after printing every bad row with its line
+    number, when the dataset has errors.
     """
+    from cspIngest import ingest_folder, IngestError, format_report as format_ingest
+    print("--- Loading Data ---")
     try:
-        file_names = {
-            'courses': 'Courses.csv', 'instructors': 'Instructor.csv', 'rooms': 'Rooms.csv',
-            'timeslots': 'TimeSlots.csv', 'sections': 'Sections.csv'
-        }
-        data = {}
-        print("--- Loading Data ---")
-        for key, name in file_names.items():
-            full_path = os.path.join(folder_path, name)
-            print(f"  -> Reading {name}...")
-            data[key] = pd.read_csv(full_path)
-
-        if 'TimeSlotID' not in data['timeslots'].columns:
-            data['timeslots']['TimeSlotID'] = [f'TS{i}' for i in range(len(data['timeslots']))]
-        if 'SecrionID' in data['sections'].columns:
-            data['sections'].rename(columns={'SecrionID': 'SectionID'}, inplace=True)
-
-        print("✅ All CSV files loaded successfully!")
-        return data
-    except FileNotFoundError as e:
-        print(f"❌ ERROR: File not found. Details: {e}")
-        return None
-    except Exception as e:
-        print(f"❌ An error occurred during data loading: {e}")
+        data, report = ingest_folder(folder_path)
+    except IngestError as e:
+        print(format_ingest(e.report))
         return None
+    print(format_ingest(report))
+    return data
 
 # --- GLOBAL METADATA CACHE ---
 # Stores pre-computed info for variables to avoid repetitive parsing
@@ -56,367 +47,11 @@ def create_day_to_slots_map(timeslots_df):
 
 def display_timetable_grid_gui(full_schedule_df):
     """
-    Creates a modern, colorful, filterable GUI window with the timetable in a grid format.
+    Opens the filterable timetable viewer. The GUI module (tkinter) is only
+    imported here, so the solver itself runs on headless machines.
     """
-    if full_schedule_df is None or full_schedule_df.empty:
-        print(" -> No schedule to display in GUI.")
-        return
-
-    # --- Modern Color Scheme ---
-    COLORS = {
-        'bg_primary': '#1e1e2e',      # Dark background
-        'bg_secondary': '#2d2d44',    # Slightly lighter dark
-        'bg_tertiary': '#3a3a5c',     # Even lighter for cards
-        'accent_primary': '#6c5ce7',   # Purple accent
-        'accent_secondary': '#00d2d3', # Cyan accent
-        'accent_success': '#00b894',  # Green
-        'accent_warning': '#fdcb6e',  # Yellow
-        'text_primary': '#ffffff',     # White text
-        'text_secondary': '#b2bec3',  # Light gray text
-        'lecture': '#a29bfe',          # Purple for lectures
-        'lab': '#00d2d3',              # Cyan for labs
-        'header': '#6c5ce7',           # Purple header
-    }
-
-    # --- GUI Setup ---
-    window = tk.Tk()
-    window.title("📅 Modern Timetable Viewer")
-    window.geometry("1600x950")
-    window.configure(bg=COLORS['bg_primary'])
-
-    # --- Modern Header ---
-    header_frame = tk.Frame(window, bg=COLORS['header'], height=80)
-    header_frame.pack(fill='x', padx=0, pady=0)
-    header_frame.pack_propagate(False)
-    
-    title_label = tk.Label(
-        header_frame, 
-        text="📅 Timetable Schedule Viewer", 
-        font=('Segoe UI', 24, 'bold'),
-        bg=COLORS['header'],
-        fg=COLORS['text_primary']
-    )
-    title_label.pack(pady=20)
-
-    # --- Top frame for controls with modern styling ---
-    control_frame = tk.Frame(window, bg=COLORS['bg_secondary'], relief='flat')
-    control_frame.pack(pady=15, padx=20, fill='x')
-
-    # Inner frame for better spacing
-    inner_control = tk.Frame(control_frame, bg=COLORS['bg_secondary'])
-    inner_control.pack(pady=15, padx=20)
-
-    filter_label = tk.Label(
-        inner_control, 
-        text="🔍 Filter by Section:", 
-        font=('Segoe UI', 11, 'bold'),
-        bg=COLORS['bg_secondary'],
-        fg=COLORS['text_primary']
-    )
-    filter_label.pack(side=tk.LEFT, padx=10)
-
-    # Get unique sections sorted by level for the dropdown
-    def get_level_sort_key(section_name):
-        match = re.search(r"L(\d+)", section_name)
-        level = int(match.group(1)) if match else 99
-        section_num_str = ''.join(filter(str.isdigit, section_name.split('_')[0]))
-        section_num = int(section_num_str) if section_num_str else 0
-        return (level, section_num)
-    
-    unique_sections = sorted(full_schedule_df['Section'].unique(), key=get_level_sort_key)
-    
-    section_var = tk.StringVar()
-    
-    # Modern styled combobox
-    style = ttk.Style()
-    style.theme_use('clam')
-    
-    # Configure modern styles
-    style.configure('Modern.TCombobox', 
-                    fieldbackground=COLORS['bg_tertiary'],
-                    background=COLORS['bg_tertiary'],
-                    foreground=COLORS['text_primary'],
-                    borderwidth=0,
-                    relief='flat',
-                    padding=5)
-    style.map('Modern.TCombobox',
-              fieldbackground=[('readonly', COLORS['bg_tertiary'])],
-              selectbackground=[('readonly', COLORS['accent_primary'])],
-              selectforeground=[('readonly', COLORS['text_primary'])])
-    
-    section_dropdown = ttk.Combobox(
-        inner_control, 
-        textvariable=section_var, 
-        values=unique_sections, 
-        state='readonly', 
-        width=28,
-        style='Modern.TCombobox',
-        font=('Segoe UI', 10)
-    )
-    section_dropdown.pack(side=tk.LEFT, padx=10)
-
-    # --- Treeview frame with modern container ---
-    container_frame = tk.Frame(window, bg=COLORS['bg_primary'])
-    container_frame.pack(expand=True, fill='both', padx=20, pady=(0, 20))
-
-    tree_frame = tk.Frame(container_frame, bg=COLORS['bg_secondary'], relief='flat')
-    tree_frame.pack(expand=True, fill='both', padx=5, pady=5)
-
-    # Configure modern Treeview styles
-    style.configure("Modern.Treeview",
-                    background=COLORS['bg_tertiary'],
-                    foreground=COLORS['text_primary'],
-                    fieldbackground=COLORS['bg_tertiary'],
-                    rowheight=75,
-                    font=('Segoe UI', 11))
-    style.configure("Modern.Treeview.Heading",
-                    background=COLORS['accent_primary'],
-                    foreground=COLORS['text_primary'],
-                    font=('Segoe UI', 11, 'bold'),
-                    relief='flat',
-                    borderwidth=0)
-    style.map("Modern.Treeview",
-              background=[('selected', COLORS['accent_primary'])],
-              foreground=[('selected', COLORS['text_primary'])])
-    
-    tree = ttk.Treeview(tree_frame, style="Modern.Treeview")
-
-    # Modern scrollbars
-    style.configure("Modern.Vertical.TScrollbar",
-                    background=COLORS['bg_tertiary'],
-                    troughcolor=COLORS['bg_secondary'],
-                    borderwidth=0,
-                    arrowcolor=COLORS['text_primary'],
-                    darkcolor=COLORS['bg_tertiary'],
-                    lightcolor=COLORS['bg_tertiary'])
-    style.configure("Modern.Horizontal.TScrollbar",
-                    background=COLORS['bg_tertiary'],
-                    troughcolor=COLORS['bg_secondary'],
-                    borderwidth=0,
-                    arrowcolor=COLORS['text_primary'],
-                    darkcolor=COLORS['bg_tertiary'],
-                    lightcolor=COLORS['bg_tertiary'])
-
-    vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview, style="Modern.Vertical.TScrollbar")
-    hsb = ttk.Scrollbar(tree_frame, orient="horizontal", command=tree.xview, style="Modern.Horizontal.TScrollbar")
-    tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-    vsb.pack(side="right", fill="y")
-    hsb.pack(side="bottom", fill="x")
-    tree.pack(side="left", expand=True, fill="both")
-
-    # --- Helper function to format cell content with emojis ---
-    def format_cell_content(cell_content):
-        if not cell_content or cell_content == '':
-            return ''
-        content_str = str(cell_content)
-        if '\n' in content_str:
-            parts = content_str.split('\n')
-            course_part = parts[0].strip() if len(parts) > 0 else ''
-            instructor_part = parts[1].strip() if len(parts) > 1 else ''
-            
-            if '(Lecture)' in course_part:
-                course_name = course_part.replace('(Lecture)', '').strip()
-                return f'📚 {course_name}\n👨‍🏫 {instructor_part}' if instructor_part else f'📚 {course_name}'
-            elif '(Lab)' in course_part:
-                course_name = course_part.replace('(Lab)', '').strip()
-                return f'🔬 {course_name}\n👨‍🔬 {instructor_part}' if instructor_part else f'🔬 {course_name}'
-            else:
-                return f'{course_part}\n👤 {instructor_part}' if instructor_part else course_part
-        else:
-            # No newline, just course name
-            if '(Lecture)' in content_str:
-                course_name = content_str.replace('(Lecture)', '').strip()
-                return f'📚 {course_name}'
-            elif '(Lab)' in content_str:
-                course_name = content_str.replace('(Lab)', '').strip()
-                return f'🔬 {course_name}'
-            return content_str
-
-    # --- Helper function to get row tag based on content ---
-    def get_row_tag(row_values):
-        """Determine if row has lectures, labs, or mixed content for coloring"""
-        has_lecture = any('(Lecture)' in str(v) for v in row_values)
-        has_lab = any('(Lab)' in str(v) for v in row_values)
-        if has_lecture and not has_lab:
-            return 'lecture_row'
-        elif has_lab and not has_lecture:
-            return 'lab_row'
-        elif has_lecture and has_lab:
-            return 'mixed_row'
-        return 'empty_row'
-
-    # --- Helper function to populate the Treeview ---
-    def populate_tree(schedule_df):
-        # Clear existing Treeview content
-        for item in tree.get_children():
-            tree.delete(item)
-        for col in tree["columns"]:
-            tree.heading(col, text="")
-        tree["columns"] = []
-
-        if schedule_df is None or schedule_df.empty:
-            return
-
-        # Prepare data (avoid unnecessary copy if possible)
-        schedule_df = schedule_df.copy()
-        schedule_df['TimeSlot'] = schedule_df['Day'] + " " + schedule_df['Time']
-        schedule_df['CellContent'] = schedule_df['Course'] + "\n" + schedule_df['Instructor']
-
-        timetable_grid = schedule_df.pivot_table(
-            index='TimeSlot', columns='Section', values='CellContent', aggfunc='first'
-        ).fillna('')
-
-        # Sort rows - use vectorized operations
-        day_order = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Saturday"]
-        timetable_grid = timetable_grid.reset_index()
-        # Vectorized day extraction
-        timetable_grid['Day'] = timetable_grid['TimeSlot'].str.split(' ', n=1).str[0]
-        timetable_grid['Day'] = pd.Categorical(timetable_grid['Day'], categories=day_order, ordered=True)
-        timetable_grid = timetable_grid.sort_values(['Day', 'TimeSlot']).drop('Day', axis=1).set_index('TimeSlot')
-
-        # Sort columns (if more than one section is displayed)
-        if len(timetable_grid.columns) > 1:
-            sorted_columns = sorted(timetable_grid.columns, key=get_level_sort_key)
-            timetable_grid = timetable_grid[sorted_columns]
-
-        # Define Treeview columns and headings
-        columns = ['TimeSlot'] + list(timetable_grid.columns)
-        tree["columns"] = columns
-        tree["show"] = "headings"
-
-        for col in columns:
-            tree.heading(col, text=col)
-            width = 280 if col == 'TimeSlot' else 220
-            tree.column(col, anchor="center", width=width, stretch=False)
-
-        # Configure row tags with colors
-        tree.tag_configure('lecture_row', background='#2d2d44')
-        tree.tag_configure('lab_row', background='#1e3a3a')
-        tree.tag_configure('mixed_row', background='#3a2d3a')
-        tree.tag_configure('empty_row', background=COLORS['bg_tertiary'])
-        tree.tag_configure('even_row', background='#2a2a3a')
-        tree.tag_configure('odd_row', background='#252535')
-
-        # Day emoji mapping
-        day_emojis = {
-            'Sunday': '☀️',
-            'Monday': '📅',
-            'Tuesday': '📆',
-            'Wednesday': '🗓️',
-            'Thursday': '📋',
-            'Saturday': '🎯'
-        }
-        
-        # Pre-compute formatted values using itertuples (much faster than iterrows)
-        rows_to_insert = []
-        row_values_list = timetable_grid.values.tolist()
-        row_index_list = timetable_grid.index.tolist()
-        
-        for row_idx, (index, row_values) in enumerate(zip(row_index_list, row_values_list)):
-            # Format TimeSlot with day emoji
-            day_name = index.split(' ')[0] if ' ' in index else index
-            emoji = day_emojis.get(day_name, '⏰')
-            formatted_timeslot = f"{emoji} {index}"
-            
-            # Format cell contents with emojis
-            formatted_values = [formatted_timeslot]
-            formatted_values.extend(format_cell_content(val) for val in row_values)
-            
-            # Determine row tag based on content
-            row_tag = get_row_tag(row_values)
-            alt_tag = 'even_row' if row_idx % 2 == 0 else 'odd_row'
-            
-            rows_to_insert.append((formatted_values, (row_tag, alt_tag)))
-        
-        # Batch insert (faster than individual inserts)
-        for formatted_values, tags in rows_to_insert:
-            tree.insert("", tk.END, values=formatted_values, tags=tags)
-
-    # --- Filter and Reset Logic ---
-    def filter_view():
-        selected_section = section_var.get()
-        if selected_section:
-            filtered_df = full_schedule_df[full_schedule_df['Section'] == selected_section].copy()
-            populate_tree(filtered_df)
-        else:
-            populate_tree(full_schedule_df)
-
-    def reset_view():
-        section_dropdown.set('')
-        populate_tree(full_schedule_df)
-
-    # --- Modern styled buttons ---
-    style.configure('Modern.TButton',
-                    background=COLORS['accent_primary'],
-                    foreground=COLORS['text_primary'],
-                    borderwidth=0,
-                    relief='flat',
-                    padding=10,
-                    font=('Segoe UI', 10, 'bold'))
-    style.map('Modern.TButton',
-              background=[('active', COLORS['accent_secondary']),
-                         ('pressed', COLORS['accent_primary'])],
-              foreground=[('active', COLORS['text_primary'])])
-
-    style.configure('Reset.TButton',
-                    background=COLORS['accent_success'],
-                    foreground=COLORS['text_primary'],
-                    borderwidth=0,
-                    relief='flat',
-                    padding=10,
-                    font=('Segoe UI', 10, 'bold'))
-    style.map('Reset.TButton',
-              background=[('active', '#00a085'),
-                         ('pressed', COLORS['accent_success'])],
-              foreground=[('active', COLORS['text_primary'])])
-
-    filter_button = ttk.Button(inner_control, text="🔍 Filter", command=filter_view, style='Modern.TButton')
-    filter_button.pack(side=tk.LEFT, padx=10)
-
-    reset_button = ttk.Button(inner_control, text="🔄 Show All", command=reset_view, style='Reset.TButton')
-    reset_button.pack(side=tk.LEFT, padx=10)
-
-    # --- Legend frame ---
-    legend_frame = tk.Frame(inner_control, bg=COLORS['bg_secondary'])
-    legend_frame.pack(side=tk.LEFT, padx=20)
-    
-    legend_label = tk.Label(
-        legend_frame,
-        text="Legend:",
-        font=('Segoe UI', 9, 'bold'),
-        bg=COLORS['bg_secondary'],
-        fg=COLORS['text_secondary']
-    )
-    legend_label.pack(side=tk.LEFT, padx=5)
-    
-    lecture_legend = tk.Label(
-        legend_frame,
-        text="📚 Lecture",
-        font=('Segoe UI', 9),
-        bg=COLORS['lecture'],
-        fg=COLORS['text_primary'],
-        padx=8,
-        pady=2,
-        relief='flat'
-    )
-    lecture_legend.pack(side=tk.LEFT, padx=5)
-    
-    lab_legend = tk.Label(
-        legend_frame,
-        text="🔬 Lab",
-        font=('Segoe UI', 9),
-        bg=COLORS['lab'],
-        fg=COLORS['bg_primary'],
-        padx=8,
-        pady=2,
-        relief='flat'
-    )
-    lab_legend.pack(side=tk.LEFT, padx=5)
-
-    # --- Initial population ---
-    populate_tree(full_schedule_df)
-
-    window.mainloop()
+    from cspGui import display_timetable_grid_gui as show_gui
+    show_gui(full_schedule_df)
 
 
 # --- 2. CSP FORMULATION (WITH LECTURE GROUPING) ---
@@ -426,6 +61,7 @@ def setup_csp(data):
     Sets up CSP variables by grouping lectures and scheduling labs individually.
     Optimized version with pre-computed mappings and efficient domain generation.
     """
+    import pandas as pd
     global VAR_METADATA
     VAR_METADATA.clear() # Reset cache
     
@@ -450,9 +86,15 @@ def setup_csp(data):
     # Pre-compute qualified instructors per course (much faster than repeated filtering)
     course_to_qualified_instructors = {}
     instructors_df = data['instructors']
+    qualifications = data.get('course_instructors')  # Exploded at load time by cspIngest
+    if qualifications is not None:
+        by_course = qualifications.groupby('CourseID', sort=False)['InstructorID'].agg(set).to_dict()
     for course_id in data['courses']['CourseID'].unique():
-        # Use vectorized string operations instead of apply
-        mask = instructors_df['QualifiedCourses'].astype(str).str.contains(course_id, na=False)
+        if qualifications is not None:
+            mask = instructors_df['InstructorID'].isin(by_course.get(course_id, ()))
+        else:
+            # Use vectorized string operations instead of apply
+            mask = instructors_df['QualifiedCourses'].astype(str).str.contains(course_id, na=False)
         course_to_qualified_instructors[course_id] = instructors_df[mask]
 
     # Pre-compute room lists by type and capacity ranges
@@ -495,8 +137,8 @@ def setup_csp(data):
                         domains[variable] = []
                     else:
                         # Optimized domain generation: List comprehension to avoid generating full product first
-                        room_ids = possible_rooms['RoomID'].values
-                        inst_ids = possible_inst['InstructorID'].values
+                        room_ids = possible_rooms['RoomID'].tolist()  # Plain strs: categoricals iterate slowly
+                        inst_ids = possible_inst['InstructorID'].tolist()
                         
                         domains[variable] = [
                             (t, r, i)
@@ -528,8 +170,8 @@ def setup_csp(data):
                         domains[variable] = []
                     else:
                         # Optimized domain generation
-                        room_ids = possible_rooms['RoomID'].values
-                        inst_ids = possible_inst['InstructorID'].values
+                        room_ids = possible_rooms['RoomID'].tolist()  # Plain strs: categoricals iterate slowly
+                        inst_ids = possible_inst['InstructorID'].tolist()
                         
                         domains[variable] = [
                             (t, r, i)
@@ -576,6 +218,7 @@ def get_sections_from_var(variable_name):
 
 
 def is_consistent(var1_assignment, var2_assignment, var1, var2):
+    METRICS.consistency_checks += 1
     time1, room1, instructor1 = var1_assignment
     time2, room2, instructor2 = var2_assignment
     
@@ -610,124 +253,531 @@ def revise(domains, var1, var2):
     # Use list comprehension with any() for early termination (Python optimizes this)
     domains[var1] = [val1 for val1 in domains[var1] 
                      if any(is_consistent(val1, val2, var1, var2) for val2 in domains[var2])]
-    return len(domains[var1]) < initial_size
+    pruned = initial_size - len(domains[var1])
+    if pruned:
+        METRICS.revisions += 1
+        METRICS.values_pruned += pruned
+    return pruned > 0
 
 
-def ac3(variables, domains, constraints):
+def ac3(variables, domains, constraints, propagators=None, deadline=None):
+    """
+    AC-3 over the binary constraints. With `propagators` (see
+    cspGlobal.build_alldiff_propagators) the global all-different constraints
+    are propagated first and again whenever binary revisions have changed a
+    domain, until neither prunes anything.
+    An arc is queued at most once at a time: a domain shrinking (by revise
+    or by a propagator) requeues the arcs towards it unless they are still
+    waiting, so the global pruning never adds passes over the near-complete
+    constraint graph.
+    Past `deadline` (a time.perf_counter() value) SearchLimitReached is
+    raised; the domains are then partly pruned, which is still sound.
+    """
     queue = deque(constraints + [(v2, v1) for v1, v2 in constraints])
+    queued = set(queue)
     # Build neighbor map for faster lookups
     neighbors = {v: [] for v in variables}
     for v1, v2 in constraints:
         neighbors[v1].append(v2)
         neighbors[v2].append(v1)
-        
-    while queue:
-        var1, var2 = queue.popleft()
-        if revise(domains, var1, var2):
-            if not domains[var1]: return False
-            # Only add neighbors of var1 (excluding var2) back to the queue
-            for neighbor in neighbors[var1]:
-                if neighbor != var2:
-                    queue.append((neighbor, var1))
-    return True
+
+    def requeue(var, skip=None):
+        # Values left `var`: arcs (neighbor, var) may have lost their support
+        for neighbor in neighbors[var]:
+            if neighbor != skip and (neighbor, var) not in queued:
+                queued.add((neighbor, var))
+                queue.append((neighbor, var))
+
+    revised_vars = None  # None = run every global propagator
+    while True:
+        if propagators:
+            consistent, changed, _ = propagate_global(propagators, domains, revised_vars)
+            if not consistent: return False
+            for var in changed:
+                requeue(var)
+        revised_vars = set()
+
+        while queue:
+            if deadline is not None and time.perf_counter() > deadline:
+                raise SearchLimitReached(METRICS.arcs_processed)
+            arc = queue.popleft()
+            queued.discard(arc)
+            var1, var2 = arc
+            METRICS.arcs_processed += 1
+            if revise(domains, var1, var2):
+                if not domains[var1]: return False
+                revised_vars.add(var1)
+                # Only add neighbors of var1 (excluding var2) back to the queue
+                requeue(var1, skip=var2)
+
+        if not propagators or not revised_vars:
+            return True
 
 
 # --- 4. BACKTRACKING SOLVER ---
 def select_unassigned_variable_mrv(variables, schedule, domains):
+    start = time.perf_counter()
+    METRICS.mrv_selections += 1
     unassigned = [v for v in variables if v not in schedule]
     # Add a tie-breaker (e.g., degree heuristic) if needed, but simple min is usually fine
-    return min(unassigned, key=lambda var: len(domains[var])) if unassigned else None
+    selected = min(unassigned, key=lambda var: len(domains[var])) if unassigned else None
+    METRICS.add_time('mrv_selection', time.perf_counter() - start)
+    return selected
+
+class NogoodStore:
+    """
+    Size-bounded store of nogoods: sets of (variable, value) assignments proven
+    not to extend to a full solution. Nogoods are indexed by each of their
+    literals so a new assignment only looks at the nogoods that mention it.
+    When full, the least recently used nogood is evicted.
+    """
+
+    def __init__(self, max_size=20000, max_length=12):
+        self.max_size = max_size
+        self.max_length = max_length
+        self.nogoods = OrderedDict()  # frozenset of literals -> None, in LRU order
+        self.index = {}               # (variable, value) -> set of nogoods containing it
+
+    def __len__(self):
+        return len(self.nogoods)
+
+    def add(self, literals):
+        literals = frozenset(literals)
+        if not literals or len(literals) > self.max_length:
+            return False
+        if literals in self.nogoods:
+            self.nogoods.move_to_end(literals)
+            return False
+        self.nogoods[literals] = None
+        for literal in literals:
+            self.index.setdefault(literal, set()).add(literals)
+        while len(self.nogoods) > self.max_size:
+            evicted, _ = self.nogoods.popitem(last=False)
+            for literal in evicted:
+                bucket = self.index.get(literal)
+                if bucket is not None:
+                    bucket.discard(evicted)
+                    if not bucket:
+                        del self.index[literal]
+        return True
+
+    def violated_by(self, variable, value, schedule):
+        """Returns a nogood that variable=value would complete under schedule, or None."""
+        for nogood in self.index.get((variable, value), ()):
+            if all(var == variable or schedule.get(var) == val for var, val in nogood):
+                self.nogoods.move_to_end(nogood)
+                return nogood
+        return None
+
+class SearchLimitReached(Exception):
+    """Raised by solve_backtracking (and ac3) when a node or time limit is reached without an answer."""
+
+def build_ordering_index(ordering):
+    """{variable: [(other, must_be_smaller)]} for ordering pairs (v, w) meaning value(v) < value(w)."""
+    index = {}
+    for smaller, larger in ordering or ():
+        index.setdefault(smaller, []).append((larger, True))
+        index.setdefault(larger, []).append((smaller, False))
+    return index
+
+def _ordering_culprit(variable, value, schedule, ordering_index):
+    """The assigned variable whose ordering constraint variable=value breaks, or None."""
+    for other, smaller in ordering_index.get(variable, ()):
+        other_value = schedule.get(other)
+        if other_value is not None and (value >= other_value if smaller else value <= other_value):
+            return other
+    return None
 
-def solve_backtracking(variables, domains, schedule):
+def solve_backtracking(variables, domains, schedule, nogoods=None, verbose=True, propagators=None,
+                       node_limit=None, ordering=None, time_limit=None, best=None):
     """
-    Backtracking solver with MRV heuristic.
-    Simplified version for better performance - checks all assigned variables.
+    Backtracking solver with MRV heuristic, conflict-directed backjumping and
+    nogood learning. Returns the completed schedule or None.
+    Pass a NogoodStore to share learned nogoods between calls on the same domains.
+    With `propagators`, every assignment is followed by global all-different
+    propagation and MRV works on the pruned domains.
+    With `node_limit`, SearchLimitReached is raised once that many nodes have
+    been expanded, so callers can tell "unknown" apart from "no solution".
+    `ordering` is a list of (v, w) pairs requiring value(v) < value(w), e.g.
+    the symmetry-breaking constraints from cspSymmetry.
+    `time_limit` (seconds) raises SearchLimitReached in the same way. If a
+    dict is passed as `best`, it always holds the largest consistent partial
+    assignment seen so far (see cspAnytime).
     """
-    if len(schedule) == len(variables): return schedule
+    if nogoods is None:
+        nogoods = NogoodStore()
+    search = {'base_domains': domains, 'nogoods': nogoods, 'verbose': verbose, 'propagators': propagators,
+              'node_limit': node_limit, 'nodes': 0, 'ordering': build_ordering_index(ordering),
+              'deadline': time.perf_counter() + time_limit if time_limit is not None else None, 'best': best}
+    if propagators:
+        domains = dict(domains)
+        for var, value in schedule.items():
+            domains[var] = [value]
+        consistent, _, _ = propagate_global(propagators, domains)
+        if not consistent:
+            return None
+    solution, _ = _backtrack(variables, domains, schedule, search)
+    return solution
+
+def _backtrack(variables, domains, schedule, search):
+    """
+    Returns (solution, conflict_set). On failure, conflict_set holds the
+    assigned variables whose values caused it; their current assignments are
+    recorded as a nogood, and if the variable just assigned by the caller is
+    not in the set the caller jumps straight back past it.
+    """
+    METRICS.nodes += 1
+    search['nodes'] += 1
+    if search['node_limit'] is not None and search['nodes'] > search['node_limit']:
+        raise SearchLimitReached(search['nodes'] - 1)
+    if search['deadline'] is not None and time.perf_counter() > search['deadline']:
+        raise SearchLimitReached(search['nodes'] - 1)
+    if len(schedule) > METRICS.max_depth: METRICS.max_depth = len(schedule)
+    if search['best'] is not None and len(schedule) > len(search['best']):
+        search['best'].clear()
+        search['best'].update(schedule)
+    if len(schedule) == len(variables): return schedule, set()
     variable = select_unassigned_variable_mrv(variables, schedule, domains)
-    if variable is None: return None
+    if variable is None: return None, set()
     
-    print(f" -> Solving for: {variable} ({len(schedule) + 1}/{len(variables)})") # Optional progress print
+    if search['verbose']:
+        print(f" -> Solving for: {variable} ({len(schedule) + 1}/{len(variables)})") # Optional progress print
     
+    conflict_set = set()
     # Try values in their current order
     for value in domains[variable]:
-        # Check consistency against all assigned variables
-        is_assignment_consistent = True
+        # Check consistency against all assigned variables (earliest culprit first)
+        culprit = None
         for assigned_var, assigned_value in schedule.items():
             if not is_consistent(value, assigned_value, variable, assigned_var):
-                is_assignment_consistent = False
+                culprit = assigned_var
                 break
-        
-        if is_assignment_consistent:
+        if culprit is None and search['ordering']:
+            culprit = _ordering_culprit(variable, value, schedule, search['ordering'])
+        if culprit is not None:
+            conflict_set.add(culprit)
+            continue
+
+        nogood = search['nogoods'].violated_by(variable, value, schedule)
+        if nogood is not None:
+            METRICS.nogood_prunes += 1
+            conflict_set.update(var for var, _ in nogood if var != variable)
+            continue
+
+        child_domains = domains
+        if search['propagators']:
+            child_domains = dict(domains)
+            child_domains[variable] = [value]
+            consistent, _, _ = propagate_global(search['propagators'], child_domains, {variable})
+            if not consistent:
+                # Propagation looks at every assignment, so blame all of them.
+                METRICS.propagation_failures += 1
+                conflict_set.update(schedule)
+                continue
+
+        schedule[variable] = value
+        result, child_conflicts = _backtrack(variables, child_domains, schedule, search)
+        if result: return result, set()
+        del schedule[variable] # Backtrack
+        METRICS.backtracks += 1
+
+        if variable not in child_conflicts:
+            # The failure below does not depend on this variable: skip its other values.
+            METRICS.backjumps += 1
+            return None, child_conflicts
+        conflict_set.update(child_conflicts)
+        conflict_set.discard(variable)
+
+    if len(domains[variable]) < len(search['base_domains'][variable]):
+        # Values removed by propagation were removed because of the whole
+        # current assignment, so it all belongs in the conflict set.
+        conflict_set.update(schedule)
+    if search['nogoods'].add((var, schedule[var]) for var in conflict_set):
+        METRICS.nogoods_learned += 1
+    return None, conflict_set
+
+def iter_solutions(variables, domains, locked=None, min_distance=1, verbose=False, ordering=None):
+    """
+    Lazily yields distinct complete schedules. The search is a generator, so
+    asking for the next solution resumes from the last leaf instead of the root.
+    `locked` ({variable: value}) pins assignments; `min_distance` requires every
+    yielded schedule to differ from all earlier ones in at least that many
+    variables (branches that can no longer reach that distance are pruned).
+    `ordering` pairs (see solve_backtracking) yield one schedule per symmetry class.
+    """
+    domains = dict(domains)
+    for var, value in (locked or {}).items():
+        domains[var] = [value]
+    search = {'found': [], 'agree': [], 'min_distance': max(1, min_distance), 'verbose': verbose,
+              'ordering': build_ordering_index(ordering)}
+    yield from _iter_backtrack(variables, domains, {}, search)
+
+def _iter_backtrack(variables, domains, schedule, search):
+    METRICS.nodes += 1
+    if len(schedule) == len(variables):
+        solution = dict(schedule)
+        search['found'].append(solution)
+        search['agree'].append(len(variables))
+        yield solution
+        return
+    variable = select_unassigned_variable_mrv(variables, schedule, domains)
+    if search['verbose']:
+        print(f" -> Solving for: {variable} ({len(schedule) + 1}/{len(variables)})")
+
+    found, agree = search['found'], search['agree']
+    max_agree = len(variables) - search['min_distance']
+    for value in domains[variable]:
+        if not all(is_consistent(value, assigned_value, variable, assigned_var)
+                   for assigned_var, assigned_value in schedule.items()):
+            continue
+        if search['ordering'] and _ordering_culprit(variable, value, schedule, search['ordering']):
+            continue
+        same = [j for j, solution in enumerate(found) if solution[variable] == value]
+        for j in same:
+            agree[j] += 1
+        # agree[j] assigned variables already match solution j; the rest could
+        # still differ, so prune once even that cannot reach min_distance.
+        if all(count <= max_agree for count in agree):
             schedule[variable] = value
-            result = solve_backtracking(variables, domains, schedule)
-            if result: return result
-            del schedule[variable] # Backtrack
-            
-    return None
+            yield from _iter_backtrack(variables, domains, schedule, search)
+            del schedule[variable]
+            METRICS.backtracks += 1
+        # Recomputed: solutions found below this value also agree on it.
+        for j, solution in enumerate(found):
+            if solution[variable] == value:
+                agree[j] -= 1
+
+
+# --- PIPELINE ---
+
+def solve_timetable(csv_folder_path=None, dataset=None, profile=None, global_propagation='root',
+                    engine='backtracking', improve_seconds=0, workers=1, symmetry_breaking=True,
+                    sac_seconds=0, sac_values=None, time_limit=None, warm_start=None, setup_dump=None,
+                    setup_cache=True, cache_key=None):
+    """
+    Runs load -> setup -> AC-3 -> backtracking and returns a result dict:
+    {'status': 'success'|'failure', 'message', 'schedule', 'dataset', 'screening',
+    'validation', 'metrics'}. A schedule that fails cspValidate is reported as a failure.
+    Resource-count screening (cspScreening) runs before AC-3 and stops the
+    pipeline early when a room tier, instructor or section is overloaded.
+    METRICS is reset at the start; `profile` ('cprofile' or 'tracemalloc')
+    profiles every phase.
+    `global_propagation` controls the all-different propagators from cspGlobal:
+    None (binary AC-3 only), 'root' (with AC-3 only) or 'search' (also at every node).
+    `engine` is 'backtracking', 'sat' (cspSat, needs pycosat or a solver on
+    PATH) or 'parallel' (cspParallel work-stealing search on `workers` processes).
+    With `improve_seconds` > 0 the feasible timetable is then improved by
+    large-neighborhood search (cspLns) on `workers` processes.
+    `symmetry_breaking` orders interchangeable sections (cspSymmetry) so the
+    search visits one timetable per class of section relabelings.
+    With `sac_seconds` > 0, AC-3 is followed by singleton arc consistency
+    (cspSac) on `workers` processes, bounded by that time and by `sac_values` tests.
+    `time_limit` (seconds) is one wall-clock budget for the whole call: setup,
+    AC-3, SAC, search and LNS each get what is left of it (AC-3 stops early
+    with sound, partly pruned domains). The backtracking engine then runs in
+    anytime mode (cspAnytime): if time runs out, status is 'partial',
+    'schedule' is the largest consistent partial timetable and 'unplaced'
+    lists the missing sessions with their blocking resources. `warm_start` (a previous
+    schedule, possibly partial) orders the search to try its values first.
+    `setup_dump` is a path for a compressed dump of the setup domains (cspDump).
+    With `setup_cache`, setup is read from the compiled cache (cspCache) in
+    `csv_folder_path`/.csp_cache. A `dataset` passed in is only cached when
+    `cache_key` identifies it (e.g. the store's hash and version). On a
+    cache hit the CSVs are only parsed if a timetable needs validating, so
+    'dataset' is None in a result that stopped before that.
+    """
+    METRICS.reset(profile)
+    result = {'status': 'failure', 'message': '', 'schedule': None, 'dataset': dataset}
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+    def remaining():
+        return max(0.0, deadline - time.perf_counter()) if deadline is not None else None
+
+    def need_dataset():
+        # A cache hit skips the CSVs; validation, LNS and the caller's export load them here
+        nonlocal dataset
+        if dataset is None:
+            with METRICS.phase('load'):
+                dataset = load_data_from_csv(csv_folder_path)
+            result['dataset'] = dataset
+        return dataset
+
+    use_cache = setup_cache and csv_folder_path and (dataset is None or cache_key)
+    problem = None
+    if use_cache:
+        from cspCache import load_cached_problem, load_or_compile_problem
+        with METRICS.phase('setup'):
+            problem = load_cached_problem(csv_folder_path, source_hash=cache_key)
+    if problem is None:
+        if not need_dataset():
+            result['message'] = "Failed to load CSV data."
+            result['metrics'] = METRICS.to_dict()
+            return result
+        with METRICS.phase('setup'):
+            if use_cache:
+                problem = load_or_compile_problem(csv_folder_path, dataset=dataset, source_hash=cache_key)
+            else:
+                problem = setup_csp(dataset)
+    variables, domains, constraints, empty_reasons = problem
+    result['empty_domain_reasons'] = empty_reasons
+    if setup_dump:
+        from cspDump import write_setup_dump
+        with METRICS.phase('dump'):
+            info = write_setup_dump(setup_dump, variables, domains, empty_reasons, VAR_METADATA)
+        print(f" -> Setup dump: {info['values']} values written to '{setup_dump}' ({info['bytes'] / 1e6:.1f} MB).")
+
+    print("\n--- 1b. Screening Resource Counts ---")
+    with METRICS.phase('screening'):
+        screening = screen_feasibility(variables, domains, VAR_METADATA)
+    result['screening'] = screening
+    print(format_report(screening))
+
+    if any(not d for d in domains.values()):
+        result['message'] = "One or more domains are empty after setup."
+    elif not screening['feasible']:
+        first = screening['violations'][0]
+        result['message'] = (f"Infeasible: {first['resource']} is overloaded "
+                             f"({first['required']} sessions, {first['available']} slots).")
+    else:
+        ordering = []
+        if symmetry_breaking:
+            from cspSymmetry import find_section_symmetries, symmetry_ordering, ordering_propagators
+            with METRICS.phase('symmetry'):
+                symmetries = find_section_symmetries(variables, domains, VAR_METADATA)
+                ordering = symmetry_ordering(variables, symmetries)
+            result['symmetries'] = len(symmetries)
+            print(f" -> Symmetry breaking: {len(symmetries)} interchangeable section swap(s).")
+        propagators = None
+        if global_propagation:
+            propagators = build_alldiff_propagators(variables, VAR_METADATA)
+        if ordering:
+            propagators = (propagators or []) + ordering_propagators(ordering)
+        print("\n--- 2. Enforcing Arc Consistency (AC-3) ---")
+        with METRICS.phase('ac3'):
+            try:
+                consistent = ac3(variables, domains, constraints, propagators, deadline=deadline)
+            except SearchLimitReached:
+                consistent = True
+                print(" -> 🔴 Time limit reached during AC-3: searching the partly pruned domains.")
+        if consistent and sac_seconds > 0 and remaining() != 0:
+            from cspSac import singleton_arc_consistency
+            print(f"\n--- 2b. Singleton Arc Consistency ({sac_seconds}s budget) ---")
+            sac_propagators = propagators if global_propagation else (
+                build_alldiff_propagators(variables, VAR_METADATA) + (propagators or []))
+            with METRICS.phase('sac'):
+                consistent, result['sac'] = singleton_arc_consistency(
+                    variables, domains, VAR_METADATA, sac_propagators,
+                    time_limit=min(sac_seconds, remaining()) if deadline is not None else sac_seconds,
+                    value_limit=sac_values, workers=workers)
+        if not consistent:
+            result['message'] = "No solution possible (Inconsistent constraints)."
+        else:
+            print(" -> AC-3 successful. Domains have been pruned.")
+            with METRICS.phase('solve'):
+                solver_domains = {var: list(dom) for var, dom in domains.items()}
+                if engine == 'sat':
+                    from cspSat import solve_with_sat
+                    print("\n--- 3. Starting Solver (SAT) ---")
+                    schedule = solve_with_sat(variables, solver_domains, VAR_METADATA, timeout=remaining())
+                elif engine == 'parallel':
+                    from cspParallel import solve_parallel
+                    print(f"\n--- 3. Starting Solver (Parallel Backtracking, {workers or 'all'} workers) ---")
+                    schedule, result['parallel'] = solve_parallel(variables, solver_domains, VAR_METADATA,
+                                                                  workers=workers or None, timeout=remaining())
+                elif time_limit is not None or warm_start:
+                    from cspAnytime import solve_anytime, format_unplaced
+                    limit = f"{remaining():.1f}s of {time_limit}s left" if time_limit is not None else "warm start"
+                    print(f"\n--- 3. Starting Solver (Anytime Backtracking, {limit}) ---")
+                    anytime = solve_anytime(variables, solver_domains, remaining(), warm_start=warm_start,
+                                            propagators=propagators if global_propagation == 'search' else None,
+                                            ordering=ordering)
+                    schedule = anytime['schedule']
+                    result['anytime'] = {key: anytime[key] for key in
+                                         ('placed', 'total', 'warm_start_used', 'timed_out', 'seconds')}
+                    if not anytime['complete']:
+                        result['unplaced'] = anytime['unplaced']
+                        print(f" -> Placed {anytime['placed']}/{anytime['total']} sessions; unplaced:")
+                        print(format_unplaced(anytime['unplaced']))
+                else:
+                    print("\n--- 3. Starting Solver (Backtracking + MRV) ---")
+                    schedule = solve_backtracking(variables, solver_domains, {}, ordering=ordering,
+                                                  propagators=propagators if global_propagation == 'search' else None)
+            partial = schedule is not None and 'unplaced' in result
+            improve_budget = min(improve_seconds, remaining()) if deadline is not None else improve_seconds
+            if schedule and improve_budget > 0 and not partial:
+                from cspLns import improve_schedule
+                print(f"\n--- 4. Improving Timetable (LNS, {improve_budget:.1f}s) ---")
+                with METRICS.phase('improve'):
+                    schedule, result['improvement'] = improve_schedule(
+                        variables, domains, schedule, need_dataset(), time_limit=improve_budget, workers=workers)
+            if schedule:
+                # Checked against the dataset itself, so an engine bug cannot pass silently
+                with METRICS.phase('validate'):
+                    validation = validate_schedule(schedule, need_dataset(), VAR_METADATA,
+                                                   None if partial else variables)
+                result['validation'] = validation
+                print(format_validation(validation))
+                if validation['valid'] and partial:
+                    result.update(status='partial', schedule=schedule,
+                                  message=f"Partial timetable: {len(schedule)}/{len(variables)} sessions placed "
+                                          f"({len(result['unplaced'])} unplaced).")
+                elif validation['valid']:
+                    result.update(status='success', message="Feasible timetable found.", schedule=schedule)
+                else:
+                    result.update(schedule=schedule,
+                                  message=f"The {engine} engine returned an invalid timetable "
+                                          f"({len(validation['violations'])} violation(s)).")
+            else:
+                result['message'] = ("No solution found by the SAT solver." if engine == 'sat'
+                                     else "No solution found after backtracking.")
+
+    result['metrics'] = METRICS.to_dict()
+    return result
 
 
 # --- 5. DISPLAY AND SAVE TIMETABLE ---
-def display_and_save_timetable(schedule, data, output_filename="timetable_output.csv"):
+def display_and_save_timetable(schedule, data, output_filename="timetable_output.csv",
+                               show_gui=True, export_formats=None, output_dir=None):
+    """
+    Prints and saves the timetable, then opens the GUI.
+    Both modes write `output_filename` with the cspExport CSV columns (plus
+    any other `export_formats`), so the file has one schema either way.
+    With show_gui=False the schedule is streamed straight to the exporters
+    without building a DataFrame or importing tkinter, so batch and server
+    runs never block on window.mainloop().
+    """
     if not schedule:
         print("\n❌ No feasible timetable could be found.")
         return
 
-    # Create lookup dictionaries for O(1) access instead of O(n) DataFrame filtering
-    # Use to_dict('index') for faster conversion (more efficient than iterrows)
-    timeslots_dict = data['timeslots'].set_index('TimeSlotID').to_dict('index')
-    instructors_dict = data['instructors'].set_index('InstructorID').to_dict('index')
+    from cspExport import build_lookups, iter_schedule_rows, export_schedule
+
+    # Lookup dictionaries for O(1) access instead of O(n) DataFrame filtering
+    lookups = build_lookups(data)
+    output_dir = output_dir or os.path.dirname(os.path.abspath(output_filename))
+    basename = os.path.splitext(os.path.basename(output_filename))[0]
+    formats = ['csv'] + [fmt for fmt in (export_formats or ()) if fmt != 'csv']
+
+    if not show_gui:
+        print(f"\n✅ Feasible Timetable Generated Successfully! ({len(schedule)} sessions)")
+        export_schedule(schedule, output_dir=output_dir, formats=formats, basename=basename, lookups=lookups)
+        return
+
+    display_columns = ['Day', 'Time', 'Section', 'Course', 'Instructor', 'Room']
+    timetable_data = [{col: row[col] for col in display_columns}
+                      for row in iter_schedule_rows(schedule, lookups)]
 
-    timetable_data = []
-    for variable, (time_id, room_id, instructor_id) in schedule.items():
-        parts = variable.split('_')
-        course_id, var_type = parts[0], parts[1]
-        
-        sections = get_sections_from_var(variable)
-        if not sections: # Skip if section parsing failed
-             print(f"Warning: Skipping variable '{variable}' in output due to section parsing error.")
-             continue
-
-        # Fast dictionary lookups instead of DataFrame filtering
-        time_details = timeslots_dict.get(time_id)
-        instructor_info = instructors_dict.get(instructor_id)
-        
-        if time_details is None or instructor_info is None:
-            print(f"Warning: Missing data for TimeSlot '{time_id}' or Instructor '{instructor_id}'. Skipping entry.")
-            continue
-        
-        instructor_name = instructor_info.get('Name', 'N/A')
-        time_str = f"{time_details.get('StartTime', 'N/A')} - {time_details.get('EndTime', 'N/A')}"
-        display_course = f"{course_id} ({var_type})"
-        
-        for section_id in sections:
-            timetable_data.append({
-                'Day': time_details.get('Day', 'N/A'),
-                'Time': time_str,
-                'Section': section_id,
-                'Course': display_course,
-                'Instructor': instructor_name
-            })
-    
     if not timetable_data:
         print("\n❌ No timetable data generated after processing schedule.")
         return
-        
+
+    import pandas as pd
     final_df = pd.DataFrame(timetable_data)
     
     print("\n✅ Feasible Timetable Generated Successfully!\n")
-    # Ensure sorting columns exist before sorting
-    sort_cols = [col for col in ['Day', 'Time', 'Section'] if col in final_df.columns]
-    if sort_cols:
-        print(final_df.sort_values(by=sort_cols).to_string(index=False))
-    else:
-        print(final_df.to_string(index=False)) # Print unsorted if columns missing
+    print(final_df.sort_values(by=['Day', 'Time', 'Section']).to_string(index=False))
     
-    try:
-        final_df.to_csv(output_filename, index=False)
-        print(f"\n✅ Timetable has been saved to '{output_filename}'")
-    except Exception as e:
-        print(f"\n❌ Could not save the file. Error: {e}")
+    export_schedule(schedule, output_dir=output_dir, formats=formats, basename=basename, lookups=lookups)
         
     print("\n -> Launching GUI window...")
     display_timetable_grid_gui(final_df)
@@ -756,32 +806,83 @@ def save_extracted_sections_to_file(variables, filename="extracted_sections_outp
 
 # --- MAIN EXECUTION ---
 if __name__ == "__main__":
-    # Robust path handling
-    script_dir = os.path.dirname(os.path.abspath(__file__)) if '__file__' in locals() else '.'
-    csv_folder_path = r"E:\CSP_data" # Assume data is in a subfolder
-    # Or use the absolute path: csv_folder_path = r"E:\CSP_data"
-
-    dataset = load_data_from_csv(csv_folder_path)
-    if dataset:
-        try:
-            csp_vars, csp_domains, csp_constraints, empty_reasons = setup_csp(dataset)
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate a timetable with AC-3 + backtracking.")
+    parser.add_argument('data_folder', nargs='?', default=os.environ.get('CSP_DATA_DIR', r"E:\CSP_data"),
+                        help="Folder with the CSV files (default: $CSP_DATA_DIR)")
+    parser.add_argument('--no-gui', action='store_true', help="Do not open the Tk viewer (batch/server runs)")
+    parser.add_argument('--export', default='', help="Comma-separated export formats: csv,json,parquet,ical")
+    parser.add_argument('--output-dir', default=None, help="Folder for exported files")
+    parser.add_argument('--global-propagation', choices=['none', 'root', 'search'], default='root',
+                        help="All-different propagation: off, before search only, or at every search node")
+    parser.add_argument('--engine', choices=['backtracking', 'sat', 'parallel'], default='backtracking',
+                        help="Search backend (sat needs pycosat or kissat/cadical/minisat/glucose; "
+                             "parallel uses --workers processes, worth it only on hard instances with a free core each)")
+    parser.add_argument('--improve', type=float, default=0, metavar='SECONDS',
+                        help="Improve the timetable with large-neighborhood search for this long")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes for --improve and --engine parallel (0 = all cores)")
+    parser.add_argument('--no-symmetry', action='store_true',
+                        help="Do not add symmetry-breaking constraints for interchangeable sections")
+    parser.add_argument('--sac', type=float, default=0, metavar='SECONDS',
+                        help="Run singleton arc consistency after AC-3 for up to this long (uses --workers)")
+    parser.add_argument('--sac-values', type=int, default=None, metavar='N',
+                        help="Stop singleton arc consistency after testing N values")
+    parser.add_argument('--time-limit', type=float, default=None, metavar='SECONDS',
+                        help="Stop backtracking after this long and keep the best partial timetable")
+    parser.add_argument('--warm-start', default=None, metavar='FILE',
+                        help="Try the values of a saved (partial) timetable first; partial runs save one")
+    parser.add_argument('--dump-setup', default=None, metavar='FILE',
+                        help="Stream the setup domains to a compressed dump (compare runs with cspDump.py diff)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always rebuild the domains instead of reading the compiled setup cache")
+    parser.add_argument('--profile', choices=['cprofile', 'tracemalloc'], default=None,
+                        help="Profile every pipeline phase")
+    parser.add_argument('--explain', choices=['section', 'course', 'off'], default='section',
+                        help="On failure, extract a minimal conflict at this granularity")
+    parser.add_argument('--explain-seconds', type=float, default=10, metavar='SECONDS',
+                        help="Give up on the conflict explanation after this long")
+    args = parser.parse_args()
+
+    csv_folder_path = args.data_folder
+    export_formats = [fmt.strip() for fmt in args.export.split(',') if fmt.strip()]
 
-            #save_extracted_sections_to_file(csp_vars)
-            
-            if any(not d for d in csp_domains.values()):
-                 print(" -> Halting process because one or more domains are empty after setup.")
-            elif ac3(csp_vars, csp_domains, csp_constraints): # Pass copies if AC3 modifies in place? Check AC3 impl.
-                print(" -> AC-3 successful. Domains have been pruned.")
-                print("\n--- 3. Starting Solver (Backtracking + MRV) ---")
-                
-                # Make copies of domains if solver modifies them? Check solver impl.
-                solver_domains = {var: list(dom) for var, dom in csp_domains.items()}
-                
-                final_schedule = solve_backtracking(csp_vars, solver_domains, {}) # Pass copy of domains
-                display_and_save_timetable(final_schedule, dataset)
-            else:
-                print("❌ No solution possible. AC-3 found an inconsistency after initial setup.")
-        except Exception as e:
-            print(f"\n❌ An unexpected error occurred during solving: {e}")
-            import traceback
-            traceback.print_exc() # Print detailed traceback for debugging
\ No newline at end of file
+    try:
+        warm_start = None
+        if args.warm_start and os.path.exists(args.warm_start):
+            from cspAnytime import load_warm_start
+            warm_start = load_warm_start(args.warm_start)
+        result = solve_timetable(csv_folder_path, profile=args.profile,
+                                 global_propagation=None if args.global_propagation == 'none' else args.global_propagation,
+                                 engine=args.engine, improve_seconds=args.improve, workers=args.workers,
+                                 symmetry_breaking=not args.no_symmetry,
+                                 sac_seconds=args.sac, sac_values=args.sac_values,
+                                 time_limit=args.time_limit, warm_start=warm_start, setup_dump=args.dump_setup,
+                                 setup_cache=not args.no_cache)
+        if result['status'] == 'success':
+            display_and_save_timetable(result['schedule'], result['dataset'], show_gui=not args.no_gui,
+                                       export_formats=export_formats, output_dir=args.output_dir)
+        elif result['status'] == 'partial':
+            from cspAnytime import save_warm_start
+            print(f"🔴 {result['message']}")
+            partial_path = args.warm_start or os.path.join(args.output_dir or '.', "timetable_partial.json")
+            save_warm_start({'complete': False, 'schedule': result['schedule'], 'unplaced': result['unplaced']},
+                            partial_path)
+            print(f" -> Partial timetable saved to '{partial_path}' (rerun with --warm-start {partial_path})")
+            display_and_save_timetable(result['schedule'], result['dataset'], show_gui=not args.no_gui,
+                                       export_formats=export_formats, output_dir=args.output_dir)
+        else:
+            print(f"❌ {result['message']}")
+            if 'empty_domain_reasons' in result and args.explain != 'off':
+                from cspExplain import explain_infeasibility, format_explanation
+                dataset = result['dataset'] or load_data_from_csv(csv_folder_path)  # Skipped on a cache hit
+                print("\n--- Explaining Infeasibility (QuickXplain) ---")
+                print(format_explanation(explain_infeasibility(dataset, granularity=args.explain,
+                                                               time_limit=args.explain_seconds)))
+        print("\n" + METRICS.summary())
+        for phase_name, report in METRICS.profiles.items():
+            print(f"\n--- Profile: {phase_name} ---\n{report}")
+    except Exception as e:
+        print(f"\n❌ An unexpected error occurred during solving: {e}")
+        import traceback
+        traceback.print_exc() # Print detailed traceback for debugging
\ No newline at end of file
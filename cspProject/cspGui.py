@@ -0,0 +1,410 @@
+#
+# Intelligent Systems Project 1:
+# Tkinter timetable viewer, split from the solver so that headless
+# processes (web workers, batch runs) never import the GUI stack.
+#
+
+import re
+from datetime import datetime
+import tkinter as tk
+from tkinter import ttk
+
+DAY_ORDER = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+DAY_EMOJIS = {
+    'Sunday': '☀️',
+    'Monday': '📅',
+    'Tuesday': '📆',
+    'Wednesday': '🗓️',
+    'Thursday': '📋',
+    'Saturday': '🎯'
+}
+
+# --- HELPERS ---
+
+def get_level_sort_key(section_name):
+    match = re.search(r"L(\d+)", section_name)
+    level = int(match.group(1)) if match else 99
+    section_num_str = ''.join(filter(str.isdigit, section_name.split('_')[0]))
+    section_num = int(section_num_str) if section_num_str else 0
+    return (level, section_num)
+
+def get_timeslot_sort_key(day, time_str):
+    """Sorts by weekday, then by the real start time (not the string)."""
+    day_rank = DAY_ORDER.index(day) if day in DAY_ORDER else len(DAY_ORDER)
+    try:
+        start = datetime.strptime(str(time_str).split(' - ')[0].strip(), '%I:%M %p')
+        minutes = start.hour * 60 + start.minute
+    except ValueError:
+        minutes = 0
+    return (day_rank, minutes, str(time_str))
+
+def format_cell_content(cell_content):
+    """Adds the lecture/lab emojis to a 'Course (Type)\nDetail' cell."""
+    if not cell_content or cell_content == '':
+        return ''
+    content_str = str(cell_content)
+    if '\n' in content_str:
+        parts = content_str.split('\n')
+        course_part = parts[0].strip() if len(parts) > 0 else ''
+        instructor_part = parts[1].strip() if len(parts) > 1 else ''
+        
+        if '(Lecture)' in course_part:
+            course_name = course_part.replace('(Lecture)', '').strip()
+            return f'📚 {course_name}\n👨‍🏫 {instructor_part}' if instructor_part else f'📚 {course_name}'
+        elif '(Lab)' in course_part:
+            course_name = course_part.replace('(Lab)', '').strip()
+            return f'🔬 {course_name}\n👨‍🔬 {instructor_part}' if instructor_part else f'🔬 {course_name}'
+        else:
+            return f'{course_part}\n👤 {instructor_part}' if instructor_part else course_part
+    else:
+        # No newline, just course name
+        if '(Lecture)' in content_str:
+            course_name = content_str.replace('(Lecture)', '').strip()
+            return f'📚 {course_name}'
+        elif '(Lab)' in content_str:
+            course_name = content_str.replace('(Lab)', '').strip()
+            return f'🔬 {course_name}'
+        return content_str
+
+def get_row_tag(row_values):
+    """Determine if row has lectures, labs, or mixed content for coloring"""
+    has_lecture = any('(Lecture)' in str(v) for v in row_values)
+    has_lab = any('(Lab)' in str(v) for v in row_values)
+    if has_lecture and not has_lab:
+        return 'lecture_row'
+    elif has_lab and not has_lecture:
+        return 'lab_row'
+    elif has_lecture and has_lab:
+        return 'mixed_row'
+    return 'empty_row'
+
+def build_timetable_index(schedule_rows):
+    """
+    Builds every view the viewer can show in one pass over the schedule rows
+    (a DataFrame or an iterable of row dicts with Day/Time/Section/Course/
+    Instructor and optionally Room).
+
+    Returns {'timeslots': [sorted labels],
+             'views': {'Section'|'Instructor'|'Room': {key: {timeslot: raw cell}}}}.
+    Raw cells are 'Course (Type)\nDetail'; sessions shared by several
+    sections (grouped lectures) are merged into one cell in the instructor
+    and room views.
+    """
+    if hasattr(schedule_rows, 'to_dict'):
+        schedule_rows = schedule_rows.to_dict('records')
+
+    slot_keys = {}
+    views = {'Section': {}, 'Instructor': {}, 'Room': {}}
+    shared = {}  # (kind, key, slot, course) -> list of sections
+    for row in schedule_rows:
+        slot = f"{row['Day']} {row['Time']}"
+        if slot not in slot_keys:
+            slot_keys[slot] = get_timeslot_sort_key(row['Day'], row['Time'])
+        views['Section'].setdefault(row['Section'], {})[slot] = f"{row['Course']}\n{row['Instructor']}"
+
+        for kind in ('Instructor', 'Room'):
+            key = row.get(kind)
+            if key is None or key != key:  # Missing or NaN (e.g. no Room column)
+                continue
+            sections = shared.setdefault((kind, key, slot, row['Course']), [])
+            sections.append(row['Section'])
+            detail = ', '.join(sorted(sections, key=get_level_sort_key))
+            if kind == 'Room':
+                detail = f"{row['Instructor']} | {detail}"
+            views[kind].setdefault(key, {})[slot] = f"{row['Course']}\n{detail}"
+
+    return {'timeslots': sorted(slot_keys, key=slot_keys.get), 'views': views}
+
+def display_timetable_grid_gui(full_schedule_df):
+    """
+    Creates a modern, colorful, filterable GUI window with the timetable in a grid format.
+    """
+    if full_schedule_df is None or full_schedule_df.empty:
+        print(" -> No schedule to display in GUI.")
+        return
+
+    # Every view is served from this index; filtering never touches the DataFrame again.
+    index = build_timetable_index(full_schedule_df)
+    timeslots = index['timeslots']
+    views = {kind: view for kind, view in index['views'].items() if view}
+    sort_keys = {'Section': get_level_sort_key, 'Instructor': str, 'Room': str}
+    view_keys = {kind: sorted(view, key=sort_keys[kind]) for kind, view in views.items()}
+
+    # --- Modern Color Scheme ---
+    COLORS = {
+        'bg_primary': '#1e1e2e',      # Dark background
+        'bg_secondary': '#2d2d44',    # Slightly lighter dark
+        'bg_tertiary': '#3a3a5c',     # Even lighter for cards
+        'accent_primary': '#6c5ce7',   # Purple accent
+        'accent_secondary': '#00d2d3', # Cyan accent
+        'accent_success': '#00b894',  # Green
+        'accent_warning': '#fdcb6e',  # Yellow
+        'text_primary': '#ffffff',     # White text
+        'text_secondary': '#b2bec3',  # Light gray text
+        'lecture': '#a29bfe',          # Purple for lectures
+        'lab': '#00d2d3',              # Cyan for labs
+        'header': '#6c5ce7',           # Purple header
+    }
+
+    # --- GUI Setup ---
+    window = tk.Tk()
+    window.title("📅 Modern Timetable Viewer")
+    window.geometry("1600x950")
+    window.configure(bg=COLORS['bg_primary'])
+
+    # --- Modern Header ---
+    header_frame = tk.Frame(window, bg=COLORS['header'], height=80)
+    header_frame.pack(fill='x', padx=0, pady=0)
+    header_frame.pack_propagate(False)
+    
+    title_label = tk.Label(
+        header_frame, 
+        text="📅 Timetable Schedule Viewer", 
+        font=('Segoe UI', 24, 'bold'),
+        bg=COLORS['header'],
+        fg=COLORS['text_primary']
+    )
+    title_label.pack(pady=20)
+
+    # --- Top frame for controls with modern styling ---
+    control_frame = tk.Frame(window, bg=COLORS['bg_secondary'], relief='flat')
+    control_frame.pack(pady=15, padx=20, fill='x')
+
+    # Inner frame for better spacing
+    inner_control = tk.Frame(control_frame, bg=COLORS['bg_secondary'])
+    inner_control.pack(pady=15, padx=20)
+
+    filter_label = tk.Label(
+        inner_control, 
+        text="🔍 Filter by:", 
+        font=('Segoe UI', 11, 'bold'),
+        bg=COLORS['bg_secondary'],
+        fg=COLORS['text_primary']
+    )
+    filter_label.pack(side=tk.LEFT, padx=10)
+
+    mode_var = tk.StringVar(value='Section')
+    section_var = tk.StringVar()
+    
+    # Modern styled combobox
+    style = ttk.Style()
+    style.theme_use('clam')
+    
+    # Configure modern styles
+    style.configure('Modern.TCombobox', 
+                    fieldbackground=COLORS['bg_tertiary'],
+                    background=COLORS['bg_tertiary'],
+                    foreground=COLORS['text_primary'],
+                    borderwidth=0,
+                    relief='flat',
+                    padding=5)
+    style.map('Modern.TCombobox',
+              fieldbackground=[('readonly', COLORS['bg_tertiary'])],
+              selectbackground=[('readonly', COLORS['accent_primary'])],
+              selectforeground=[('readonly', COLORS['text_primary'])])
+    
+    mode_dropdown = ttk.Combobox(
+        inner_control,
+        textvariable=mode_var,
+        values=list(views),
+        state='readonly',
+        width=12,
+        style='Modern.TCombobox',
+        font=('Segoe UI', 10)
+    )
+    mode_dropdown.pack(side=tk.LEFT, padx=10)
+
+    section_dropdown = ttk.Combobox(
+        inner_control, 
+        textvariable=section_var, 
+        values=view_keys['Section'], 
+        state='readonly', 
+        width=28,
+        style='Modern.TCombobox',
+        font=('Segoe UI', 10)
+    )
+    section_dropdown.pack(side=tk.LEFT, padx=10)
+
+    def on_mode_change(_event=None):
+        section_dropdown.set('')
+        section_dropdown['values'] = view_keys.get(mode_var.get(), [])
+
+    mode_dropdown.bind('<<ComboboxSelected>>', on_mode_change)
+
+    # --- Treeview frame with modern container ---
+    container_frame = tk.Frame(window, bg=COLORS['bg_primary'])
+    container_frame.pack(expand=True, fill='both', padx=20, pady=(0, 20))
+
+    tree_frame = tk.Frame(container_frame, bg=COLORS['bg_secondary'], relief='flat')
+    tree_frame.pack(expand=True, fill='both', padx=5, pady=5)
+
+    # Configure modern Treeview styles
+    style.configure("Modern.Treeview",
+                    background=COLORS['bg_tertiary'],
+                    foreground=COLORS['text_primary'],
+                    fieldbackground=COLORS['bg_tertiary'],
+                    rowheight=75,
+                    font=('Segoe UI', 11))
+    style.configure("Modern.Treeview.Heading",
+                    background=COLORS['accent_primary'],
+                    foreground=COLORS['text_primary'],
+                    font=('Segoe UI', 11, 'bold'),
+                    relief='flat',
+                    borderwidth=0)
+    style.map("Modern.Treeview",
+              background=[('selected', COLORS['accent_primary'])],
+              foreground=[('selected', COLORS['text_primary'])])
+    
+    tree = ttk.Treeview(tree_frame, style="Modern.Treeview")
+
+    # Modern scrollbars
+    style.configure("Modern.Vertical.TScrollbar",
+                    background=COLORS['bg_tertiary'],
+                    troughcolor=COLORS['bg_secondary'],
+                    borderwidth=0,
+                    arrowcolor=COLORS['text_primary'],
+                    darkcolor=COLORS['bg_tertiary'],
+                    lightcolor=COLORS['bg_tertiary'])
+    style.configure("Modern.Horizontal.TScrollbar",
+                    background=COLORS['bg_tertiary'],
+                    troughcolor=COLORS['bg_secondary'],
+                    borderwidth=0,
+                    arrowcolor=COLORS['text_primary'],
+                    darkcolor=COLORS['bg_tertiary'],
+                    lightcolor=COLORS['bg_tertiary'])
+
+    vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview, style="Modern.Vertical.TScrollbar")
+    hsb = ttk.Scrollbar(tree_frame, orient="horizontal", command=tree.xview, style="Modern.Horizontal.TScrollbar")
+    tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+    vsb.pack(side="right", fill="y")
+    hsb.pack(side="bottom", fill="x")
+    tree.pack(side="left", expand=True, fill="both")
+
+    # Configure row tags with colors
+    tree.tag_configure('lecture_row', background='#2d2d44')
+    tree.tag_configure('lab_row', background='#1e3a3a')
+    tree.tag_configure('mixed_row', background='#3a2d3a')
+    tree.tag_configure('empty_row', background=COLORS['bg_tertiary'])
+    tree.tag_configure('even_row', background='#2a2a3a')
+    tree.tag_configure('odd_row', background='#252535')
+
+    # One Treeview row per timeslot, inserted once; views only rewrite values.
+    timeslot_labels = {}
+    for slot in timeslots:
+        day_name = slot.split(' ')[0] if ' ' in slot else slot
+        timeslot_labels[slot] = f"{DAY_EMOJIS.get(day_name, '⏰')} {slot}"
+        tree.insert("", tk.END, iid=slot, values=[timeslot_labels[slot]])
+
+    formatted_cache = {}
+
+    def formatted(cell):
+        if cell not in formatted_cache:
+            formatted_cache[cell] = format_cell_content(cell)
+        return formatted_cache[cell]
+
+    # --- Helper function to show a view from the index ---
+    def show_view(kind, keys):
+        view = views.get(kind, {})
+        columns = ['TimeSlot'] + list(keys)
+        if list(tree["columns"]) != columns:
+            tree["columns"] = columns
+            tree["show"] = "headings"
+            for col in columns:
+                tree.heading(col, text=col)
+                width = 280 if col == 'TimeSlot' else 220
+                tree.column(col, anchor="center", width=width, stretch=False)
+
+        key_cells = [view.get(key, {}) for key in keys]
+        for row_idx, slot in enumerate(timeslots):
+            raw = [cells.get(slot, '') for cells in key_cells]
+            alt_tag = 'even_row' if row_idx % 2 == 0 else 'odd_row'
+            tree.item(slot, values=[timeslot_labels[slot]] + [formatted(cell) for cell in raw],
+                      tags=(get_row_tag(raw), alt_tag))
+
+    # --- Filter and Reset Logic ---
+    def filter_view():
+        kind, selected = mode_var.get(), section_var.get()
+        if selected:
+            show_view(kind, [selected])
+        else:
+            show_view('Section', view_keys['Section'])
+
+    def reset_view():
+        mode_var.set('Section')
+        on_mode_change()
+        show_view('Section', view_keys['Section'])
+
+    # --- Modern styled buttons ---
+    style.configure('Modern.TButton',
+                    background=COLORS['accent_primary'],
+                    foreground=COLORS['text_primary'],
+                    borderwidth=0,
+                    relief='flat',
+                    padding=10,
+                    font=('Segoe UI', 10, 'bold'))
+    style.map('Modern.TButton',
+              background=[('active', COLORS['accent_secondary']),
+                         ('pressed', COLORS['accent_primary'])],
+              foreground=[('active', COLORS['text_primary'])])
+
+    style.configure('Reset.TButton',
+                    background=COLORS['accent_success'],
+                    foreground=COLORS['text_primary'],
+                    borderwidth=0,
+                    relief='flat',
+                    padding=10,
+                    font=('Segoe UI', 10, 'bold'))
+    style.map('Reset.TButton',
+              background=[('active', '#00a085'),
+                         ('pressed', COLORS['accent_success'])],
+              foreground=[('active', COLORS['text_primary'])])
+
+    filter_button = ttk.Button(inner_control, text="🔍 Filter", command=filter_view, style='Modern.TButton')
+    filter_button.pack(side=tk.LEFT, padx=10)
+
+    reset_button = ttk.Button(inner_control, text="🔄 Show All", command=reset_view, style='Reset.TButton')
+    reset_button.pack(side=tk.LEFT, padx=10)
+
+    # --- Legend frame ---
+    legend_frame = tk.Frame(inner_control, bg=COLORS['bg_secondary'])
+    legend_frame.pack(side=tk.LEFT, padx=20)
+    
+    legend_label = tk.Label(
+        legend_frame,
+        text="Legend:",
+        font=('Segoe UI', 9, 'bold'),
+        bg=COLORS['bg_secondary'],
+        fg=COLORS['text_secondary']
+    )
+    legend_label.pack(side=tk.LEFT, padx=5)
+    
+    lecture_legend = tk.Label(
+        legend_frame,
+        text="📚 Lecture",
+        font=('Segoe UI', 9),
+        bg=COLORS['lecture'],
+        fg=COLORS['text_primary'],
+        padx=8,
+        pady=2,
+        relief='flat'
+    )
+    lecture_legend.pack(side=tk.LEFT, padx=5)
+    
+    lab_legend = tk.Label(
+        legend_frame,
+        text="🔬 Lab",
+        font=('Segoe UI', 9),
+        bg=COLORS['lab'],
+        fg=COLORS['bg_primary'],
+        padx=8,
+        pady=2,
+        relief='flat'
+    )
+    lab_legend.pack(side=tk.LEFT, padx=5)
+
+    # --- Initial population ---
+    show_view('Section', view_keys['Section'])
+    section_dropdown.bind('<<ComboboxSelected>>', lambda _event: filter_view())
+
+    window.mainloop()
@@ -0,0 +1,258 @@
+#
+# Intelligent Systems Project 1:
+# CSV ingestion with declared schemas, typed columns and row-level validation.
+#
+# Every source file has a schema: column names (with known misspellings such
+# as 'SecrionID'), a kind per column and the primary key. Files are read as
+# strings (with pyarrow when it is installed, otherwise pandas' C parser),
+# BOMs are stripped, and each column is then converted and checked in
+# vectorized form. Every bad row is reported with its file line number:
+#
+#   missing column      a required column is absent from the header
+#   empty               a required value is blank
+#   not an integer      StudentCount, Capacity or Credits does not parse
+#   duplicate key       the same ID appears twice
+#   bad list            a Courses/QualifiedCourses list is malformed
+#   unknown course      a section lists a course that is not in Courses.csv (warning)
+#
+# ID columns become pandas categoricals. The comma-separated course lists
+# are exploded once into link tables (data['section_courses'] and
+# data['course_instructors']), so later stages join instead of string-searching.
+#
+
+import os
+import csv
+import time
+
+# Column kinds: 'id' (categorical, required), 'str', 'int' (required), 'list' (comma-separated IDs)
+SCHEMAS = {
+    'courses': {'file': 'Courses.csv', 'key': 'CourseID',
+                'columns': {'CourseID': 'id', 'CourseName': 'str', 'Credits': 'int', 'Type': 'id'}},
+    'instructors': {'file': 'Instructor.csv', 'key': 'InstructorID',
+                    'columns': {'InstructorID': 'id', 'Name': 'str', 'Role': 'str', 'PreferredSlots': 'str',
+                                'QualifiedCourses': 'list'}},
+    'rooms': {'file': 'Rooms.csv', 'key': 'RoomID',
+              'columns': {'RoomID': 'id', 'Type': 'id', 'Capacity': 'int'}},
+    'timeslots': {'file': 'TimeSlots.csv', 'key': 'TimeSlotID',
+                  'columns': {'Day': 'str', 'StartTime': 'str', 'EndTime': 'str', 'TimeSlotID': 'id'},
+                  'generated': {'TimeSlotID': 'TS{}'}},
+    'sections': {'file': 'Sections.csv', 'key': 'SectionID',
+                 'columns': {'SectionID': 'id', 'StudentCount': 'int', 'Courses': 'list'}},
+}
+
+# Known header misspellings -> canonical column
+ALIASES = {'SecrionID': 'SectionID'}
+
+ENGINE_NAMES = {'pyarrow': 'pyarrow', 'c': 'pandas C parser'}
+
+# List column -> (link table name, key column, linked column)
+LINK_TABLES = {
+    ('sections', 'Courses'): ('section_courses', 'SectionID', 'CourseID'),
+    ('instructors', 'QualifiedCourses'): ('course_instructors', 'InstructorID', 'CourseID'),
+}
+
+class IngestError(Exception):
+    """Raised when a dataset has errors; `report` holds every problem found."""
+
+    def __init__(self, report):
+        self.report = report
+        super().__init__(f"{len(report['errors'])} error(s) in the dataset")
+
+# --- 1. READING ---
+
+def csv_engine():
+    """'pyarrow' when it is installed, else pandas' C parser."""
+    try:
+        import pyarrow  # noqa: F401
+        return 'pyarrow'
+    except ImportError:
+        return 'c'
+
+def read_table(path):
+    """Reads one CSV with every column as string, BOM removed and headers trimmed."""
+    import pandas as pd
+    engine = csv_engine()
+    options = {'dtype': str, 'keep_default_na': False, 'encoding': 'utf-8-sig'}
+    if engine == 'c':
+        options['skipinitialspace'] = True
+    frame = pd.read_csv(path, engine=engine, **options)
+    frame.columns = [ALIASES.get(col.strip().lstrip('﻿'), col.strip().lstrip('﻿')) for col in frame.columns]
+    return frame
+
+class SourceLines:
+    """
+    Maps a DataFrame row (0-based, header excluded) to the line it starts on
+    in the file. The readers skip blank lines and quoted fields can span
+    lines, so the file is re-scanned with the csv module, and only the
+    first time a problem is reported for it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._starts = None
+
+    def __call__(self, row):
+        if self._starts is None:
+            self._starts = []
+            with open(self.path, newline='', encoding='utf-8-sig') as f:
+                reader = csv.reader(f)
+                end = 0
+                for record in reader:
+                    start, end = end + 1, reader.line_num
+                    if len(record) > 1 or (record and record[0].strip()):  # Blank lines are skipped
+                        self._starts.append(start)
+            self._starts = self._starts[1:]  # Header
+        return self._starts[row] if 0 <= row < len(self._starts) else None
+
+# --- 2. VALIDATION ---
+
+def _problem(report, severity, schema, frame, mask, column, message, lines):
+    """Adds one entry per flagged row with its line in the source file."""
+    for index in frame.index[mask]:
+        value = frame.at[index, column] if column in frame.columns else None
+        report[severity].append({'file': schema['file'], 'line': lines(int(index)), 'column': column,
+                                 'value': value, 'message': message})
+
+def _check_table(name, frame, report, lines):
+    import pandas as pd
+    schema = SCHEMAS[name]
+    for column, pattern in schema.get('generated', {}).items():
+        if column not in frame.columns:
+            frame[column] = [pattern.format(i) for i in range(len(frame))]
+
+    missing = [column for column in schema['columns'] if column not in frame.columns]
+    for column in missing:
+        report['errors'].append({'file': schema['file'], 'line': 1, 'column': column, 'value': None,
+                                 'message': "missing column"})
+    if missing:
+        return None
+
+    frame = frame[list(schema['columns'])].copy()
+    for column, kind in schema['columns'].items():
+        values = frame[column]
+        if kind != 'list':  # Blanks inside lists are handled by _explode
+            values = frame[column] = values.str.strip()
+        if kind in ('id', 'int'):
+            _problem(report, 'errors', schema, frame, values == '', column, "empty", lines)
+        if kind == 'int':
+            try:
+                frame[column] = values.astype('int64')  # Fast path: every value is a plain integer
+            except (ValueError, TypeError):
+                numbers = pd.to_numeric(values, errors='coerce')
+                bad = numbers.isna() | (numbers != numbers.round())
+                _problem(report, 'errors', schema, frame, bad & (values != ''), column, "not an integer", lines)
+                frame[column] = numbers.fillna(0).astype('int64')
+
+    key = schema['key']
+    duplicated = frame[key].duplicated(keep='first') & (frame[key] != '')
+    _problem(report, 'errors', schema, frame, duplicated, key, "duplicate key", lines)
+    return frame
+
+def _explode(frame, key, column, linked, schema, report, lines):
+    """
+    Vectorized split of a comma-separated column into a (key, linked) link
+    table in file order. Rows with empty or blank-containing items are
+    reported as bad lists and left out of the link table.
+    """
+    import pandas as pd
+    lists = frame[column]
+    spaced = lists.str.contains(' ', regex=False) | lists.str.contains('\t', regex=False)
+    if spaced.any():  # Slow path only for lists that contain blanks
+        lists = lists.where(~spaced, lists.str.replace(r"\s*,\s*", ",", regex=True).str.strip())
+    items = lists.str.split(',').explode()  # Index = source row
+    bad_items = items == ''
+    if spaced.any():
+        bad_items |= items.str.contains(r"\s", regex=True)
+    bad_rows = items.index[bad_items.to_numpy()].unique()
+    bad_rows = bad_rows[(lists.loc[bad_rows] != '').to_numpy()]  # An empty list is allowed
+    _problem(report, 'errors', schema, frame, frame.index.isin(bad_rows), column, "bad list", lines)
+
+    keep = ~bad_items.to_numpy()
+    rows = items.index[keep]
+    pairs = pd.DataFrame({key: frame[key].to_numpy()[frame.index.get_indexer(rows)],
+                          linked: items.to_numpy()[keep]})
+    return pairs, rows
+
+# --- 3. ENTRY POINT ---
+
+def ingest_folder(folder_path, strict=True, categorical=True):
+    """
+    Reads and validates the five CSVs. Returns (data, report): data is the
+    dict of DataFrames used by setup_csp plus the exploded link tables;
+    report has 'errors', 'warnings', 'rows', 'engine' and 'seconds'. With
+    `strict`, any error raises IngestError instead.
+    """
+    start = time.perf_counter()
+    report = {'errors': [], 'warnings': [], 'rows': {}, 'engine': csv_engine()}
+    data, lines = {}, {}
+    for name, schema in SCHEMAS.items():
+        path = os.path.join(folder_path, schema['file'])
+        try:
+            frame = read_table(path)
+        except FileNotFoundError:
+            report['errors'].append({'file': schema['file'], 'line': None, 'column': None, 'value': None,
+                                     'message': f"file not found in '{folder_path}'"})
+            continue
+        except Exception as e:  # Parser errors name the offending line themselves
+            report['errors'].append({'file': schema['file'], 'line': None, 'column': None, 'value': None,
+                                     'message': f"unreadable: {e}"})
+            continue
+        report['rows'][name] = len(frame)
+        lines[name] = SourceLines(path)
+        checked = _check_table(name, frame, report, lines[name])
+        if checked is not None:
+            data[name] = checked
+
+    known_courses = set(data['courses']['CourseID']) if 'courses' in data else None
+    for (table, column), (link, key, linked) in LINK_TABLES.items():
+        if table not in data:
+            continue
+        pairs, rows = _explode(data[table], key, column, linked, SCHEMAS[table], report, lines[table])
+        data[link] = pairs
+        if table == 'sections' and known_courses is not None:
+            # Qualifications for courses not offered this term are normal; only sections are checked
+            unknown = ~pairs[linked].isin(known_courses).to_numpy()
+            for row, value in zip(rows[unknown], pairs[linked][unknown]):
+                report['warnings'].append({'file': SCHEMAS[table]['file'], 'line': lines[table](int(row)),
+                                           'column': column, 'value': value,
+                                           'message': "unknown course (skipped by setup)"})
+
+    if categorical:
+        for name, frame in data.items():
+            if name in SCHEMAS:
+                for column, kind in SCHEMAS[name]['columns'].items():
+                    if kind == 'id':
+                        frame[column] = frame[column].astype('category')
+
+    report['seconds'] = round(time.perf_counter() - start, 6)
+    if strict and report['errors']:
+        raise IngestError(report)
+    return data, report
+
+def format_report(report, limit=10):
+    """Human-readable lines for the CLI and server logs."""
+    lines = []
+    if not report['errors']:
+        rows = sum(report['rows'].values())
+        lines.append(f"✅ Ingested {rows} rows with {ENGINE_NAMES.get(report['engine'], report['engine'])} in {report['seconds'] * 1000:.1f} ms.")
+    else:
+        lines.append(f"🔴 Ingestion found {len(report['errors'])} error(s):")
+    for severity in ('errors', 'warnings'):
+        for problem in report[severity][:limit]:
+            where = f"{problem['file']}" + (f":{problem['line']}" if problem['line'] else '')
+            value = f" '{problem['value']}'" if problem['value'] not in (None, '') else ''
+            marker = '❌' if severity == 'errors' else '🔴 WARNING:'
+            lines.append(f"  -> {marker} {where} [{problem['column'] or '-'}]{value}: {problem['message']}")
+        if len(report[severity]) > limit:
+            lines.append(f"  -> ... and {len(report[severity]) - limit} more {severity}.")
+    return '\n'.join(lines)
+
+# --- MAIN EXECUTION ---
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python cspIngest.py <data folder>")
+    _, result = ingest_folder(sys.argv[1], strict=False)
+    print(format_report(result, limit=50))
+    sys.exit(1 if result['errors'] else 0)
@@ -0,0 +1,263 @@
+#
+# Intelligent Systems Project 1:
+# Large-neighborhood search (LNS) to improve a feasible timetable.
+#
+# Starting from any feasible schedule, each step frees a structured
+# neighborhood (every session of one level, one day, one instructor or one
+# block of rooms), keeps everything else fixed and re-solves the freed
+# sessions with solve_backtracking under a small node budget. Values are
+# tried cheapest-first with some randomisation, and the repaired schedule is
+# accepted only if its cost goes down. With workers > 1, neighborhoods are
+# repaired in parallel processes, each new repair starting from the current best.
+#
+# Cost (lower is better), see schedule_cost():
+#   section_gaps       idle slots between a section's first and last session of a day
+#   instructor_gaps    the same for instructors
+#   late_sessions      sessions in the last slot of the day (per section)
+#
+
+import os
+import re
+import time
+import random
+from datetime import datetime
+
+import cspGrouping
+from cspGrouping import solve_backtracking, SearchLimitReached, get_sections_from_var
+
+DEFAULT_WEIGHTS = {'section_gaps': 3, 'instructor_gaps': 1, 'late_sessions': 1}
+
+NEIGHBORHOODS = ('level', 'day', 'instructor', 'room')
+
+# --- 1. OBJECTIVE ---
+
+def build_context(data, weights=None):
+    """Slot positions per day and cost weights, computed once from the dataset."""
+    slots = []
+    for _, row in data['timeslots'].iterrows():
+        try:
+            start = datetime.strptime(str(row['StartTime']).strip(), '%I:%M %p')
+            minutes = start.hour * 60 + start.minute
+        except ValueError:
+            minutes = len(slots)
+        slots.append((row['Day'], minutes, row['TimeSlotID']))
+
+    slot_day, slot_index, last_index = {}, {}, {}
+    for day in dict.fromkeys(day for day, _, _ in slots):
+        ordered = sorted((minutes, slot_id) for d, minutes, slot_id in slots if d == day)
+        for index, (_, slot_id) in enumerate(ordered):
+            slot_day[slot_id], slot_index[slot_id] = day, index
+        last_index[day] = len(ordered) - 1
+    return {'slot_day': slot_day, 'slot_index': slot_index, 'last_index': last_index,
+            'weights': dict(DEFAULT_WEIGHTS, **(weights or {}))}
+
+def _idle_slots(positions_by_key):
+    idle = 0
+    for positions in positions_by_key.values():
+        if len(positions) > 1:
+            idle += max(positions) - min(positions) + 1 - len(positions)
+    return idle
+
+def schedule_cost(schedule, context):
+    """Returns (weighted total, {component: raw count})."""
+    slot_day, slot_index, last_index = context['slot_day'], context['slot_index'], context['last_index']
+    section_days, instructor_days = {}, {}
+    late = 0
+    for var, (time_id, _, instructor_id) in schedule.items():
+        day, index = slot_day.get(time_id), slot_index.get(time_id, 0)
+        sections = cspGrouping.VAR_METADATA.get(var, {}).get('sections') or get_sections_from_var(var)
+        for section in sections:
+            section_days.setdefault((section, day), set()).add(index)
+        instructor_days.setdefault((instructor_id, day), set()).add(index)
+        if index == last_index.get(day, -1):
+            late += len(sections)
+
+    breakdown = {
+        'section_gaps': _idle_slots(section_days),
+        'instructor_gaps': _idle_slots(instructor_days),
+        'late_sessions': late,
+    }
+    weights = context['weights']
+    return sum(weights[name] * count for name, count in breakdown.items()), breakdown
+
+# --- 2. NEIGHBORHOODS ---
+
+def _level_of(section):
+    match = re.search(r"L(\d+)", section)
+    return match.group(1) if match else None
+
+def pick_neighborhood(kind, schedule, context, rng, max_free=40):
+    """Variables to free for one neighborhood of the given kind (at most max_free)."""
+    if kind == 'level':
+        levels = {}
+        for var in schedule:
+            for section in cspGrouping.VAR_METADATA.get(var, {}).get('sections') or get_sections_from_var(var):
+                levels.setdefault(_level_of(section), set()).add(var)
+        chosen = levels[rng.choice(sorted(levels, key=str))]
+    elif kind == 'day':
+        day = rng.choice(sorted(set(context['slot_day'].values())))
+        chosen = {var for var, value in schedule.items() if context['slot_day'].get(value[0]) == day}
+    elif kind == 'instructor':
+        instructor = rng.choice(sorted({value[2] for value in schedule.values()}))
+        chosen = {var for var, value in schedule.items() if value[2] == instructor}
+    elif kind == 'room':
+        rooms = sorted({value[1] for value in schedule.values()})
+        start = rng.randrange(len(rooms))
+        block = set(rooms[start:start + max(2, len(rooms) // 8)])
+        chosen = {var for var, value in schedule.items() if value[1] in block}
+    else:
+        raise ValueError(f"Unknown neighborhood '{kind}'. Use one of {NEIGHBORHOODS}.")
+
+    chosen = sorted(chosen)
+    if len(chosen) > max_free:
+        chosen = rng.sample(chosen, max_free)
+    return chosen
+
+# --- 3. REPAIR ---
+
+def _value_score(var, value, fixed_positions, context):
+    """Cheap estimate of the cost a value adds next to the fixed sessions."""
+    time_id, _, instructor_id = value
+    day, index = context['slot_day'].get(time_id), context['slot_index'].get(time_id, 0)
+    weights = context['weights']
+    score = weights['late_sessions'] if index == context['last_index'].get(day, -1) else 0
+    sections = cspGrouping.VAR_METADATA.get(var, {}).get('sections') or get_sections_from_var(var)
+    owners = [(('s', section), weights['section_gaps']) for section in sections]
+    owners.append((('i', instructor_id), weights['instructor_gaps']))
+    for owner, weight in owners:
+        positions = fixed_positions.get((owner, day))
+        if positions:
+            distance = min(abs(index - p) for p in positions)
+            score += weight * max(0, distance - 1)
+    return score
+
+def repair(variables, domains, schedule, free_vars, context, node_limit=2000, rng=None):
+    """
+    Re-solves free_vars with everything else fixed. Returns the new complete
+    schedule, or None if the node budget ran out or no repair exists.
+    """
+    rng = rng or random.Random()
+    free = set(free_vars)
+    fixed = {var: value for var, value in schedule.items() if var not in free}
+
+    busy = set()
+    fixed_positions = {}
+    for var, (time_id, room_id, instructor_id) in fixed.items():
+        day, index = context['slot_day'].get(time_id), context['slot_index'].get(time_id, 0)
+        busy.add(('r', time_id, room_id))
+        busy.add(('i', time_id, instructor_id))
+        fixed_positions.setdefault((('i', instructor_id), day), []).append(index)
+        for section in cspGrouping.VAR_METADATA.get(var, {}).get('sections') or get_sections_from_var(var):
+            busy.add(('s', time_id, section))
+            fixed_positions.setdefault((('s', section), day), []).append(index)
+
+    repair_domains = {var: [value] for var, value in fixed.items()}
+    for var in free:
+        sections = cspGrouping.VAR_METADATA.get(var, {}).get('sections') or get_sections_from_var(var)
+        values = [value for value in domains[var]
+                  if ('r', value[0], value[1]) not in busy and ('i', value[0], value[2]) not in busy
+                  and not any(('s', value[0], section) in busy for section in sections)]
+        if not values:
+            return None
+        rng.shuffle(values)  # Randomised tie-breaking between equally cheap values
+        values.sort(key=lambda value: _value_score(var, value, fixed_positions, context))
+        repair_domains[var] = values
+
+    try:
+        return solve_backtracking(variables, repair_domains, dict(fixed), verbose=False, node_limit=node_limit)
+    except SearchLimitReached:
+        return None
+
+# --- 4. PARALLEL WORKERS ---
+
+_WORKER_STATE = {}
+
+def _init_worker(variables, domains, var_metadata, context):
+    cspGrouping.VAR_METADATA.clear()
+    cspGrouping.VAR_METADATA.update(var_metadata)
+    _WORKER_STATE.update(variables=variables, domains=domains, context=context)
+
+def _repair_task(schedule, kind, seed, node_limit, max_free):
+    """Runs in a worker: picks one neighborhood, repairs it and returns (cost, schedule, kind)."""
+    rng = random.Random(seed)
+    variables, domains, context = _WORKER_STATE['variables'], _WORKER_STATE['domains'], _WORKER_STATE['context']
+    free_vars = pick_neighborhood(kind, schedule, context, rng, max_free)
+    repaired = repair(variables, domains, schedule, free_vars, context, node_limit, rng)
+    if repaired is None:
+        return None, None, kind
+    return schedule_cost(repaired, context)[0], repaired, kind
+
+# --- 5. LNS LOOP ---
+
+def improve_schedule(variables, domains, schedule, data=None, context=None, time_limit=30.0,
+                     node_limit=2000, max_free=40, workers=1, seed=0, neighborhoods=NEIGHBORHOODS,
+                     verbose=True):
+    """
+    Improves a feasible schedule for up to `time_limit` seconds.
+    Returns (best_schedule, stats) where stats holds the cost history.
+    """
+    context = context or build_context(data)
+    rng = random.Random(seed)
+    best = dict(schedule)
+    best_cost, breakdown = schedule_cost(best, context)
+    stats = {'initial_cost': best_cost, 'initial_breakdown': breakdown,
+             'repairs': 0, 'failed_repairs': 0, 'improvements': 0, 'accepted_by_kind': {}}
+    if verbose:
+        print(f" -> LNS start cost: {best_cost} {breakdown}")
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    pool = None
+    if workers > 1:
+        import multiprocessing as mp
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('spawn'),
+                                   initializer=_init_worker,
+                                   initargs=(variables, domains, dict(cspGrouping.VAR_METADATA), context))
+    else:
+        _init_worker(variables, domains, dict(cspGrouping.VAR_METADATA), context)
+
+    deadline = time.perf_counter() + time_limit
+
+    def next_task():
+        return (best, rng.choice(neighborhoods), rng.randrange(1 << 30), node_limit, max_free)
+
+    def accept(cost, repaired, kind):
+        nonlocal best, best_cost
+        stats['repairs'] += 1
+        if repaired is None:
+            stats['failed_repairs'] += 1
+        elif cost < best_cost:
+            # Repairs started from an older best are still complete, feasible
+            # schedules, so any that beats the current best is taken.
+            best, best_cost = repaired, cost
+            stats['improvements'] += 1
+            stats['accepted_by_kind'][kind] = stats['accepted_by_kind'].get(kind, 0) + 1
+            if verbose:
+                print(f" -> LNS repair {stats['repairs']}: {kind} neighborhood -> cost {best_cost}")
+
+    try:
+        if pool is None:
+            while best_cost > 0 and time.perf_counter() < deadline:
+                accept(*_repair_task(*next_task()))
+        else:
+            # Keep every worker busy: as soon as one repair finishes, start
+            # another from the current best.
+            from concurrent.futures import wait, FIRST_COMPLETED
+            pending = {pool.submit(_repair_task, *next_task()) for _ in range(workers)}
+            while pending:
+                done, pending = wait(pending, timeout=max(0.0, deadline - time.perf_counter()),
+                                     return_when=FIRST_COMPLETED)
+                for future in done:
+                    accept(*future.result())
+                if not done or best_cost == 0 or time.perf_counter() >= deadline:
+                    break
+                pending |= {pool.submit(_repair_task, *next_task()) for _ in done}
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    stats['final_cost'], stats['final_breakdown'] = schedule_cost(best, context)
+    if verbose:
+        print(f" -> LNS final cost: {stats['final_cost']} {stats['final_breakdown']} "
+              f"({stats['repairs']} repairs, {stats['improvements']} improvements)")
+    return best, stats
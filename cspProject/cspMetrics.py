@@ -0,0 +1,94 @@
+#
+# Intelligent Systems Project 1:
+# Low-overhead counters and phase timings for the CSP pipeline.
+#
+# The solver increments plain integer attributes on the shared METRICS object
+# (one attribute add per event) and wraps each pipeline phase in
+# METRICS.phase(name). A phase can optionally be run under cProfile or
+# tracemalloc by calling METRICS.reset(profile='cprofile' | 'tracemalloc').
+#
+
+import io
+import time
+from contextlib import contextmanager
+
+COUNTERS = ('arcs_processed', 'revisions', 'values_pruned', 'consistency_checks',
+            'nodes', 'backtracks', 'max_depth', 'mrv_selections',
+            'backjumps', 'nogoods_learned', 'nogood_prunes', 'propagation_failures')
+
+PROFILERS = (None, 'cprofile', 'tracemalloc')
+
+class SolverMetrics:
+    """Counters, per-phase wall-clock timings and optional per-phase profiles."""
+
+    def __init__(self, profile=None):
+        self.reset(profile)
+
+    def reset(self, profile=None):
+        """Zeroes every counter and timing. `profile` selects the phase profiler."""
+        if profile not in PROFILERS:
+            raise ValueError(f"Unknown profiler '{profile}'. Use one of {PROFILERS}.")
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        self.profile = profile
+        self.timings = {}
+        self.profiles = {}
+
+    def add_time(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        """Times a pipeline phase and, if enabled, profiles it."""
+        profiler = None
+        if self.profile == 'cprofile':
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+        elif self.profile == 'tracemalloc':
+            import tracemalloc
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+            if self.profile == 'cprofile':
+                import pstats
+                profiler.disable()
+                out = io.StringIO()
+                pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(15)
+                self.profiles[name] = out.getvalue()
+            elif self.profile == 'tracemalloc':
+                import tracemalloc
+                current, peak = tracemalloc.get_traced_memory()
+                self.profiles[name] = {'current_kb': current // 1024, 'peak_kb': peak // 1024}
+                if started_tracing:
+                    tracemalloc.stop()
+
+    def counters(self):
+        return {name: getattr(self, name) for name in COUNTERS}
+
+    def to_dict(self):
+        return {
+            'counters': self.counters(),
+            'timings': {name: round(seconds, 6) for name, seconds in self.timings.items()},
+            'profiles': dict(self.profiles),
+        }
+
+    def summary(self):
+        """One-line-per-item text summary for the CLI."""
+        lines = ["--- Solver Metrics ---"]
+        for name, seconds in self.timings.items():
+            lines.append(f"  -> {name:<20} {seconds:10.4f}s")
+        for name, value in self.counters().items():
+            lines.append(f"  -> {name:<20} {value:10d}")
+        return '\n'.join(lines)
+
+# Shared instance used by cspGrouping. Callers reset it rather than replace it,
+# so `from cspMetrics import METRICS` bindings stay valid.
+METRICS = SolverMetrics()
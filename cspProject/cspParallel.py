@@ -0,0 +1,349 @@
+#
+# Intelligent Systems Project 1:
+# Work-splitting parallel tree search with work stealing.
+#
+# The coordinator expands the top of the search tree (MRV variable first,
+# consistent values only) until there are several subtrees per worker, and
+# serves them from a queue over a multiprocessing manager on TCP. Each worker
+# explores its subtree depth-first with an explicit stack. When the queue is
+# empty and some worker is waiting, busy workers donate the untried values
+# of their shallowest open frame (the biggest unexplored subtrees) back to
+# the queue. The first complete schedule stops everyone; if the queue is
+# empty and no worker is busy, the problem has no solution.
+#
+# Each worker is a fresh process that receives the whole problem, so startup
+# costs seconds before the first node. This only pays off when the search
+# itself dominates, i.e. heavy backtracking (many more nodes than variables),
+# and there is one free core per worker. On CSP_data after AC-3 the search is
+# almost backtrack-free (252 nodes, 5.9s sequential) and one or two workers
+# on one core take 15.3s and 28.6s, so the sequential solver stays the default.
+#
+# Single machine:
+#   python cspParallel.py solve E:\CSP_data --workers 4
+# Across machines (the coordinator prints the address and key to use):
+#   python cspParallel.py solve E:\CSP_data --host 0.0.0.0 --port 50000 --workers 0
+#   python cspParallel.py worker --connect 10.0.0.5:50000 --authkey <key>
+#
+
+import os
+import sys
+import time
+import socket
+import secrets
+import threading
+from collections import deque
+from multiprocessing.managers import BaseManager
+
+import cspGrouping
+from cspGrouping import is_consistent, select_unassigned_variable_mrv
+
+# --- 1. SPLITTING ---
+
+def _consistent_values(var, domains, schedule):
+    return [value for value in domains[var]
+            if all(is_consistent(value, assigned_value, var, assigned_var)
+                   for assigned_var, assigned_value in schedule.items())]
+
+def split_problem(variables, domains, target, max_depth=4):
+    """
+    Breadth-first expansion of the top of the tree. Returns a list of
+    prefixes (lists of (variable, value)) covering the whole search space.
+    """
+    frontier = [[]]
+    for _ in range(max_depth):
+        if len(frontier) >= target:
+            break
+        expanded = []
+        for prefix in frontier:
+            schedule = dict(prefix)
+            var = select_unassigned_variable_mrv(variables, schedule, domains)
+            if var is None:
+                expanded.append(prefix)  # Already complete
+                continue
+            expanded.extend(prefix + [(var, value)] for value in _consistent_values(var, domains, schedule))
+        frontier = expanded
+        if not frontier:
+            break
+    return frontier
+
+# --- 2. COORDINATOR ---
+
+class SearchCoordinator:
+    """Shared work queue; its methods are called by workers through manager proxies."""
+
+    def __init__(self, problem, units):
+        self.problem = problem
+        self.queue = deque(units)
+        self.busy = set()
+        self.waiting = 0
+        self.solution = None
+        self.finished = not units
+        self.stats = {'units': len(units), 'donated': 0, 'steals': 0, 'nodes': 0, 'workers': set()}
+        self.condition = threading.Condition()
+
+    def get_problem(self):
+        return self.problem
+
+    def get_work(self, worker_id, timeout=1.0):
+        """Returns ('work', prefix), ('wait', None) or ('stop', None)."""
+        with self.condition:
+            self.busy.discard(worker_id)
+            self.stats['workers'].add(worker_id)
+            if not self.queue and not self.busy:
+                self.finished = True
+                self.condition.notify_all()
+            self.waiting += 1
+            try:
+                deadline = time.monotonic() + timeout
+                while not self.queue and not self.finished:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return 'wait', None
+                    self.condition.wait(remaining)
+                if self.finished:
+                    return 'stop', None
+                self.busy.add(worker_id)
+                return 'work', self.queue.popleft()
+            finally:
+                self.waiting -= 1
+
+    def steal_wanted(self):
+        with self.condition:
+            return not self.finished and self.waiting > 0 and not self.queue
+
+    def put_work(self, worker_id, units):
+        with self.condition:
+            self.queue.extend(units)
+            self.stats['donated'] += len(units)
+            self.stats['steals'] += 1
+            self.condition.notify_all()
+
+    def report(self, worker_id, nodes, solution=None):
+        with self.condition:
+            self.stats['nodes'] += nodes
+            if solution is not None and self.solution is None:
+                self.solution = solution
+                self.finished = True
+                self.condition.notify_all()
+
+    def should_stop(self):
+        return self.finished
+
+    def wait_finished(self, timeout=None):
+        with self.condition:
+            return self.condition.wait_for(lambda: self.finished, timeout)
+
+class _CoordinatorManager(BaseManager):
+    pass
+
+def start_coordinator(coordinator, host='127.0.0.1', port=0, authkey=None):
+    """
+    Serves `coordinator` on TCP from a background thread. Returns
+    (address, authkey, stop); stop() closes the listening socket and ends
+    the thread, so long-lived processes do not collect one per solve.
+    """
+    authkey = authkey or secrets.token_hex(16).encode()
+    manager = _CoordinatorManager(address=(host, port), authkey=authkey)
+    manager.register('coordinator', callable=lambda: coordinator)
+    server = manager.get_server()
+    # Server.serve_forever cannot be stopped from another thread, so connections are accepted here
+    server.stop_event = threading.Event()  # Also ends the per-client threads of Server.serve_client
+
+    def accept_loop():
+        while True:
+            try:
+                conn = server.listener.accept()
+            except OSError:
+                continue
+            if server.stop_event.is_set():
+                conn.close()
+                return
+            threading.Thread(target=server.handle_request, args=(conn,), daemon=True).start()
+
+    thread = threading.Thread(target=accept_loop, daemon=True)
+    thread.start()
+
+    def stop():
+        server.stop_event.set()
+        wake_host = '127.0.0.1' if host in ('', '0.0.0.0') else host
+        try:  # accept() only returns on a connection: make one
+            socket.create_connection((wake_host, server.address[1]), timeout=5).close()
+        except OSError:
+            pass
+        thread.join(5)
+        server.listener.close()
+
+    return server.address, authkey, stop
+
+# --- 3. WORKER ---
+
+def search_subtree(prefix, variables, domains, coordinator, check_every=200):
+    """
+    Depth-first search below `prefix` with an explicit stack so that untried
+    values can be handed to idle workers. Returns (solution or None, nodes).
+    """
+    schedule = dict(prefix)
+    frames = []  # [variable, untried values (tried from the end)]
+    nodes = 0
+    descend = True
+    while True:
+        if descend:
+            nodes += 1
+            if len(schedule) == len(variables):
+                return dict(schedule), nodes
+            var = select_unassigned_variable_mrv(variables, schedule, domains)
+            values = _consistent_values(var, domains, schedule)
+            values.reverse()
+            frames.append([var, values])
+
+        if nodes % check_every == 0:
+            if coordinator.should_stop():
+                return None, nodes
+            if coordinator.steal_wanted():
+                donation = _donate(prefix, frames, schedule)
+                if donation:
+                    coordinator.put_work(os.getpid(), donation)
+
+        descend = False
+        while frames:
+            var, untried = frames[-1]
+            schedule.pop(var, None)
+            if untried:
+                schedule[var] = untried.pop()
+                descend = True
+                break
+            frames.pop()
+        if not descend:
+            return None, nodes
+
+def _donate(prefix, frames, schedule):
+    """Gives away half of the untried values of the shallowest frame that has any."""
+    path = list(prefix)
+    for depth, (var, untried) in enumerate(frames):
+        # Frames below the top are always assigned; the top one may be fresh.
+        if untried and (len(untried) > 1 or depth < len(frames) - 1):
+            give = untried[:max(1, len(untried) // 2)]
+            del untried[:len(give)]
+            return [path + [(var, value)] for value in give]
+        if var not in schedule:
+            break
+        path.append((var, schedule[var]))
+    return []
+
+def run_worker(address, authkey, worker_id=None):
+    """Connects to a coordinator and searches until it says stop."""
+    if isinstance(authkey, str):
+        authkey = authkey.encode()
+    worker_id = worker_id or f"{os.uname().nodename if hasattr(os, 'uname') else 'worker'}-{os.getpid()}"
+    _CoordinatorManager.register('coordinator')
+    manager = _CoordinatorManager(address=tuple(address), authkey=authkey)
+    manager.connect()
+    coordinator = manager.coordinator()
+
+    problem = coordinator.get_problem()
+    cspGrouping.VAR_METADATA.clear()
+    cspGrouping.VAR_METADATA.update(problem['var_metadata'])
+    variables, domains = problem['variables'], problem['domains']
+
+    while True:
+        kind, prefix = coordinator.get_work(worker_id)
+        if kind == 'stop':
+            return
+        if kind == 'wait':
+            continue
+        solution, nodes = search_subtree(prefix, variables, domains, coordinator)
+        coordinator.report(worker_id, nodes, solution)
+
+# --- 4. ENTRY POINT ---
+
+def solve_parallel(variables, domains, var_metadata=None, workers=None, host='127.0.0.1', port=0,
+                   authkey=None, split_factor=4, timeout=None, verbose=True):
+    """
+    Parallel replacement for solve_backtracking. Starts a coordinator and
+    `workers` local worker processes (0 = only wait for remote workers).
+    Returns (schedule or None, stats); stats['status'] is 'solved',
+    'no_solution' or 'timeout'.
+    """
+    import multiprocessing as mp
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    var_metadata = dict(cspGrouping.VAR_METADATA if var_metadata is None else var_metadata)
+    start = time.perf_counter()
+    units = split_problem(variables, domains, max(1, workers) * split_factor)
+    problem = {'variables': variables, 'domains': domains, 'var_metadata': var_metadata}
+    coordinator = SearchCoordinator(problem, units)
+    address, authkey, stop_coordinator = start_coordinator(coordinator, host, port, authkey)
+    if verbose:
+        print(f" -> Coordinator on {address[0]}:{address[1]} (authkey {authkey.decode()}), "
+              f"{len(units)} subtrees, {workers} local worker(s)")
+
+    ctx = mp.get_context('spawn')
+    processes = [ctx.Process(target=run_worker, args=(address, authkey, f"local-{n}"), daemon=True)
+                 for n in range(workers)]
+    try:
+        for process in processes:
+            process.start()
+        finished = coordinator.wait_finished(timeout)
+    finally:
+        with coordinator.condition:
+            coordinator.finished = True
+            coordinator.condition.notify_all()
+        for process in processes:
+            if process.pid is not None:
+                process.join(5)
+                if process.is_alive():
+                    process.terminate()
+        stop_coordinator()
+
+    stats = dict(coordinator.stats, workers=len(coordinator.stats['workers']),
+                 seconds=time.perf_counter() - start)
+    if coordinator.solution is not None:
+        stats['status'] = 'solved'
+    else:
+        stats['status'] = 'no_solution' if finished else 'timeout'
+    return coordinator.solution, stats
+
+# --- MAIN EXECUTION ---
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Parallel backtracking with work stealing.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    solve_cmd = sub.add_parser('solve', help="Run the coordinator (and local workers) on a dataset")
+    solve_cmd.add_argument('data_folder', help="Folder with the CSV files")
+    solve_cmd.add_argument('--workers', type=int, default=None, help="Local worker processes (0 = remote only)")
+    solve_cmd.add_argument('--host', default='127.0.0.1', help="Interface to listen on (0.0.0.0 for remote workers)")
+    solve_cmd.add_argument('--port', type=int, default=0)
+    solve_cmd.add_argument('--authkey', default=os.environ.get('CSP_AUTHKEY'))
+    solve_cmd.add_argument('--timeout', type=float, default=None)
+    worker_cmd = sub.add_parser('worker', help="Join a running coordinator")
+    worker_cmd.add_argument('--connect', required=True, help="host:port of the coordinator")
+    worker_cmd.add_argument('--authkey', default=os.environ.get('CSP_AUTHKEY'), required='CSP_AUTHKEY' not in os.environ)
+    args = parser.parse_args()
+
+    if args.command == 'worker':
+        host, port = args.connect.rsplit(':', 1)
+        run_worker((host, int(port)), args.authkey)
+        sys.exit(0)
+
+    from cspCache import load_problem
+    problem, data = load_problem(args.data_folder)
+    if problem is None:
+        sys.exit("❌ Failed to load CSV data.")
+    variables, domains, constraints, _ = problem
+    if any(not d for d in domains.values()):
+        sys.exit("❌ One or more domains are empty after setup.")
+    propagators = cspGrouping.build_alldiff_propagators(variables, cspGrouping.VAR_METADATA)
+    if not cspGrouping.ac3(variables, domains, constraints, propagators):
+        sys.exit("❌ No solution possible (Inconsistent constraints).")
+
+    schedule, stats = solve_parallel(variables, domains, workers=args.workers, host=args.host, port=args.port,
+                                     authkey=args.authkey.encode() if args.authkey else None,
+                                     timeout=args.timeout)
+    print(f" -> {stats['status']} in {stats['seconds']:.2f}s: {stats['nodes']} nodes, "
+          f"{stats['units']} initial subtrees, {stats['donated']} stolen, {stats['workers']} worker(s)")
+    if schedule:
+        from cspValidate import validate_schedule, format_report
+        data = data or cspGrouping.load_data_from_csv(args.data_folder)  # Not parsed on a cache hit
+        print(format_report(validate_schedule(schedule, data, cspGrouping.VAR_METADATA, variables)))
+        cspGrouping.display_and_save_timetable(schedule, data, show_gui=False)
@@ -0,0 +1,107 @@
+#
+# Intelligent Systems Project 1:
+# In-memory query indexes over one formatted timetable.
+#
+# A TimetableIndex is built once per solution from the session dicts the
+# frontend renders. Every session is serialized to JSON once, and inverted
+# indexes (section, instructor, room, day, level -> sorted session positions)
+# answer filtered queries by intersecting position lists, so a page view
+# costs a few list operations and a string join instead of re-formatting
+# the whole schedule.
+#
+
+import re
+import json
+import hashlib
+
+FILTERS = ('section', 'instructor', 'room', 'day', 'level', 'course', 'type')
+
+def _level_of(section):
+    match = re.search(r"_L(\d+)$", section)
+    return match.group(1) if match else None
+
+def _session_keys(session):
+    """(filter, key, alias) triples a session can be found under; aliases are left out of facets."""
+    keys = [('room', session['room'], False), ('day', session['day'], False),
+            ('course', session['course'], False), ('type', session['type'], False),
+            ('instructor', session['instructor'], False)]
+    if session.get('instructorId'):
+        keys.append(('instructor', session['instructorId'], True))
+    for section in session['sections']:
+        keys.append(('section', section, False))
+        level = _level_of(section)
+        if level is not None:
+            keys.append(('level', level, False))
+    return keys
+
+class TimetableIndex:
+    """Read-only, precomputed views of one formatted schedule."""
+
+    def __init__(self, sessions, solution_id=None):
+        day_order = {}
+        for session in sessions:
+            day_order.setdefault(session['day'], len(day_order))
+        # Stable order for pagination: day, start time, course, id
+        self.sessions = sorted(sessions, key=lambda s: (day_order[s['day']], s['startTime'], s['course'], s['id']))
+        self.fragments = [json.dumps(session, separators=(',', ':')) for session in self.sessions]
+        digest = hashlib.sha1()
+        for fragment in self.fragments:
+            digest.update(fragment.encode('utf-8'))
+        self.solution_id = solution_id or digest.hexdigest()[:16]
+
+        self.indexes = {name: {} for name in FILTERS}
+        self.aliases = {name: set() for name in FILTERS}
+        for position, session in enumerate(self.sessions):
+            for name, key, alias in _session_keys(session):
+                if alias:
+                    self.aliases[name].add(str(key))
+                positions = self.indexes[name].setdefault(str(key), [])
+                if not positions or positions[-1] != position:
+                    positions.append(position)
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def select(self, filters):
+        """
+        Sorted positions of the sessions matching every filter
+        ({name: key}; unknown names raise ValueError).
+        """
+        lists = []
+        for name, key in filters.items():
+            if name not in self.indexes:
+                raise ValueError(f"Unknown filter '{name}'. Use one of {', '.join(FILTERS)}.")
+            lists.append(self.indexes[name].get(str(key), []))
+        if not lists:
+            return range(len(self.sessions))
+        lists.sort(key=len)
+        result = lists[0]
+        for other in lists[1:]:
+            members = set(other)
+            result = [position for position in result if position in members]
+        return result
+
+    def page_json(self, filters, page=1, page_size=50):
+        """
+        One page as a JSON string, built from the pre-serialized sessions.
+        Returns (body, total matches).
+        """
+        positions = self.select(filters)
+        total = len(positions)
+        start = (page - 1) * page_size
+        chosen = positions[start:start + page_size]
+        pages = max(1, -(-total // page_size))
+        header = json.dumps({"status": "success", "solution": self.solution_id, "filters": filters,
+                             "page": page, "page_size": page_size, "pages": pages, "total": total},
+                            separators=(',', ':'))
+        body = header[:-1] + ',"data":[' + ','.join(self.fragments[p] for p in chosen) + ']}'
+        return body, total
+
+    def facets(self):
+        """
+        {filter: {key: session count}}, for the frontend's filter menus.
+        Instructor IDs still filter but are not listed next to the names.
+        """
+        return {name: {key: len(positions) for key, positions in sorted(index.items())
+                       if key not in self.aliases[name]}
+                for name, index in self.indexes.items()}
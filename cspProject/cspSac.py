@@ -0,0 +1,176 @@
+#
+# Intelligent Systems Project 1:
+# Budgeted singleton arc consistency (SAC) preprocessing.
+#
+# Binary AC-3 rarely prunes timetabling domains: almost every value has some
+# support on each single arc. SAC is stronger: each value is tried as if it
+# were the variable's only value, the global all-different propagators
+# (cspGlobal) are run, and the value is removed when that wipes out a domain.
+# Such values are exactly the ones search would otherwise have to refute
+# over and over at deep nodes.
+#
+# A full SAC pass costs one propagation per value, so it is bounded by a time
+# and a value budget and spends them where they pay off most: variables with
+# the smallest domains first. With workers > 1 variables are tested in
+# parallel processes. A worker tests against the domains of the start of the
+# pass, which may be larger than the current ones; a value that wipes out
+# there also wipes out on the smaller domains, so every removal stays sound.
+#
+
+import os
+import time
+
+import cspGrouping
+from cspGlobal import build_alldiff_propagators, propagate_global
+
+# --- 1. SINGLETON TEST ---
+
+def singleton_supported(var, value, domains, propagators):
+    """True unless restricting `var` to `value` makes propagation fail."""
+    trial = dict(domains)  # Propagators assign new lists, so a shallow copy is enough
+    trial[var] = [value]
+    consistent, _, _ = propagate_global(propagators, trial, {var})
+    return consistent
+
+def _test_values(var, values, domains, propagators, deadline, value_budget):
+    """Tests values in order until a budget runs out. Returns (removed, tested)."""
+    removed, tested = [], 0
+    for value in values:
+        if time.perf_counter() >= deadline or tested >= value_budget:
+            break
+        tested += 1
+        if not singleton_supported(var, value, domains, propagators):
+            removed.append(value)
+    return removed, tested
+
+# --- 2. PARALLEL WORKERS ---
+
+_WORKER_STATE = {}
+
+def _init_worker(domains, var_metadata, propagators):
+    cspGrouping.VAR_METADATA.clear()
+    cspGrouping.VAR_METADATA.update(var_metadata)
+    _WORKER_STATE.update(domains=domains, propagators=propagators)
+
+def _sac_task(var, values, deadline_in, value_budget):
+    """Runs in a worker. `deadline_in` is relative: clocks differ between processes."""
+    deadline = time.perf_counter() + deadline_in
+    removed, tested = _test_values(var, values, _WORKER_STATE['domains'], _WORKER_STATE['propagators'],
+                                   deadline, value_budget)
+    return var, removed, tested
+
+# --- 3. SAC LOOP ---
+
+def _apply_removals(var, removed, domains, propagators, stats):
+    """Removes refuted values and propagates them. Returns False on a wipe-out."""
+    if not removed:
+        return True
+    refuted = set(removed)
+    domains[var] = [value for value in domains[var] if value not in refuted]
+    stats['removed'] += len(removed)
+    if not domains[var]:
+        stats['wiped_out'] = var
+        return False
+    consistent, changed, _ = propagate_global(propagators, domains, {var})
+    stats['propagated'] += len(changed)
+    if not consistent:
+        stats['wiped_out'] = var
+    return consistent
+
+def singleton_arc_consistency(variables, domains, var_metadata=None, propagators=None,
+                              time_limit=5.0, value_limit=None, workers=1, chunk_size=32, verbose=True):
+    """
+    Prunes `domains` in place with SAC until a fixpoint or a budget runs out.
+    Variables are visited smallest domain first; passes repeat while a pass
+    removed something; with workers > 1 each task tests `chunk_size` values.
+    `propagators` defaults to the all-different propagators; pass the
+    solver's list to include symmetry-breaking ones.
+    Returns (consistent, stats); stats['complete'] is True when the last
+    pass finished within budget, i.e. the domains are singleton arc consistent.
+    """
+    var_metadata = var_metadata if var_metadata is not None else cspGrouping.VAR_METADATA
+    propagators = propagators or build_alldiff_propagators(variables, var_metadata)
+    value_limit = value_limit if value_limit is not None else float('inf')
+    start = time.perf_counter()
+    deadline = start + time_limit
+    stats = {'passes': 0, 'tested': 0, 'removed': 0, 'propagated': 0,
+             'complete': False, 'wiped_out': None, 'seconds': 0.0}
+
+    def budget_left():
+        return time.perf_counter() < deadline and stats['tested'] < value_limit
+
+    def finish(consistent):
+        stats['seconds'] = round(time.perf_counter() - start, 6)
+        if verbose:
+            print(f" -> SAC: {stats['removed']} value(s) removed after {stats['tested']} test(s) "
+                  f"in {stats['passes']} pass(es), {stats['seconds']:.2f}s"
+                  + ("" if stats['complete'] else " (budget reached)")
+                  + ("" if consistent else f"; {stats['wiped_out']} has no value left"))
+        return consistent, stats
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    while budget_left():
+        stats['passes'] += 1
+        removed_before = stats['removed']
+        order = sorted((v for v in variables if len(domains[v]) > 1), key=lambda v: len(domains[v]))
+        finished = True
+
+        if workers == 1:
+            for var in order:
+                if not budget_left():
+                    finished = False
+                    break
+                removed, tested = _test_values(var, list(domains[var]), domains, propagators, deadline,
+                                               value_limit - stats['tested'])
+                stats['tested'] += tested
+                if tested < len(domains[var]):
+                    finished = False
+                if not _apply_removals(var, removed, domains, propagators, stats):
+                    return finish(False)
+        else:
+            import multiprocessing as mp
+            from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('spawn'),
+                                       initializer=_init_worker,
+                                       initargs=(domains, dict(var_metadata), propagators))
+            # Work items are chunks of one variable's values, smallest domains popped first
+            queue = [(var, domains[var][i:i + chunk_size]) for var in order
+                     for i in range(0, len(domains[var]), chunk_size)][::-1]
+            running = {}  # future -> number of values sent
+
+            def submit():
+                var, values = queue.pop()
+                budget = value_limit - stats['tested'] - sum(running.values())
+                running[pool.submit(_sac_task, var, values, max(0.0, deadline - time.perf_counter()),
+                                    budget)] = len(values)
+
+            try:
+                while queue and len(running) < workers and budget_left():
+                    submit()
+                while running:
+                    # Workers stop at the deadline themselves, so this wait is short
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        sent = running.pop(future)
+                        var, removed, tested = future.result()
+                        stats['tested'] += tested
+                        if tested < sent:
+                            finished = False
+                        current = set(domains[var])  # Propagation may have removed some already
+                        removed = [value for value in removed if value in current]
+                        if not _apply_removals(var, removed, domains, propagators, stats):
+                            return finish(False)
+                    while queue and len(running) < workers and budget_left():
+                        submit()
+                if queue:
+                    finished = False
+            finally:
+                pool.shutdown(cancel_futures=True)
+
+        if finished:
+            if stats['removed'] == removed_before:
+                stats['complete'] = True
+                break
+        else:
+            break
+    return finish(True)
@@ -0,0 +1,270 @@
+#
+# Intelligent Systems Project 1:
+# SAT backend: CNF encoding of the timetabling CSP, DIMACS export and decoding.
+#
+# Every (variable, value) pair from setup_csp becomes one Boolean literal.
+#
+#   exactly one    per variable                   (one clause + at-most-one)
+#   at most one    per (timeslot, room)
+#   at most one    per (timeslot, instructor)
+#   at most one    per (timeslot, section)
+#
+# Within a resource group, a variable's literals are first implied into one
+# "uses this resource" literal, then at-most-one groups larger than
+# PAIRWISE_LIMIT use the sequential counter encoding (Sinz, 2005): 3n - 4
+# clauses and n - 1 auxiliary variables, so the CNF grows linearly with the
+# number of domain values. Clauses are kept in a flat, zero-terminated
+# array('i') (the DIMACS layout) rather than lists.
+#
+# Solving uses pycosat when it is installed, otherwise the first external
+# solver found on PATH (kissat, cadical, minisat, glucose).
+#
+
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from array import array
+
+PAIRWISE_LIMIT = 5  # Pairwise AMO is smaller than the counter up to here
+
+# External solver -> command prefix. minisat writes the model to a file.
+SOLVER_COMMANDS = {
+    'kissat': ['kissat', '-q'],
+    'cadical': ['cadical', '-q'],
+    'minisat': ['minisat', '-verb=0'],
+    'glucose': ['glucose', '-model', '-verb=0'],
+}
+
+# --- 1. ENCODING ---
+
+class SatEncoding:
+    """CNF for one problem plus the literal -> (variable, value) map used to decode models."""
+
+    def __init__(self):
+        self.n_vars = 0
+        self.n_clauses = 0
+        self.clauses = array('i')
+        self.decode = [None]  # literal -> (variable, value); aux literals map to None
+        self.var_literals = {}
+
+    def new_var(self, meaning=None):
+        self.n_vars += 1
+        self.decode.append(meaning)
+        return self.n_vars
+
+    def add_clause(self, literals):
+        self.clauses.extend(literals)
+        self.clauses.append(0)
+        self.n_clauses += 1
+
+    def at_most_one(self, literals):
+        n = len(literals)
+        if n < 2:
+            return
+        if n <= PAIRWISE_LIMIT:
+            for a in range(n):
+                for b in range(a + 1, n):
+                    self.add_clause((-literals[a], -literals[b]))
+            return
+        # Sequential counter: s_i is true once one of x_1..x_i is true.
+        counters = [self.new_var() for _ in range(n - 1)]
+        self.add_clause((-literals[0], counters[0]))
+        for i in range(1, n - 1):
+            self.add_clause((-literals[i], counters[i]))
+            self.add_clause((-counters[i - 1], counters[i]))
+            self.add_clause((-literals[i], -counters[i - 1]))
+        self.add_clause((-literals[n - 1], -counters[n - 2]))
+
+    def iter_clauses(self):
+        clause = []
+        for literal in self.clauses:
+            if literal == 0:
+                yield clause
+                clause = []
+            else:
+                clause.append(literal)
+
+def encode_csp(variables, domains, var_metadata=None):
+    """Encodes setup_csp variables/domains as CNF. Returns a SatEncoding."""
+    from cspGrouping import get_sections_from_var
+
+    var_metadata = var_metadata or {}
+    encoding = SatEncoding()
+    groups = {}  # ('room'|'instructor'|'section', timeslot, id) -> {variable: literals}
+
+    for var in variables:
+        literals = []
+        sections = var_metadata.get(var, {}).get('sections') or get_sections_from_var(var)
+        for value in domains[var]:
+            literal = encoding.new_var((var, value))
+            literals.append(literal)
+            time_id, room_id, instructor_id = value
+            for key in [('room', time_id, room_id), ('instructor', time_id, instructor_id)] + \
+                       [('section', time_id, section) for section in sections]:
+                groups.setdefault(key, {}).setdefault(var, []).append(literal)
+        encoding.var_literals[var] = literals
+        encoding.add_clause(literals)  # At least one value (empty clause if the domain is empty)
+        encoding.at_most_one(literals)
+
+    for by_var in groups.values():
+        if len(by_var) < 2:
+            continue
+        # A variable holding several literals of the group gets one "uses this
+        # resource" literal (x -> y), so the AMO runs over variables, not values.
+        users = []
+        for literals in by_var.values():
+            if len(literals) == 1:
+                users.append(literals[0])
+            else:
+                uses = encoding.new_var()
+                for literal in literals:
+                    encoding.add_clause((-literal, uses))
+                users.append(uses)
+        encoding.at_most_one(users)
+    return encoding
+
+def write_dimacs(encoding, path):
+    """Writes the CNF in DIMACS format, one clause per line."""
+    with open(path, 'w', encoding='ascii') as f:
+        f.write(f"p cnf {encoding.n_vars} {encoding.n_clauses}\n")
+        line = []
+        for literal in encoding.clauses:
+            line.append(str(literal))
+            if literal == 0:
+                f.write(' '.join(line) + '\n')
+                line = []
+    return path
+
+def decode_model(encoding, model):
+    """Turns a list of true/false literals into the usual {variable: (time, room, instructor)} dict."""
+    schedule = {}
+    for literal in model:
+        if 0 < literal < len(encoding.decode) and encoding.decode[literal] is not None:
+            var, value = encoding.decode[literal]
+            schedule.setdefault(var, value)
+    return schedule
+
+# --- 2. SOLVING ---
+
+def available_solver():
+    """Name of the solver solve_sat will use, or None."""
+    try:
+        import pycosat  # noqa: F401
+        return 'pycosat'
+    except ImportError:
+        pass
+    for name in SOLVER_COMMANDS:
+        if shutil.which(SOLVER_COMMANDS[name][0]):
+            return name
+    return None
+
+def _parse_solver_output(text):
+    status, model = None, []
+    for line in text.splitlines():
+        if line.startswith('s '):
+            status = line[2:].strip()
+        elif line.startswith('v '):
+            model.extend(int(tok) for tok in line[2:].split())
+        elif line.strip() in ('SAT', 'UNSAT', 'INDET'):
+            status = {'SAT': 'SATISFIABLE', 'UNSAT': 'UNSATISFIABLE'}.get(line.strip(), 'UNKNOWN')
+        elif status == 'SATISFIABLE' and line and line.lstrip('-')[:1].isdigit():
+            model.extend(int(tok) for tok in line.split())
+    return status, [literal for literal in model if literal != 0]
+
+def solve_sat(encoding, solver=None, timeout=None, keep_dimacs=None):
+    """
+    Returns (status, model) with status 'SATISFIABLE', 'UNSATISFIABLE' or
+    'UNKNOWN' (timeout / no answer). `keep_dimacs` saves the CNF file passed
+    to an external solver.
+    """
+    solver = solver or available_solver()
+    if solver is None:
+        raise RuntimeError("No SAT solver found. Install pycosat or put kissat/cadical/minisat/glucose on PATH.")
+
+    if solver == 'pycosat':
+        import pycosat
+        result = pycosat.solve(list(encoding.iter_clauses()))
+        if result == 'UNSAT':
+            return 'UNSATISFIABLE', []
+        if result == 'UNKNOWN':
+            return 'UNKNOWN', []
+        return 'SATISFIABLE', result
+
+    if solver not in SOLVER_COMMANDS:
+        raise ValueError(f"Unknown SAT solver '{solver}'. Use pycosat or one of {', '.join(SOLVER_COMMANDS)}.")
+    # The work directory is removed on every exit, timeouts and solver errors included
+    with tempfile.TemporaryDirectory(prefix='csp_sat_') as workdir:
+        cnf_path = keep_dimacs or os.path.join(workdir, 'problem.cnf')
+        write_dimacs(encoding, cnf_path)
+        command = SOLVER_COMMANDS[solver] + [cnf_path]
+        model_path = None
+        if solver == 'minisat':
+            model_path = os.path.join(workdir, 'model.txt')
+            command.append(model_path)
+        try:
+            completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return 'UNKNOWN', []
+        output = completed.stdout
+        if model_path and os.path.exists(model_path):
+            with open(model_path, encoding='ascii') as f:
+                output = f.read()
+    status, model = _parse_solver_output(output)
+    if status is None:
+        status = {10: 'SATISFIABLE', 20: 'UNSATISFIABLE'}.get(completed.returncode, 'UNKNOWN')
+    return status, model
+
+def solve_with_sat(variables, domains, var_metadata=None, solver=None, timeout=None, stats=None):
+    """
+    Drop-in alternative to solve_backtracking: returns the schedule dict or
+    None when the CNF is unsatisfiable. `stats` (a dict) receives sizes and timings.
+    """
+    stats = stats if stats is not None else {}
+    start = time.perf_counter()
+    encoding = encode_csp(variables, domains, var_metadata)
+    stats.update(encode_time=time.perf_counter() - start, sat_vars=encoding.n_vars,
+                 sat_clauses=encoding.n_clauses)
+
+    start = time.perf_counter()
+    status, model = solve_sat(encoding, solver=solver, timeout=timeout)
+    stats.update(sat_time=time.perf_counter() - start, sat_status=status)
+    if status != 'SATISFIABLE':
+        return None
+    return decode_model(encoding, model)
+
+# --- MAIN EXECUTION ---
+if __name__ == "__main__":
+    import argparse
+    import cspGrouping
+
+    parser = argparse.ArgumentParser(description="Encode the timetable CSP as CNF and solve it with a SAT solver.")
+    parser.add_argument('data_folder', help="Folder with the CSV files")
+    parser.add_argument('--dimacs', default=None, help="Write the CNF to this DIMACS file")
+    parser.add_argument('--solver', default=None, help="pycosat, kissat, cadical, minisat or glucose")
+    parser.add_argument('--no-solve', action='store_true', help="Only write the DIMACS file")
+    args = parser.parse_args()
+
+    from cspCache import load_problem
+    problem, data = load_problem(args.data_folder)
+    if problem is None:
+        raise SystemExit("❌ Failed to load CSV data.")
+    variables, domains, _, _ = problem
+
+    start = time.perf_counter()
+    encoding = encode_csp(variables, domains, cspGrouping.VAR_METADATA)
+    print(f"✅ Encoded {len(variables)} variables as {encoding.n_vars} Boolean variables, "
+          f"{encoding.n_clauses} clauses in {time.perf_counter() - start:.2f}s")
+    if args.dimacs:
+        write_dimacs(encoding, args.dimacs)
+        print(f"✅ DIMACS written to '{args.dimacs}'")
+    if not args.no_solve:
+        status, model = solve_sat(encoding, solver=args.solver)
+        print(f" -> Solver status: {status}")
+        if status == 'SATISFIABLE':
+            from cspValidate import validate_schedule, format_report
+            schedule = decode_model(encoding, model)
+            data = data or cspGrouping.load_data_from_csv(args.data_folder)  # Not parsed on a cache hit
+            print(format_report(validate_schedule(schedule, data, cspGrouping.VAR_METADATA, variables)))
+            cspGrouping.display_and_save_timetable(schedule, data, show_gui=False)
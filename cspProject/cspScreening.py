@@ -0,0 +1,136 @@
+#
+# Intelligent Systems Project 1:
+# Pre-solve feasibility screening by resource counting.
+#
+# Runs on the domains produced by setup_csp, before AC-3 and search. Every
+# check is a Hall-style count: a group of sessions that can only use a given
+# set of resources needs at least as many distinct (timeslot, resource) slots
+# as it has sessions. A failing check names the overloaded resource, so an
+# impossible dataset is reported in milliseconds instead of after a long,
+# fruitless backtracking run.
+#
+#   domain       a session has no value at all
+#   rooms        sessions restricted to a room tier vs. its (timeslot, room) pairs
+#   instructors  sessions restricted to an instructor set vs. their allowed slots
+#   section      sessions of one section vs. the timeslots open to them
+#
+
+import time
+
+# --- 1. PER-SESSION RESOURCE SETS ---
+
+def _session_resources(variables, domains):
+    """For each variable: (timeslots, rooms, instructors, room pairs, instructor pairs)."""
+    resources = {}
+    for var in variables:
+        values = domains.get(var) or []
+        resources[var] = (
+            {t for t, _, _ in values},
+            frozenset(r for _, r, _ in values),
+            frozenset(i for _, _, i in values),
+            {(t, r) for t, r, _ in values},
+            {(t, i) for t, _, i in values},
+        )
+    return resources
+
+def _hall_check(kind, variables, resources, set_index, pair_index, describe):
+    """
+    For every distinct resource set R used by some session, counts the sessions
+    whose resources are a subset of R and compares them with the distinct
+    (timeslot, resource) pairs those sessions can reach.
+    """
+    violations = []
+    tiers = {}
+    for var in variables:
+        tiers.setdefault(resources[var][set_index], []).append(var)
+
+    for tier in sorted(tiers, key=len):
+        if not tier:
+            continue
+        members = [var for resource_set, tier_vars in tiers.items()
+                   if resource_set and resource_set <= tier for var in tier_vars]
+        available = set()
+        for var in members:
+            available |= resources[var][pair_index]
+        if len(members) > len(available):
+            violations.append({
+                'kind': kind,
+                'resource': describe(tier),
+                'required': len(members),
+                'available': len(available),
+                'variables': sorted(members),
+            })
+    return violations
+
+def _describe_set(resource_set, limit=5):
+    names = sorted(resource_set)
+    if len(names) > limit:
+        return ', '.join(names[:limit]) + f" (+{len(names) - limit} more)"
+    return ', '.join(names)
+
+# --- 2. SCREENING ---
+
+def screen_feasibility(variables, domains, var_metadata=None):
+    """
+    Runs every counting check and returns a report dict:
+    {'feasible': bool, 'violations': [...], 'seconds': float}.
+    Each violation has kind, resource, required, available and variables.
+    """
+    from cspGrouping import get_sections_from_var
+
+    start = time.perf_counter()
+    var_metadata = var_metadata or {}
+    violations = []
+
+    for var in variables:
+        if not domains.get(var):
+            violations.append({'kind': 'domain', 'resource': var, 'required': 1,
+                               'available': 0, 'variables': [var]})
+
+    resources = _session_resources(variables, domains)
+    violations += _hall_check('rooms', variables, resources, 1, 3,
+                              lambda rooms: f"rooms {_describe_set(rooms)}")
+    violations += _hall_check('instructors', variables, resources, 2, 4,
+                              lambda instructors: f"instructor {_describe_set(instructors)}")
+
+    section_vars = {}
+    for var in variables:
+        sections = var_metadata.get(var, {}).get('sections') or get_sections_from_var(var)
+        for section in sections:
+            section_vars.setdefault(section, []).append(var)
+    for section in sorted(section_vars):
+        members = section_vars[section]
+        timeslots = set()
+        for var in members:
+            timeslots |= resources[var][0]
+        if len(members) > len(timeslots):
+            violations.append({
+                'kind': 'section',
+                'resource': f"section {section}",
+                'required': len(members),
+                'available': len(timeslots),
+                'variables': sorted(members),
+            })
+
+    return {
+        'feasible': not violations,
+        'violations': violations,
+        'seconds': round(time.perf_counter() - start, 6),
+    }
+
+def format_report(report, limit=10):
+    """Human-readable lines for the CLI and server logs."""
+    if report['feasible']:
+        return f"✅ Screening passed in {report['seconds'] * 1000:.1f} ms."
+    lines = [f"🔴 Screening found {len(report['violations'])} overloaded resource(s) "
+             f"in {report['seconds'] * 1000:.1f} ms:"]
+    for violation in report['violations'][:limit]:
+        if violation['kind'] == 'domain':
+            lines.append(f"  -> [{violation['resource']}] has an empty domain.")
+        else:
+            lines.append(f"  -> [{violation['kind']}] {violation['resource']}: "
+                         f"{violation['required']} sessions need it but only "
+                         f"{violation['available']} slots are available.")
+    if len(report['violations']) > limit:
+        lines.append(f"  -> ... and {len(report['violations']) - limit} more.")
+    return '\n'.join(lines)
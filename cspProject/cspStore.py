@@ -0,0 +1,298 @@
+#
+# Intelligent Systems Project 1:
+# SQLite dataset store: one-time CSV import, indexed lookups, row edits.
+#
+# The five CSVs are imported once into a local SQLite file (by default
+# <data folder>/.csp_cache/dataset.sqlite, next to the compiled problem
+# cache). The comma-separated columns are also split into link tables so
+# the common lookups are index scans instead of pandas string searches:
+#
+#   course_instructors    CourseID <-> InstructorID   (Instructor.QualifiedCourses)
+#   section_courses       SectionID <-> CourseID      (Sections.Courses)
+#
+# Single-row edits (upsert_row / delete_row) update the link tables and bump
+# a version number, so readers only rebuild what they cached when the data
+# really changed. Rows keep their CSV order (rowid), so load_dataset()
+# returns the same DataFrames as load_data_from_csv.
+#
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from cspCache import hash_source_files
+
+# Table -> (primary key, columns in CSV order, INTEGER columns)
+TABLES = {
+    'courses': ('CourseID', ['CourseID', 'CourseName', 'Credits', 'Type'], {'Credits'}),
+    'instructors': ('InstructorID', ['InstructorID', 'Name', 'Role', 'PreferredSlots', 'QualifiedCourses'], set()),
+    'rooms': ('RoomID', ['RoomID', 'Type', 'Capacity'], {'Capacity'}),
+    'timeslots': ('TimeSlotID', ['Day', 'StartTime', 'EndTime', 'TimeSlotID'], set()),
+    'sections': ('SectionID', ['SectionID', 'StudentCount', 'Courses'], {'StudentCount'}),
+}
+
+# Table -> (link table, list column that feeds it, link column)
+LINKS = {
+    'instructors': ('course_instructors', 'QualifiedCourses', 'CourseID'),
+    'sections': ('section_courses', 'Courses', 'CourseID'),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS course_instructors (
+    CourseID TEXT NOT NULL, InstructorID TEXT NOT NULL, PRIMARY KEY (CourseID, InstructorID));
+CREATE INDEX IF NOT EXISTS idx_course_instructors_instructor ON course_instructors (InstructorID);
+CREATE TABLE IF NOT EXISTS section_courses (
+    SectionID TEXT NOT NULL, CourseID TEXT NOT NULL, PRIMARY KEY (SectionID, CourseID));
+CREATE INDEX IF NOT EXISTS idx_section_courses_course ON section_courses (CourseID);
+"""
+
+def default_db_path(folder_path):
+    return os.path.join(folder_path, '.csp_cache', 'dataset.sqlite')
+
+def _split_list(value):
+    return [item.strip() for item in str(value or '').split(',') if item.strip()]
+
+# --- 1. CONNECTION POOL ---
+
+class ConnectionPool:
+    """
+    A fixed number of SQLite connections shared between threads. WAL mode
+    lets readers run while a writer commits.
+    """
+
+    def __init__(self, path, size=4):
+        self.path = path
+        self._idle = queue.LifoQueue()
+        for _ in range(size):
+            conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._idle.put(conn)
+        self.size = size
+
+    @contextmanager
+    def connection(self):
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        for _ in range(self.size):
+            self._idle.get().close()
+
+# --- 2. STORE ---
+
+class DatasetStore:
+    """Indexed access to one dataset in SQLite."""
+
+    def __init__(self, path, pool_size=4):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.pool = ConnectionPool(path, pool_size)
+        self._write_lock = threading.Lock()
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+            for table, (key, columns, integers) in TABLES.items():
+                definitions = ', '.join(
+                    f'"{col}" {"INTEGER" if col in integers else "TEXT"}{" PRIMARY KEY" if col == key else ""}'
+                    for col in columns)
+                conn.execute(f'CREATE TABLE IF NOT EXISTS {table} ({definitions})')
+            conn.commit()
+
+    # ---- meta ----
+
+    def _meta(self, conn, key, default=None):
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else default
+
+    def _set_meta(self, conn, key, value):
+        conn.execute("INSERT INTO meta (key, value) VALUES (?, ?) "
+                     "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, str(value)))
+
+    def version(self):
+        """Increases on every import and every edit."""
+        with self.pool.connection() as conn:
+            return int(self._meta(conn, 'version', 0))
+
+    def source_hash(self):
+        with self.pool.connection() as conn:
+            return self._meta(conn, 'source_hash')
+
+    # ---- import ----
+
+    def import_dataset(self, data, source_hash=None):
+        """Replaces the stored tables with the DataFrames from load_data_from_csv."""
+        with self._write_lock, self.pool.connection() as conn:
+            with conn:
+                for table, (key, columns, _) in TABLES.items():
+                    conn.execute(f'DELETE FROM {table}')
+                    frame = data[table]
+                    present = [col for col in columns if col in frame.columns]
+                    rows = [tuple(None if _is_missing(value) else _plain(value) for value in record)
+                            for record in frame[present].itertuples(index=False, name=None)]
+                    placeholders = ', '.join('?' for _ in present)
+                    names = ', '.join(f'"{col}"' for col in present)
+                    conn.executemany(f'INSERT OR REPLACE INTO {table} ({names}) VALUES ({placeholders})', rows)
+                for table, (link, source, _) in LINKS.items():
+                    conn.execute(f'DELETE FROM {link}')
+                    key = TABLES[table][0]
+                    for row in conn.execute(f'SELECT "{key}", "{source}" FROM {table}').fetchall():
+                        self._write_links(conn, table, row[0], row[1])
+                self._set_meta(conn, 'source_hash', source_hash or '')
+                self._set_meta(conn, 'version', int(self._meta(conn, 'version', 0)) + 1)
+
+    def sync_from_csv(self, folder_path, force=False):
+        """
+        Imports the CSVs if the store is empty or the CSV files changed since
+        the last import. Returns True if an import happened.
+        """
+        source_hash, _ = hash_source_files(folder_path)
+        if not force and self.source_hash() == source_hash:
+            return False
+        import cspGrouping
+        data = cspGrouping.load_data_from_csv(folder_path)
+        if not data:
+            raise ValueError(f"Could not load the CSV files from '{folder_path}'.")
+        self.import_dataset(data, source_hash)
+        print(f"✅ Imported '{folder_path}' into '{self.path}'")
+        return True
+
+    # ---- reads ----
+
+    def load_dataset(self):
+        """Returns the same dict of DataFrames as load_data_from_csv, link tables included."""
+        import pandas as pd
+        data = {}
+        with self.pool.connection() as conn:
+            for table, (_, columns, _) in TABLES.items():
+                names = ', '.join(f'"{col}"' for col in columns)
+                data[table] = pd.read_sql_query(f'SELECT {names} FROM {table} ORDER BY rowid', conn)
+            for table, (link, _, link_column) in LINKS.items():
+                own_column = TABLES[table][0]
+                data[link] = pd.read_sql_query(
+                    f'SELECT "{own_column}", "{link_column}" FROM {link} ORDER BY rowid', conn)
+        return data
+
+    def get_row(self, table, key):
+        primary, _, _ = _table(table)
+        with self.pool.connection() as conn:
+            row = conn.execute(f'SELECT * FROM {table} WHERE "{primary}" = ?', (key,)).fetchone()
+        return dict(row) if row else None
+
+    def qualified_instructors(self, course_id, role_prefix=None):
+        """InstructorIDs qualified for a course, optionally only e.g. 'PROF' or 'AP'."""
+        sql = "SELECT InstructorID FROM course_instructors WHERE CourseID = ?"
+        params = [course_id]
+        if role_prefix:
+            # A literal, case-sensitive prefix like str.startswith in setup (LIKE has wildcards, ignores case)
+            sql += " AND substr(InstructorID, 1, ?) = ?"
+            params += [len(role_prefix), role_prefix]
+        with self.pool.connection() as conn:
+            return [row[0] for row in conn.execute(sql + " ORDER BY InstructorID", params)]
+
+    def courses_of_instructor(self, instructor_id):
+        with self.pool.connection() as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT CourseID FROM course_instructors WHERE InstructorID = ? ORDER BY CourseID",
+                (instructor_id,))]
+
+    def sections_of_course(self, course_id):
+        with self.pool.connection() as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT SectionID FROM section_courses WHERE CourseID = ? ORDER BY SectionID", (course_id,))]
+
+    def courses_of_section(self, section_id):
+        with self.pool.connection() as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT CourseID FROM section_courses WHERE SectionID = ? ORDER BY CourseID", (section_id,))]
+
+    # ---- single-row edits ----
+
+    def upsert_row(self, table, row):
+        """Inserts or updates one row (a dict with at least the primary key)."""
+        primary, columns, integers = _table(table)
+        if row.get(primary) in (None, ''):
+            raise ValueError(f"{table} rows need a '{primary}'.")
+        unknown = set(row) - set(columns)
+        if unknown:
+            raise ValueError(f"Unknown {table} column(s): {', '.join(sorted(unknown))}")
+        values = {col: (int(value) if col in integers and value not in (None, '') else value)
+                  for col, value in row.items()}
+        names = ', '.join(f'"{col}"' for col in values)
+        placeholders = ', '.join('?' for _ in values)
+        updates = ', '.join(f'"{col}" = excluded."{col}"' for col in values if col != primary)
+        sql = f'INSERT INTO {table} ({names}) VALUES ({placeholders}) ON CONFLICT("{primary}") '
+        sql += f'DO UPDATE SET {updates}' if updates else 'DO NOTHING'
+        with self._write_lock, self.pool.connection() as conn:
+            with conn:
+                conn.execute(sql, list(values.values()))
+                if table in LINKS:
+                    source = LINKS[table][1]
+                    current = conn.execute(f'SELECT "{source}" FROM {table} WHERE "{primary}" = ?',
+                                           (values[primary],)).fetchone()[0]
+                    self._write_links(conn, table, values[primary], current)
+                self._set_meta(conn, 'version', int(self._meta(conn, 'version', 0)) + 1)
+
+    def delete_row(self, table, key):
+        """Deletes one row. Returns False if it did not exist."""
+        primary, _, _ = _table(table)
+        with self._write_lock, self.pool.connection() as conn:
+            with conn:
+                deleted = conn.execute(f'DELETE FROM {table} WHERE "{primary}" = ?', (key,)).rowcount
+                if table in LINKS:
+                    self._write_links(conn, table, key, None)
+                if deleted:
+                    self._set_meta(conn, 'version', int(self._meta(conn, 'version', 0)) + 1)
+        return bool(deleted)
+
+    def _write_links(self, conn, table, key, list_value):
+        link, _, link_column = LINKS[table]
+        own_column = TABLES[table][0]
+        conn.execute(f'DELETE FROM {link} WHERE "{own_column}" = ?', (key,))
+        conn.executemany(f'INSERT OR IGNORE INTO {link} ("{own_column}", "{link_column}") VALUES (?, ?)',
+                         [(key, item) for item in _split_list(list_value)])
+
+    def close(self):
+        self.pool.close()
+
+def _table(table):
+    if table not in TABLES:
+        raise ValueError(f"Unknown table '{table}'. Use one of {', '.join(TABLES)}.")
+    return TABLES[table]
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and value != value)
+
+def _plain(value):
+    """numpy scalars -> Python scalars, which sqlite3 can bind."""
+    return value.item() if hasattr(value, 'item') else value
+
+# --- 3. ENTRY POINT ---
+
+def open_store(folder_path, db_path=None, pool_size=4):
+    """Opens (creating and importing on first use) the store for a CSV folder."""
+    store = DatasetStore(db_path or default_db_path(folder_path), pool_size)
+    store.sync_from_csv(folder_path)
+    return store
+
+# --- MAIN EXECUTION ---
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python cspStore.py <data folder> [database path]")
+    folder = sys.argv[1]
+    store = DatasetStore(sys.argv[2] if len(sys.argv) > 2 else default_db_path(folder))
+    store.sync_from_csv(folder, force=True)
+    start = time.perf_counter()
+    dataset = store.load_dataset()
+    print(f" -> Loaded {', '.join(f'{len(frame)} {name}' for name, frame in dataset.items())} "
+          f"in {(time.perf_counter() - start) * 1000:.1f} ms (version {store.version()})")
@@ -0,0 +1,195 @@
+#
+# Intelligent Systems Project 1:
+# Symmetry detection and breaking for interchangeable sections.
+#
+# Sections with the same course list and student count produce variables
+# with identical domains. Swapping two such sections everywhere (every lab,
+# and every grouped lecture they appear in) maps solutions to solutions.
+# Swapping a single lab variable is NOT a symmetry, because each section's
+# other sessions pin its timeslots, so symmetries are section permutations:
+#
+#   pair swap     two sections grouped in the same lectures   (S1 <-> S2)
+#   group swap    two lecture groups, member by member        ((S1,S2) <-> (S3,S4))
+#   solo swap     two sections with no grouped lectures
+#
+# Every candidate is checked exactly (each variable must map to a variable
+# with the same domain) before it is used. Each symmetry sigma then gets a
+# lex-leader constraint on the first variable v it moves (in setup order):
+# value(v) < value(sigma(v)). Values of two different variables are never
+# equal in a solution (the room would be double-booked), so this one
+# comparison is the whole lex constraint. Only the lexicographically
+# smallest member of each class of symmetric solutions survives;
+# expand_solution() regenerates the others.
+#
+
+from collections import deque
+
+from cspGrouping import get_sections_from_var
+
+# --- 1. DETECTION ---
+
+def _var_key(var, sections):
+    parts = var.split('_')
+    return (parts[0], parts[1], frozenset(sections))
+
+def _sections_of(var, var_metadata):
+    return var_metadata.get(var, {}).get('sections') or get_sections_from_var(var)
+
+class SectionSymmetry:
+    """A permutation of section IDs together with the variable permutation it induces."""
+
+    def __init__(self, name, mapping, var_map):
+        self.name = name
+        self.mapping = mapping   # section -> section
+        self.var_map = var_map   # variable -> variable (only moved ones)
+
+    def __repr__(self):
+        return f"SectionSymmetry({self.name})"
+
+    def apply(self, schedule):
+        """The symmetric schedule: sigma(v) gets the value v had."""
+        return {self.var_map.get(var, var): value for var, value in schedule.items()}
+
+def _induced_var_map(mapping, variables, domains, by_key, var_metadata):
+    """Variable permutation induced by a section permutation, or None if it is not a symmetry."""
+    var_map = {}
+    for var in variables:
+        sections = _sections_of(var, var_metadata)
+        if not any(section in mapping for section in sections):
+            continue
+        key = _var_key(var, sections)
+        image_key = (key[0], key[1], frozenset(mapping.get(s, s) for s in sections))
+        image = by_key.get(image_key)
+        if image is None or domains[image] != domains[var]:
+            return None
+        if image != var:
+            var_map[var] = image
+    return var_map or None
+
+def find_section_symmetries(variables, domains, var_metadata=None):
+    """Returns the verified pair, group and solo section swaps as SectionSymmetry objects."""
+    var_metadata = var_metadata or {}
+    by_key, section_vars = {}, {}
+    for var in variables:
+        sections = _sections_of(var, var_metadata)
+        by_key[_var_key(var, sections)] = var
+        for section in sections:
+            section_vars.setdefault(section, []).append(var)
+
+    # Cheap signature to find candidates: which kinds of session a section
+    # takes, how big their groups are and how many values they can take.
+    def signature(section):
+        return tuple(sorted((var.split('_')[0], var.split('_')[1], len(_sections_of(var, var_metadata)),
+                             len(domains[var])) for var in section_vars[section]))
+
+    lecture_groups = {}
+    for var in variables:
+        sections = _sections_of(var, var_metadata)
+        if len(sections) > 1:
+            lecture_groups.setdefault(tuple(sorted(sections)), None)
+    grouped = {section for group in lecture_groups for section in group}
+
+    candidates = []
+    for group in lecture_groups:
+        for a, b in zip(group, group[1:]):
+            if signature(a) == signature(b):
+                candidates.append((f"{a}<->{b}", {a: b, b: a}))
+
+    groups_by_signature = {}
+    for group in lecture_groups:
+        groups_by_signature.setdefault(tuple(signature(s) for s in group), []).append(group)
+    for same in groups_by_signature.values():
+        for g1, g2 in zip(same, same[1:]):
+            if set(g1) & set(g2):
+                continue
+            mapping = dict(zip(g1, g2))
+            mapping.update(zip(g2, g1))
+            candidates.append((f"({','.join(g1)})<->({','.join(g2)})", mapping))
+
+    solos_by_signature = {}
+    for section in sorted(section_vars):
+        if section not in grouped:
+            solos_by_signature.setdefault(signature(section), []).append(section)
+    for same in solos_by_signature.values():
+        for a, b in zip(same, same[1:]):
+            candidates.append((f"{a}<->{b}", {a: b, b: a}))
+
+    symmetries = []
+    for name, mapping in candidates:
+        var_map = _induced_var_map(mapping, variables, domains, by_key, var_metadata)
+        if var_map:
+            symmetries.append(SectionSymmetry(name, mapping, var_map))
+    return symmetries
+
+# --- 2. BREAKING ---
+
+def symmetry_ordering(variables, symmetries):
+    """Lex-leader pairs (v, w) meaning value(v) < value(w), one per symmetry."""
+    position = {var: n for n, var in enumerate(variables)}
+    pairs = []
+    for symmetry in symmetries:
+        first = min(symmetry.var_map, key=position.__getitem__)
+        pairs.append((first, symmetry.var_map[first]))
+    return pairs
+
+class OrderingPropagator:
+    """
+    Bounds filtering for value(smaller) < value(larger). Has the same
+    interface as cspGlobal.AllDifferentPropagator, so it can be passed to
+    ac3() and propagate_global().
+    """
+
+    def __init__(self, smaller, larger):
+        self.name = f"{smaller} < {larger}"
+        self.variables = [smaller, larger]
+        self.variable_set = frozenset(self.variables)
+        self.smaller, self.larger = smaller, larger
+
+    def propagate(self, domains):
+        low, high = domains[self.smaller], domains[self.larger]
+        if not low or not high:
+            return False, set()
+        changed = set()
+        top = max(high)
+        if max(low) >= top:
+            domains[self.smaller] = [value for value in low if value < top]
+            changed.add(self.smaller)
+        bottom = min(domains[self.smaller] or [top])
+        if min(high) <= bottom:
+            domains[self.larger] = [value for value in high if value > bottom]
+            changed.add(self.larger)
+        if not domains[self.smaller] or not domains[self.larger]:
+            return False, changed
+        return True, changed
+
+def ordering_propagators(pairs):
+    return [OrderingPropagator(smaller, larger) for smaller, larger in pairs]
+
+# --- 3. EXPANDING ---
+
+def expand_solution(solution, symmetries, limit=None):
+    """
+    Yields the solution and every distinct schedule reachable from it by the
+    symmetries (breadth-first), i.e. the other members of its symmetry class.
+    """
+    seen = {frozenset(solution.items())}
+    queue = deque([solution])
+    produced = 0
+    while queue:
+        current = queue.popleft()
+        yield current
+        produced += 1
+        if limit is not None and produced >= limit:
+            return
+        for symmetry in symmetries:
+            image = symmetry.apply(current)
+            key = frozenset(image.items())
+            if key not in seen:
+                seen.add(key)
+                queue.append(image)
+
+def summarize(symmetries):
+    kinds = {'pair/solo swaps': 0, 'group swaps': 0}
+    for symmetry in symmetries:
+        kinds['group swaps' if symmetry.name.startswith('(') else 'pair/solo swaps'] += 1
+    return kinds
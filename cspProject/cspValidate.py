@@ -0,0 +1,170 @@
+#
+# Intelligent Systems Project 1:
+# Independent, linear-time schedule validator.
+#
+# Checks a complete schedule against the dataset itself, not against the
+# solver's domains, so a bug in setup, propagation or any engine shows up as
+# a violation instead of a silently wrong timetable. One pass over the
+# sessions with hash maps keyed on (timeslot, resource) finds every clash:
+#
+#   room_clash          two sessions in one room at the same time
+#   instructor_clash    an instructor teaching two sessions at the same time
+#   section_clash       a section attending two sessions at the same time
+#   capacity            the room is smaller than the sections' student count
+#   room_type           lecture in a lab room or lab in a lecture room
+#   qualification       the instructor is not qualified for the course
+#   role                lectures need a professor (PROF*), labs an assistant (AP*)
+#   forbidden_day       the instructor asked not to teach on that day
+#   unknown             timeslot, room, instructor, section or course not in the data
+#   missing             a required session is not scheduled (when `variables` is given)
+#
+
+import time
+
+ROLE_PREFIX = {'Lecture': 'PROF', 'Lab': 'AP'}
+
+# --- 1. RULES FROM THE DATASET ---
+
+def _split_list(value):
+    return {item.strip() for item in str(value if value is not None else '').split(',') if item.strip()}
+
+def build_rules(data):
+    """Plain-dict lookups for validate_schedule, built once per dataset."""
+    slot_day = {row['TimeSlotID']: row['Day'] for row in data['timeslots'].to_dict('records')}
+    rooms = {row['RoomID']: (row['Type'], row['Capacity']) for row in data['rooms'].to_dict('records')}
+    sections = {row['SectionID']: row['StudentCount'] for row in data['sections'].to_dict('records')}
+    courses = set(data['courses']['CourseID'])
+    instructors = {}
+    for row in data['instructors'].to_dict('records'):
+        pref = str(row.get('PreferredSlots', 'Anytime'))
+        forbidden = pref.split("Not on ")[-1].strip() if "Not on" in pref else None
+        instructors[row['InstructorID']] = (_split_list(row.get('QualifiedCourses')), forbidden)
+    return {'slot_day': slot_day, 'rooms': rooms, 'sections': sections,
+            'courses': courses, 'instructors': instructors}
+
+# --- 2. VALIDATION ---
+
+def validate_schedule(schedule, data=None, var_metadata=None, variables=None, rules=None):
+    """
+    Validates {variable: (TimeSlotID, RoomID, InstructorID)} and returns
+    {'valid': bool, 'violations': [...], 'sessions': int, 'seconds': float}.
+    Each violation has kind, variables, detail and the resource involved.
+    Pass `rules` (build_rules) to skip rebuilding the lookups per call.
+    """
+    from cspGrouping import get_sections_from_var
+
+    start = time.perf_counter()
+    rules = rules or build_rules(data)
+    var_metadata = var_metadata or {}
+    slot_day, rooms, section_sizes = rules['slot_day'], rules['rooms'], rules['sections']
+    courses, instructors = rules['courses'], rules['instructors']
+
+    violations = []
+    room_use, instructor_use, section_use = {}, {}, {}
+
+    def clash(kind, used, key, var, resource):
+        first = used.setdefault(key, var)
+        if first != var:
+            violations.append({'kind': kind, 'variables': [first, var], 'resource': resource,
+                               'timeslot': key[0], 'detail': f"{first} and {var} both use {resource} at {key[0]}"})
+
+    for var, (time_id, room_id, instructor_id) in schedule.items():
+        parts = var.split('_')
+        course_id, session_type = parts[0], parts[1] if len(parts) > 1 else ''
+        sections = var_metadata.get(var, {}).get('sections') or get_sections_from_var(var)
+
+        def violation(kind, resource, detail):
+            violations.append({'kind': kind, 'variables': [var], 'resource': resource,
+                               'timeslot': time_id, 'detail': detail})
+
+        day = slot_day.get(time_id)
+        if day is None:
+            violation('unknown', time_id, f"{var} uses unknown timeslot {time_id}")
+        clash('room_clash', room_use, (time_id, room_id), var, room_id)
+        clash('instructor_clash', instructor_use, (time_id, instructor_id), var, instructor_id)
+        for section in sections:
+            clash('section_clash', section_use, (time_id, section), var, section)
+
+        if course_id not in courses:
+            violation('unknown', course_id, f"{var} is for unknown course {course_id}")
+
+        room = rooms.get(room_id)
+        if room is None:
+            violation('unknown', room_id, f"{var} uses unknown room {room_id}")
+        else:
+            room_type, capacity = room
+            if room_type != session_type:
+                violation('room_type', room_id, f"{session_type} {var} is in {room_type.lower()} room {room_id}")
+            students = 0
+            for section in sections:
+                if section not in section_sizes:
+                    violation('unknown', section, f"{var} covers unknown section {section}")
+                else:
+                    students += section_sizes[section]
+            if students > capacity:
+                violation('capacity', room_id, f"{var} has {students} students but {room_id} seats {capacity}")
+
+        instructor = instructors.get(instructor_id)
+        if instructor is None:
+            violation('unknown', instructor_id, f"{var} uses unknown instructor {instructor_id}")
+        else:
+            qualified, forbidden_day = instructor
+            if course_id not in qualified:
+                violation('qualification', instructor_id, f"{instructor_id} is not qualified for {course_id}")
+            prefix = ROLE_PREFIX.get(session_type)
+            if prefix and not str(instructor_id).startswith(prefix):
+                violation('role', instructor_id, f"{session_type} {var} needs a {prefix}* instructor, "
+                                                 f"got {instructor_id}")
+            if forbidden_day is not None and day == forbidden_day:
+                violation('forbidden_day', instructor_id, f"{instructor_id} does not teach on {day}")
+
+    if variables is not None:
+        for var in variables:
+            if var not in schedule:
+                violations.append({'kind': 'missing', 'variables': [var], 'resource': var,
+                                   'timeslot': None, 'detail': f"{var} is not scheduled"})
+
+    return {
+        'valid': not violations,
+        'violations': violations,
+        'sessions': len(schedule),
+        'seconds': round(time.perf_counter() - start, 6),
+    }
+
+def summarize(report):
+    """{kind: count} of the violations."""
+    counts = {}
+    for violation in report['violations']:
+        counts[violation['kind']] = counts.get(violation['kind'], 0) + 1
+    return counts
+
+def format_report(report, limit=10):
+    """Human-readable lines for the CLI and server logs."""
+    if report['valid']:
+        return f"✅ Validated {report['sessions']} sessions in {report['seconds'] * 1000:.1f} ms: no violations."
+    lines = [f"🔴 Validation found {len(report['violations'])} violation(s) in {report['sessions']} sessions "
+             f"({', '.join(f'{kind}: {n}' for kind, n in summarize(report).items())}):"]
+    for violation in report['violations'][:limit]:
+        lines.append(f"  -> [{violation['kind']}] {violation['detail']}")
+    if len(report['violations']) > limit:
+        lines.append(f"  -> ... and {len(report['violations']) - limit} more.")
+    return '\n'.join(lines)
+
+# --- MAIN EXECUTION ---
+if __name__ == "__main__":
+    import sys
+    import cspGrouping
+    from cspExport import read_schedule_csv
+
+    if len(sys.argv) < 3:
+        sys.exit("Usage: python cspValidate.py <data folder> <timetable_output.csv>")
+    dataset = cspGrouping.load_data_from_csv(sys.argv[1])
+    if not dataset:
+        sys.exit("❌ Failed to load CSV data.")
+    try:
+        loaded = read_schedule_csv(sys.argv[2])
+    except (OSError, ValueError) as e:
+        sys.exit(f"❌ {e}")
+    result = validate_schedule(loaded, dataset)
+    print(format_report(result))
+    sys.exit(0 if result['valid'] else 1)
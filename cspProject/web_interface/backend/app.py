@@ -1,7 +1,14 @@
 
 import sys
 import os
-import pandas as pd
+import re
+import gzip
+import json
+import hashlib
+import uuid
+import itertools
+import threading
+from collections import OrderedDict
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 
@@ -11,85 +18,448 @@ parent_dir = os.path.dirname(os.path.dirname(current_dir))
 sys.path.append(parent_dir)
 
 import cspGrouping
+from cspStore import open_store, TABLES
+from cspQuery import TimetableIndex, FILTERS
+from cspValidate import validate_schedule, build_rules
+
+try:
+    import brotli  # Optional: br responses when installed
+except ImportError:
+    brotli = None
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for React frontend
 
-CSV_FOLDER_PATH = r"E:\CSP_data"
+# Data folder and SQLite store location (CSP_DB_PATH defaults to <folder>/.csp_cache/dataset.sqlite)
+CSV_FOLDER_PATH = os.environ.get('CSP_DATA_DIR', r"E:\CSP_data")
+DB_PATH = os.environ.get('CSP_DB_PATH') or None
+
+# SQLite store (pooled connections) and the DataFrames built from it, shared
+# by all requests and rebuilt only when the store version changes
+STORE = None
+DATASET = {"version": None, "data": None, "key": None}
+DATASET_LOCK = threading.Lock()
+
+def _store():
+    global STORE
+    with DATASET_LOCK:
+        if STORE is None:
+            STORE = open_store(CSV_FOLDER_PATH, DB_PATH)
+        return STORE
+
+def _dataset_entry():
+    """
+    (DataFrames, cache key) of the current dataset, loaded from the store once
+    per version. The key (CSV hash + store version) names its compiled setup in cspCache.
+    """
+    store = _store()
+    version = store.version()
+    with DATASET_LOCK:
+        if DATASET["version"] != version:
+            DATASET.update(version=version, data=store.load_dataset(), key=f"{store.source_hash()}:v{version}")
+        return DATASET["data"], DATASET["key"]
+
+def _dataset():
+    return _dataset_entry()[0]
+
+def _setup(dataset, key):
+    """setup_csp through the compiled cache (<data folder>/.csp_cache), as solve_timetable does."""
+    from cspCache import load_or_compile_problem
+    return load_or_compile_problem(CSV_FOLDER_PATH, dataset=dataset, source_hash=key)
+
+# cspGrouping keeps the problem being solved (VAR_METADATA) and its METRICS in
+# module globals, and Flask serves requests on threads: everything that sets up,
+# solves or searches holds this lock, so requests take turns instead of
+# overwriting each other's state
+SOLVE_LOCK = threading.Lock()
+
+# Metrics of the most recent solve (a snapshot dict), served by /metrics
+LAST_METRICS = {"solves": 0, "last": None}
+
+def _record_metrics(metrics):
+    LAST_METRICS["solves"] += 1
+    LAST_METRICS["last"] = metrics
+
+# Prepared problem for /api/solutions: dataset, variables, AC-3 pruned domains
+# and its own copy of the session metadata
+PROBLEM = {}
+PROBLEM_LOCK = threading.Lock()
+
+# Open solution streams: cursor -> {'generator', 'produced', 'lock'}, oldest first
+SOLUTION_STREAMS = OrderedDict()
+STREAMS_LOCK = threading.Lock()
+MAX_STREAMS = 16
+MAX_PAGE_SIZE = 50
+
+# Wall-clock limit for the whole /api/solve pipeline (setup, AC-3 and search share
+# it; anytime mode returns a partial timetable when it runs out instead of
+# hanging) and the last partial schedule, used as the next warm start
+# while the dataset key (store version) it was solved on is still current
+SOLVE_SECONDS = float(os.environ.get('CSP_SOLVE_SECONDS', 60))
+LAST_PARTIAL = {"key": None, "schedule": None}
+
+# Wall-clock budget of the opt-in conflict explanation (/api/solve?explain=section|course)
+EXPLAIN_SECONDS = float(os.environ.get('CSP_EXPLAIN_SECONDS', 10))
+
+# Indexes over the last solved timetable, served by /api/timetable
+TIMETABLE = {"index": None}
+MAX_TIMETABLE_PAGE = 500
+
+# Compressed bodies by (etag, encoding), so repeated page views skip gzip/brotli
+ENCODED_BODIES = OrderedDict()
+ENCODED_LOCK = threading.Lock()
+MAX_ENCODED_BODIES = 256
+MIN_COMPRESS_BYTES = 512
+
+def _conditional_json(etag, build_body):
+    """
+    JSON response with an ETag. Answers 304 when the client already has
+    `etag`; otherwise builds the body (only then) and compresses it with
+    brotli or gzip as the client accepts.
+    """
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+
+    accepted = request.accept_encodings
+    encoding = None
+    if brotli is not None and accepted['br']:
+        encoding = 'br'
+    elif accepted['gzip']:
+        encoding = 'gzip'
+
+    with ENCODED_LOCK:
+        payload = ENCODED_BODIES.get((etag, encoding))
+        if payload is not None:
+            ENCODED_BODIES.move_to_end((etag, encoding))
+    if payload is None:
+        payload = build_body().encode('utf-8')
+        if encoding and len(payload) < MIN_COMPRESS_BYTES:
+            encoding = None
+        elif encoding == 'br':
+            payload = brotli.compress(payload, quality=5)
+        elif encoding == 'gzip':
+            payload = gzip.compress(payload, compresslevel=6)
+        with ENCODED_LOCK:
+            ENCODED_BODIES[(etag, encoding)] = payload
+            while len(ENCODED_BODIES) > MAX_ENCODED_BODIES:
+                ENCODED_BODIES.popitem(last=False)
+
+    response = app.response_class(payload, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # Always revalidate; 304s are cheap
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+def _format_schedule(schedule, dataset):
+    """Turns a schedule dict into the list of session dicts the frontend renders."""
+    formatted_schedule = []
+
+    # Create lookups (borrowed logic from display_and_save_timetable)
+    timeslots_dict = dataset['timeslots'].set_index('TimeSlotID').to_dict('index')
+    instructors_dict = dataset['instructors'].set_index('InstructorID').to_dict('index')
+
+    for variable, (time_id, room_id, instructor_id) in schedule.items():
+        parts = variable.split('_')
+        course_id = parts[0]
+        var_type = parts[1] # Lecture or Lab
+        
+        sections = cspGrouping.get_sections_from_var(variable)
+        if not sections: continue
+
+        time_details = timeslots_dict.get(time_id)
+        instructor_info = instructors_dict.get(instructor_id)
+        
+        if not time_details or not instructor_info: continue
+
+        formatted_schedule.append({
+            "id": variable + "_" + time_id, # Unique key for React
+            "course": course_id,
+            "type": var_type,
+            "sections": sorted(list(sections)),
+            "instructor": instructor_info.get('Name', 'N/A'),
+            "instructorId": instructor_id,
+            "room": room_id,
+            "day": time_details.get('Day', 'N/A'),
+            "startTime": time_details.get('StartTime', 'N/A'),
+            "endTime": time_details.get('EndTime', 'N/A'),
+            "colorType": "lecture" if var_type == "Lecture" else "lab"
+        })
+    return formatted_schedule
+
+def _prepare_problem():
+    """Prunes the problem once per dataset version; later calls reuse it."""
+    dataset, key = _dataset_entry()
+    with PROBLEM_LOCK:
+        if PROBLEM and PROBLEM['dataset'] is not dataset:
+            # The data was edited: drop the old problem and its solution streams
+            PROBLEM.clear()
+            with STREAMS_LOCK:
+                SOLUTION_STREAMS.clear()
+        if not PROBLEM:
+            with SOLVE_LOCK:
+                variables, domains, constraints, _ = _setup(dataset, key)
+                if any(not d for d in domains.values()):
+                    return None
+                var_metadata = dict(cspGrouping.VAR_METADATA)
+                # One timetable per class of interchangeable-section relabelings
+                from cspSymmetry import find_section_symmetries, symmetry_ordering, ordering_propagators
+                symmetries = find_section_symmetries(variables, domains, var_metadata)
+                ordering = symmetry_ordering(variables, symmetries)
+                propagators = cspGrouping.build_alldiff_propagators(variables, var_metadata)
+                if not cspGrouping.ac3(variables, domains, constraints,
+                                       propagators + ordering_propagators(ordering)):
+                    return None
+            PROBLEM.update(dataset=dataset, variables=variables, domains=domains, ordering=ordering, base=None,
+                           var_metadata=var_metadata, rules=build_rules(dataset))
+        return PROBLEM
+
+def _use_problem(problem):
+    """Points cspGrouping.VAR_METADATA at `problem` before searching it. Hold SOLVE_LOCK."""
+    cspGrouping.VAR_METADATA.clear()
+    cspGrouping.VAR_METADATA.update(problem['var_metadata'])
+
+def _open_stream(problem, min_distance, lock_level):
+    locked = None
+    if lock_level:
+        if problem['base'] is None:
+            with SOLVE_LOCK:
+                _use_problem(problem)
+                problem['base'] = next(cspGrouping.iter_solutions(problem['variables'], problem['domains'],
+                                                                  ordering=problem['ordering']), None)
+        if problem['base'] is None:
+            return None
+        level = re.compile(rf"_L{re.escape(lock_level)}$")
+        locked = {var: value for var, value in problem['base'].items()
+                  if all(level.search(section) for section in cspGrouping.get_sections_from_var(var))}
+
+    cursor = uuid.uuid4().hex
+    stream = {'generator': cspGrouping.iter_solutions(problem['variables'], problem['domains'],
+                                                      locked=locked, min_distance=min_distance,
+                                                      ordering=problem['ordering']),
+              'produced': 0, 'lock': threading.Lock()}
+    with STREAMS_LOCK:
+        SOLUTION_STREAMS[cursor] = stream
+        while len(SOLUTION_STREAMS) > MAX_STREAMS:
+            SOLUTION_STREAMS.popitem(last=False)
+    return cursor
 
 @app.route('/api/solve', methods=['GET'])
 def solve_csp():
     try:
-        # 1. Load Data
-        dataset = cspGrouping.load_data_from_csv(CSV_FOLDER_PATH)
-        if not dataset:
+        # 1-4. Load -> Setup -> AC-3 -> Backtracking
+        # Note: In a real web app, we might want to run this in a background thread/job queue
+        # if it takes too long, but for now we'll run it synchronously.
+        time_limit = float(request.args.get('time_limit', SOLVE_SECONDS))
+        dataset, key = _dataset_entry()
+        if LAST_PARTIAL["key"] != key:
+            # The data was edited since: the old partial timetable no longer applies
+            LAST_PARTIAL.update(key=None, schedule=None)
+        warm_start = LAST_PARTIAL["schedule"] if request.args.get('warm_start', '1') != '0' else None
+        # data=0: only the solution id; the sessions are then read through /api/timetable
+        include_data = request.args.get('data', '1') != '0'
+        with SOLVE_LOCK:
+            result = cspGrouping.solve_timetable(CSV_FOLDER_PATH, dataset=dataset, cache_key=key,
+                                                 time_limit=time_limit, warm_start=warm_start)
+            _record_metrics(result['metrics'])
+
+        if not result['dataset']:
             return jsonify({"error": "Failed to load CSV data. Check server logs."}), 500
 
-        # 2. Setup CSP
-        csp_vars, csp_domains, csp_constraints, empty_reasons = cspGrouping.setup_csp(dataset)
-        
-        # 3. AC-3
-        if not cspGrouping.ac3(csp_vars, csp_domains, csp_constraints):
+        if result.get('validation') and not result['validation']['valid']:
+            # The engine produced a timetable that breaks the rules: a solver bug, not bad data
             return jsonify({
                 "status": "failure",
-                "message": "No solution possible (Inconsistent constraints)."
-            }), 200
+                "message": result['message'],
+                "validation": result['validation'],
+                "metrics": result['metrics']
+            }), 500
 
-        # 4. Backtracking Solver
-        # Note: In a real web app, we might want to run this in a background thread/job queue
-        # if it takes too long, but for now we'll run it synchronously.
-        solver_domains = {var: list(dom) for var, dom in csp_domains.items()}
-        final_schedule = cspGrouping.solve_backtracking(csp_vars, solver_domains, {})
+        if result['status'] == 'partial':
+            # Out of time: hand back what fits so the rest can be placed by hand
+            LAST_PARTIAL.update(key=key, schedule=result['schedule'])
+            formatted_schedule = _format_schedule(result['schedule'], result['dataset'])
+            TIMETABLE["index"] = TimetableIndex(formatted_schedule)
+            response = {
+                "status": "partial",
+                "message": result['message'],
+                "solution": TIMETABLE["index"].solution_id,
+                "unplaced": result['unplaced'],
+                "anytime": result['anytime'],
+                "metrics": result['metrics']
+            }
+            if include_data:
+                response["data"] = formatted_schedule
+            return jsonify(response), 200
 
-        if not final_schedule:
+        if result['status'] != 'success':
+            # QuickXplain is costly: only on request (explain=section|course), within its own budget
+            explanation = None
+            explain = request.args.get('explain', '0')
+            if explain != '0' and result['dataset']:
+                from cspExplain import explain_infeasibility
+                explain_seconds = float(request.args.get('explain_seconds', EXPLAIN_SECONDS))
+                with SOLVE_LOCK:
+                    explanation = explain_infeasibility(
+                        result['dataset'], granularity='course' if explain == 'course' else 'section',
+                        time_limit=explain_seconds)
             return jsonify({
-                "status": "failure", 
-                "message": "No solution found after backtracking."
+                "status": "failure",
+                "message": result['message'],
+                "screening": result.get('screening'),
+                "explanation": explanation,
+                "metrics": result['metrics']
             }), 200
 
+        dataset, final_schedule = result['dataset'], result['schedule']
+        LAST_PARTIAL.update(key=None, schedule=None)
+
         # 5. Format Output for Frontend
-        formatted_schedule = []
-        
-        # Create lookups (borrowed logic from display_and_save_timetable)
-        timeslots_dict = dataset['timeslots'].set_index('TimeSlotID').to_dict('index')
-        instructors_dict = dataset['instructors'].set_index('InstructorID').to_dict('index')
-
-        for variable, (time_id, room_id, instructor_id) in final_schedule.items():
-            parts = variable.split('_')
-            course_id = parts[0]
-            var_type = parts[1] # Lecture or Lab
-            
-            sections = cspGrouping.get_sections_from_var(variable)
-            if not sections: continue
-
-            time_details = timeslots_dict.get(time_id)
-            instructor_info = instructors_dict.get(instructor_id)
-            
-            if not time_details or not instructor_info: continue
-
-            formatted_schedule.append({
-                "id": variable + "_" + time_id, # Unique key for React
-                "course": course_id,
-                "type": var_type,
-                "sections": sorted(list(sections)),
-                "instructor": instructor_info.get('Name', 'N/A'),
-                "room": room_id,
-                "day": time_details.get('Day', 'N/A'),
-                "startTime": time_details.get('StartTime', 'N/A'),
-                "endTime": time_details.get('EndTime', 'N/A'),
-                "colorType": "lecture" if var_type == "Lecture" else "lab"
-            })
+        formatted_schedule = _format_schedule(final_schedule, dataset)
+        TIMETABLE["index"] = TimetableIndex(formatted_schedule)
+
+        response = {
+            "status": "success",
+            "solution": TIMETABLE["index"].solution_id,
+            "validation": {"valid": True, "seconds": result['validation']['seconds']},
+            "metrics": result['metrics']
+        }
+        if include_data:
+            response["data"] = formatted_schedule
+        return jsonify(response)
+
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/solutions', methods=['GET'])
+def list_solutions():
+    """
+    Pages through alternative timetables. Without `cursor` a new stream is
+    opened (options: min_distance, lock_level); pass the returned next_cursor
+    to get the following page. The search resumes where the last page ended.
+    """
+    try:
+        page_size = max(1, min(int(request.args.get('page_size', 5)), MAX_PAGE_SIZE))
+        cursor = request.args.get('cursor')
+
+        problem = _prepare_problem()
+        if problem is None:
+            return jsonify({"error": "The problem could not be prepared (load, setup or AC-3 failed)."}), 500
+
+        if not cursor:
+            cursor = _open_stream(problem, int(request.args.get('min_distance', 1)),
+                                  request.args.get('lock_level'))
+            if cursor is None:
+                return jsonify({"status": "failure", "message": "No base timetable to lock against."}), 200
+
+        with STREAMS_LOCK:
+            stream = SOLUTION_STREAMS.get(cursor)
+            if stream is not None:
+                SOLUTION_STREAMS.move_to_end(cursor)
+        if stream is None:
+            return jsonify({"error": "Unknown or expired cursor."}), 404
+
+        with stream['lock'], SOLVE_LOCK:
+            _use_problem(problem)
+            solutions = list(itertools.islice(stream['generator'], page_size))
+            first_index = stream['produced']
+            stream['produced'] += len(solutions)
+
+        exhausted = len(solutions) < page_size
+        if exhausted:
+            with STREAMS_LOCK:
+                SOLUTION_STREAMS.pop(cursor, None)
 
         return jsonify({
             "status": "success",
-            "data": formatted_schedule
+            "solutions": [{"index": first_index + n, "data": _format_schedule(solution, problem['dataset']),
+                           "violations": validate_schedule(solution, var_metadata=problem['var_metadata'],
+                                                           variables=problem['variables'],
+                                                           rules=problem['rules'])['violations']}
+                          for n, solution in enumerate(solutions)],
+            "next_cursor": None if exhausted else cursor,
         })
 
+    except ValueError as e:
+        return jsonify({"error": f"Invalid parameter: {e}"}), 400
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/timetable', methods=['GET'])
+def timetable_page():
+    """
+    One page of the last solved timetable, filtered by any of section,
+    instructor (ID or name), room, day, level, course and type.
+    Options: page (from 1), page_size. Supports If-None-Match and gzip/br.
+    """
+    index = TIMETABLE["index"]
+    if index is None:
+        return jsonify({"error": "No timetable yet. Call /api/solve first."}), 404
+    try:
+        page = max(1, int(request.args.get('page', 1)))
+        page_size = max(1, min(int(request.args.get('page_size', 50)), MAX_TIMETABLE_PAGE))
+        filters = {name: request.args[name] for name in FILTERS if request.args.get(name)}
+        unknown = set(request.args) - set(FILTERS) - {'page', 'page_size'}
+        if unknown:
+            raise ValueError(f"unknown filter(s) {', '.join(sorted(unknown))}")
+    except ValueError as e:
+        return jsonify({"error": f"Invalid parameter: {e}"}), 400
+
+    query = '&'.join(f"{name}={filters[name]}" for name in sorted(filters))
+    etag = f"{index.solution_id}-{hashlib.sha1(f'{query}|{page}|{page_size}'.encode('utf-8')).hexdigest()[:16]}"
+    return _conditional_json(etag, lambda: index.page_json(filters, page, page_size)[0])
+
+@app.route('/api/timetable/facets', methods=['GET'])
+def timetable_facets():
+    """Filter values of the last solved timetable with their session counts."""
+    index = TIMETABLE["index"]
+    if index is None:
+        return jsonify({"error": "No timetable yet. Call /api/solve first."}), 404
+    return _conditional_json(f"{index.solution_id}-facets",
+                             lambda: json.dumps({"solution": index.solution_id, "total": len(index),
+                                                 "facets": index.facets()}, separators=(',', ':')))
+
+@app.route('/api/data/<table>/<key>', methods=['GET', 'PUT', 'DELETE'])
+def data_row(table, key):
+    """
+    Reads or edits one row of the dataset (courses, instructors, rooms,
+    timeslots, sections). PUT takes a JSON object of column values.
+    """
+    if table not in TABLES:
+        return jsonify({"error": f"Unknown table '{table}'."}), 404
+    try:
+        store = _store()
+        if request.method == 'GET':
+            row = store.get_row(table, key)
+            if row is None:
+                return jsonify({"error": f"No {table} row '{key}'."}), 404
+            return jsonify(row)
+        if request.method == 'DELETE':
+            if not store.delete_row(table, key):
+                return jsonify({"error": f"No {table} row '{key}'."}), 404
+            return jsonify({"status": "deleted", "version": store.version()})
+        row = dict(request.get_json(force=True) or {})
+        row[TABLES[table][0]] = key
+        store.upsert_row(table, row)
+        return jsonify({"status": "saved", "row": store.get_row(table, key), "version": store.version()})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return jsonify(LAST_METRICS)
+
 @app.route('/health', methods=['GET'])
 def health():
     return jsonify({"status": "ok"})
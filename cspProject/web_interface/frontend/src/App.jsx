@@ -1,9 +1,26 @@
-import { useState } from 'react'
+import { useEffect, useState } from 'react'
 import axios from 'axios'
 import './index.css'
 
+// Largest page /api/timetable serves; the grid shows every matching session
+const PAGE_SIZE = 500
+
+// Reads every page of the stored timetable for the given filters. The server
+// filters from its indexes, and the browser revalidates pages by ETag.
+const fetchTimetable = async (filters) => {
+    const params = Object.fromEntries(Object.entries(filters).filter(([, value]) => value))
+    let sessions = []
+    for (let page = 1; ; page++) {
+        const response = await axios.get('/api/timetable', { params: { ...params, page, page_size: PAGE_SIZE } })
+        sessions = sessions.concat(response.data.data)
+        if (page >= response.data.pages) return sessions
+    }
+}
+
 function App() {
+    const [solution, setSolution] = useState(null)
     const [schedule, setSchedule] = useState([])
+    const [facets, setFacets] = useState({})
     const [loading, setLoading] = useState(false)
     const [error, setError] = useState(null)
 
@@ -16,9 +33,14 @@ function App() {
         setError(null)
         try {
             // Use helper if in dev mode to point to port 5000, or rely on proxy
-            const response = await axios.get('/api/solve')
+            // data=0: the sessions come from the paginated /api/timetable instead
+            const response = await axios.get('/api/solve', { params: { data: 0 } })
             if (response.data.status === 'success') {
-                setSchedule(response.data.data)
+                const facetsResponse = await axios.get('/api/timetable/facets')
+                setFacets(facetsResponse.data.facets)
+                setSelectedSection('')
+                setSelectedInstructor('')
+                setSolution(response.data.solution)
             } else {
                 setError(response.data.message || 'Failed to generate schedule')
             }
@@ -30,16 +52,21 @@ function App() {
         }
     }
 
-    // Get unique values for filters
-    const uniqueSections = [...new Set(schedule.flatMap(item => item.sections))].sort()
-    const uniqueInstructors = [...new Set(schedule.map(item => item.instructor))].sort()
-
-    // Filter logic
-    const filteredSchedule = schedule.filter(item => {
-        const sectionMatch = selectedSection ? item.sections.includes(selectedSection) : true
-        const instructorMatch = selectedInstructor ? item.instructor === selectedInstructor : true
-        return sectionMatch && instructorMatch
-    })
+    // Filter logic: the server returns only the matching sessions
+    useEffect(() => {
+        if (!solution) return
+        let current = true
+        fetchTimetable({ section: selectedSection, instructor: selectedInstructor })
+            .then(sessions => { if (current) setSchedule(sessions) })
+            .catch(err => {
+                console.error(err)
+                if (current) setError(err.response?.data?.error || 'Could not load the timetable.')
+            })
+        return () => { current = false }
+    }, [solution, selectedSection, selectedInstructor])
+
+    const uniqueSections = Object.keys(facets.section || {})
+    const uniqueInstructors = Object.keys(facets.instructor || {})
 
     // Group by TimeSlot (rows)
     const timeSlots = [
@@ -73,7 +100,7 @@ function App() {
                 </div>
             )}
 
-            {schedule.length > 0 && (
+            {solution && (
                 <main className="main-content">
                     <div className="controls">
                         <div className="control-group">
@@ -119,7 +146,7 @@ function App() {
                                 <div className="grid-cell time-header">{slot}</div>
                                 {days.map(day => {
                                     // Find items for this slot and day
-                                    const items = filteredSchedule.filter(
+                                    const items = schedule.filter(
                                         item => item.day === day && (item.startTime + " - " + item.endTime) === slot
                                     )
 
@@ -153,7 +180,7 @@ function App() {
                 </main>
             )}
 
-            {schedule.length === 0 && !loading && !error && (
+            {!solution && !loading && !error && (
                 <div className="empty-state">
                     <h2>Ready to Schedule</h2>
                     <p>Click the generate button to start the AI solver.</p>